@@ -5,6 +5,8 @@ from uuid import UUID, uuid4
 
 from pydantic import BaseModel
 
+from app.core.money import MajorAmount, Money
+
 
 class CampaignType(Enum):
     BUY_N_GET_N = "buy_n_get_n"
@@ -16,7 +18,7 @@ class CampaignType(Enum):
 @dataclass
 class Campaign:
     type: CampaignType
-    amount_to_exceed: float
+    amount_to_exceed: Money
     percentage: float
     is_active: bool
     amount: int
@@ -28,7 +30,7 @@ class Campaign:
 
 class CreateCampaignRequest(BaseModel):
     type: CampaignType
-    amount_to_exceed: float
+    amount_to_exceed: MajorAmount
     percentage: float
     is_active: bool
     amount: int
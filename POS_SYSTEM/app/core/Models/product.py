@@ -1,21 +1,45 @@
 from dataclasses import dataclass, field
+from typing import List
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel
 
+from app.core.money import MajorAmount, Money
+
 
 @dataclass
 class Product:
     name: str
-    price: float
+    price: Money
     id: UUID = field(default_factory=uuid4)
 
 
 class CreateProductRequest(BaseModel):
     name: str
-    price: float
+    price: MajorAmount
 
 
 class UpdateProductRequest(BaseModel):
     name: str
-    price: float
+    price: MajorAmount
+
+
+class BulkUpdateProductRequest(BaseModel):
+    id: UUID
+    name: str
+    price: MajorAmount
+
+
+class BulkRowError(BaseModel):
+    row: int
+    message: str
+
+
+class BulkProductResponse(BaseModel):
+    products: List[UUID] = []
+    errors: List[BulkRowError] = []
+
+
+class ProductPage(BaseModel):
+    products: List[Product]
+    next_cursor: str | None = None
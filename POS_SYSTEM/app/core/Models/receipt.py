@@ -7,6 +7,8 @@ from uuid import UUID, uuid4
 from pydantic import BaseModel
 
 from app.core.currency import Currency
+from app.core.money import MajorAmount, Money
+from app.core.pagination import DEFAULT_LIMIT
 
 
 class ReceiptState(str, Enum):
@@ -21,22 +23,22 @@ class Receipt:
     state: ReceiptState = ReceiptState.OPEN
     id: UUID = field(default_factory=uuid4)
     created_at: datetime = field(default_factory=datetime.now)
-    subtotal: float = 0.0
-    total_discount: float = 0.0
-    payment_amount: float = 0.0
+    subtotal: Money = 0
+    total_discount: Money = 0
+    payment_amount: Money = 0
     payment_currency: Currency | None = Currency.GEL
 
     @property
-    def total(self) -> float:
+    def total(self) -> int:
         return self.subtotal - self.total_discount
 
     @property
-    def savings(self) -> float:
+    def savings(self) -> int:
         return self.total_discount
 
 
 class PaymentRequest(BaseModel):
-    amount: float
+    amount: MajorAmount
     currency: Currency
 
 
@@ -45,16 +47,16 @@ class QuoteRequest(BaseModel):
 
 
 class QuoteResponse(BaseModel):
-    subtotal: float
-    total_discount: float
-    total: float
+    subtotal: Money
+    total_discount: Money
+    total: Money
     currency: Currency
 
 
 class ReceiptProduct(BaseModel):
     id: UUID
     name: str
-    price: float
+    price: Money
     quantity: int
 
 
@@ -62,10 +64,10 @@ class GetReceiptResponse(BaseModel):
     id: UUID
     state: ReceiptState
     items: List[ReceiptProduct]
-    subtotal: float
-    total_discount: float
-    total: float
-    savings: float
+    subtotal: Money
+    total_discount: Money
+    total: Money
+    savings: Money
     currency: Currency
 
 
@@ -74,8 +76,35 @@ class ReceiptItem:
     receipt_id: UUID
     product_id: UUID
     quantity: int
+    unit_price: Money = 0
+    product_name: str = ""
 
 
 class AddItemRequest(BaseModel):
     product_id: UUID
     quantity: int
+
+
+class ReceiptQuery(BaseModel):
+    start: datetime | None = None
+    end: datetime | None = None
+    state: ReceiptState | None = None
+    currency: Currency | None = None
+    min_amount: MajorAmount | None = None
+    max_amount: MajorAmount | None = None
+
+
+class ReceiptSearchRequest(ReceiptQuery):
+    after: str | None = None
+    limit: int = DEFAULT_LIMIT
+
+
+class ReceiptPage(BaseModel):
+    receipts: List[Receipt]
+    next_cursor: str | None = None
+
+
+class CheckoutRequest(BaseModel):
+    items: List[AddItemRequest]
+    currency: Currency = Currency.GEL
+    amount: MajorAmount | None = None
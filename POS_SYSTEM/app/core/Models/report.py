@@ -1,7 +1,9 @@
 from dataclasses import dataclass
+from datetime import datetime
 from uuid import UUID
 
 from app.core.currency import Currency
+from app.core.money import Money
 
 
 @dataclass
@@ -13,7 +15,7 @@ class XReportItem:
 @dataclass
 class ReportRevenue:
     currency: Currency | None
-    amount: float
+    amount: Money
 
 
 @dataclass
@@ -21,3 +23,11 @@ class XReport:
     receipt_number: int
     items_sold: list[XReportItem]
     revenue: list[ReportRevenue]
+
+
+@dataclass
+class HourlyRevenue:
+    hour: datetime
+    currency: Currency | None
+    receipt_count: int
+    amount: Money
@@ -18,6 +18,9 @@ class CampaignRepository(Protocol):
     def deactivate(self, campaign_id: UUID) -> None:
         pass
 
+    def version(self) -> int:
+        pass
+
 
 @dataclass
 class CampaignService:
@@ -0,0 +1,55 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List
+from uuid import UUID
+
+from app.core.campaign import CampaignRepository
+from app.core.Models.campaign import Campaign
+
+
+@dataclass
+class CampaignCache:
+    campaigns: CampaignRepository
+    poll_interval: float = 1.0
+    clock: Callable[[], float] = time.monotonic
+
+    _active: List[Campaign] | None = field(default=None, init=False)
+    _version: int = field(default=-1, init=False)
+    _checked_at: float = field(default=0.0, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def read(self, campaign_id: UUID) -> Campaign:
+        return self.campaigns.read(campaign_id)
+
+    def add(self, campaign: Campaign) -> Campaign:
+        added = self.campaigns.add(campaign)
+        self.invalidate()
+        return added
+
+    def read_all(self) -> List[Campaign]:
+        return self.campaigns.read_all()
+
+    def deactivate(self, campaign_id: UUID) -> None:
+        self.campaigns.deactivate(campaign_id)
+        self.invalidate()
+
+    def version(self) -> int:
+        return self.campaigns.version()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._active = None
+
+    def read_active(self) -> List[Campaign]:
+        with self._lock:
+            now = self.clock()
+            if self._active is not None and now - self._checked_at < self.poll_interval:
+                return self._active
+
+            version = self.campaigns.version()
+            self._checked_at = now
+            if self._active is None or version != self._version:
+                self._active = [c for c in self.campaigns.read_all() if c.is_active]
+                self._version = version
+            return self._active
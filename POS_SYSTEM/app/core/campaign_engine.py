@@ -0,0 +1,91 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+from uuid import UUID
+
+from app.core.campaign_cache import CampaignCache
+from app.core.Models.campaign import Campaign, CampaignType
+
+PRODUCT_RULES = (CampaignType.DISCOUNT, CampaignType.COMBO)
+
+
+@dataclass(frozen=True, eq=False)
+class CampaignRule:
+    campaign: Campaign
+    product_ids: List[UUID]
+
+    def line_discounts(
+        self, quantities: Dict[UUID, int], prices: Dict[UUID, int]
+    ) -> Dict[UUID, int]:
+        percentage = self.campaign.percentage / 100.0
+        if self.campaign.type == CampaignType.COMBO:
+            combos = min(quantities.get(pid, 0) for pid in self.product_ids)
+            return {
+                pid: round(combos * prices.get(pid, 0) * percentage)
+                for pid in self.product_ids
+            }
+
+        return {
+            pid: round(quantities.get(pid, 0) * prices.get(pid, 0) * percentage)
+            for pid in self.product_ids
+        }
+
+
+@dataclass(frozen=True, eq=False)
+class CompiledRules:
+    by_product: Dict[UUID, List[CampaignRule]]
+    thresholds: List[Campaign]
+
+    def rules_for(self, product_ids: List[UUID]) -> List[CampaignRule]:
+        rules: Dict[int, CampaignRule] = {}
+        for product_id in product_ids:
+            for rule in self.by_product.get(product_id, []):
+                rules[id(rule)] = rule
+        return list(rules.values())
+
+    def threshold_campaign(self, subtotal: int) -> Campaign | None:
+        for campaign in self.thresholds:
+            if subtotal > campaign.amount_to_exceed:
+                return campaign
+        return None
+
+
+def _product_ids(campaign: Campaign) -> List[UUID]:
+    product_ids = []
+    for product_id in campaign.product_ids:
+        try:
+            product_ids.append(UUID(product_id))
+        except ValueError:
+            continue
+    return product_ids
+
+
+def compile_rules(campaigns: List[Campaign]) -> CompiledRules:
+    by_product: Dict[UUID, List[CampaignRule]] = {}
+    thresholds = []
+    for campaign in campaigns:
+        if campaign.type == CampaignType.WHOLE_RECEIPT_DISCOUNT:
+            thresholds.append(campaign)
+        elif campaign.type in PRODUCT_RULES:
+            rule = CampaignRule(campaign, _product_ids(campaign))
+            for product_id in rule.product_ids:
+                by_product.setdefault(product_id, []).append(rule)
+
+    thresholds.sort(key=lambda c: c.amount_to_exceed, reverse=True)
+    return CompiledRules(by_product, thresholds)
+
+
+@dataclass
+class CampaignEngine:
+    campaigns: CampaignCache
+
+    _source: List[Campaign] | None = field(default=None, init=False)
+    _rules: CompiledRules = field(
+        default_factory=lambda: CompiledRules({}, []), init=False
+    )
+
+    def rules(self) -> CompiledRules:
+        active = self.campaigns.read_active()
+        if active is not self._source:
+            self._rules = compile_rules(active)
+            self._source = active
+        return self._rules
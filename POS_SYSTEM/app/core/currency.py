@@ -1,52 +1,105 @@
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict
+from typing import TYPE_CHECKING, Dict, List, Protocol, Sequence, Tuple
 
-import requests
+EXTRA_CURRENCIES = "EXTRA_CURRENCIES"
+BASE_CURRENCIES = ["GEL", "USD", "EUR"]
 
 
-class Currency(str, Enum):
-    GEL = "GEL"
-    USD = "USD"
-    EUR = "EUR"
+def currency_codes() -> List[str]:
+    codes = list(BASE_CURRENCIES)
+    for code in os.getenv(EXTRA_CURRENCIES, "").split(","):
+        code = code.strip().upper()
+        if not code or code in codes:
+            continue
+        if len(code) != 3 or not code.isalpha():
+            raise ValueError(f"Invalid currency code '{code}' in {EXTRA_CURRENCIES}")
+        codes.append(code)
+    return codes
+
+
+if TYPE_CHECKING:
+
+    class Currency(str, Enum):
+        GEL = "GEL"
+        USD = "USD"
+        EUR = "EUR"
+
+else:
+    # members are fixed once at import, so extra codes show up in list(Currency)
+    # and the OpenAPI schema; mypy only sees the base currencies
+    Currency = Enum(
+        "Currency",
+        [(code, code) for code in currency_codes()],
+        type=str,
+        module=__name__,
+    )
+
+
+FALLBACK_RATES: Dict[str, float] = {
+    Currency.GEL.value: 1.0,
+    Currency.USD.value: 0.37,
+    Currency.EUR.value: 0.34,
+}
+
+CrossRates = Dict[str, Dict[str, float]]
+
+
+class RateProvider(Protocol):
+    def rates(self) -> Dict[str, float]:
+        pass
 
 
 @dataclass
-class CurrencyService:
-    _rates: Dict[str, float]
+class FixedRates:
+    values: Dict[str, float] = field(default_factory=lambda: dict(FALLBACK_RATES))
 
-    def __init__(self) -> None:
-        self._rates = {}
-        self._update_rates()
+    def rates(self) -> Dict[str, float]:
+        return self.values
 
-    def _update_rates(self) -> None:
-        try:
-            response = requests.get("https://open.er-api.com/v6/latest/GEL")
-            data = response.json()
-
-            if data["result"] == "success":
-                self._rates[Currency.GEL.value] = 1.0
-                self._rates[Currency.USD.value] = data["rates"]["USD"]
-                self._rates[Currency.EUR.value] = data["rates"]["EUR"]
-        except Exception:
-            self._rates = {
-                Currency.GEL.value: 1.0,
-                Currency.USD.value: 0.37,
-                Currency.EUR.value: 0.34,
-            }
+
+def cross_rates(rates: Dict[str, float]) -> CrossRates:
+    return {
+        source: {target: rate / source_rate for target, rate in rates.items()}
+        for source, source_rate in rates.items()
+    }
+
+
+@dataclass
+class CurrencyService:
+    provider: RateProvider = field(default_factory=FixedRates)
+
+    _cross: Tuple[Dict[str, float] | None, CrossRates] = field(
+        default=(None, {}), init=False
+    )
 
     def convert(
-        self, amount: float, from_currency: Currency, to_currency: Currency
-    ) -> float:
+        self, amount: int, from_currency: Currency, to_currency: Currency
+    ) -> int:
+        return self.convert_many([amount], from_currency, to_currency)[0]
+
+    def convert_many(
+        self, amounts: Sequence[int], from_currency: Currency, to_currency: Currency
+    ) -> List[int]:
         if from_currency == to_currency:
-            return amount
-        if not self._rates:
-            self._update_rates()
+            return list(amounts)
 
-        amount_in_gel = amount
-        if from_currency != Currency.GEL:
-            amount_in_gel = amount / self._rates[from_currency.value]
-        if to_currency == Currency.GEL:
-            return round(amount_in_gel, 2)
+        rate = self.rate(from_currency, to_currency)
+        return [round(amount * rate) for amount in amounts]
+
+    def rate(self, from_currency: Currency, to_currency: Currency) -> float:
+        try:
+            return self.cross_rates()[from_currency.value][to_currency.value]
+        except KeyError:
+            raise ValueError(
+                f"No exchange rate from {from_currency.value} to {to_currency.value}"
+            )
 
-        return round(amount_in_gel * self._rates[to_currency.value], 2)
+    def cross_rates(self) -> CrossRates:
+        rates = self.provider.rates()
+        source, matrix = self._cross
+        if rates is not source:
+            matrix = cross_rates(rates)
+            self._cross = (rates, matrix)
+        return matrix
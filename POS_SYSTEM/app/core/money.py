@@ -0,0 +1,31 @@
+from decimal import Decimal
+from typing import Annotated, Any
+
+from pydantic import BeforeValidator, PlainSerializer
+
+MINOR_UNITS = 100
+
+
+def to_minor(amount: float | str | Decimal) -> int:
+    return int(round(Decimal(str(amount)) * MINOR_UNITS))
+
+
+def to_major(amount: int) -> float:
+    return amount / MINOR_UNITS
+
+
+def _parse_major(value: Any) -> Any:
+    if isinstance(value, bool) or not isinstance(value, (int, float, str, Decimal)):
+        return value
+    try:
+        return to_minor(value)
+    except (ArithmeticError, ValueError):
+        raise ValueError("Input should be a valid amount")
+
+
+_AS_MAJOR = PlainSerializer(to_major, return_type=float, when_used="json")
+
+# amounts are held in minor units (tetri, cents) and only shown in major units
+Money = Annotated[int, _AS_MAJOR]
+# the same amount parsed from a major-unit number on the way in
+MajorAmount = Annotated[int, BeforeValidator(_parse_major), _AS_MAJOR]
@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+from typing import Callable, Generic, Iterator, List, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+ReadPage = Callable[[str | None, int], List[T]]
+
+
+@dataclass
+class Page(Generic[T]):
+    items: List[T]
+    next_cursor: str | None = None
+
+
+def read_page(
+    read: ReadPage[T], key: Callable[[T], str], after: str | None, limit: int
+) -> Page[T]:
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f"Limit must be between 1 and {MAX_LIMIT}")
+
+    items = read(after, limit + 1)
+    if len(items) <= limit:
+        return Page(items)
+    return Page(items[:limit], key(items[limit - 1]))
+
+
+def iterate(
+    read: ReadPage[T], key: Callable[[T], str], batch_size: int = 500
+) -> Iterator[T]:
+    after = None
+    while True:
+        items = read(after, batch_size)
+        yield from items
+        if len(items) < batch_size:
+            return
+        after = key(items[-1])
@@ -0,0 +1,80 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Tuple
+from uuid import UUID
+
+from app.core.campaign_engine import CampaignEngine, CompiledRules
+from app.core.Models.receipt import ReceiptItem
+
+Line = Tuple[UUID, int, int]
+
+
+@dataclass(frozen=True)
+class PricedLine:
+    product_id: UUID
+    quantity: int
+    unit_price: int
+    discount: int
+
+    @property
+    def subtotal(self) -> int:
+        return self.quantity * self.unit_price
+
+
+@dataclass(frozen=True)
+class PricedReceipt:
+    lines: Tuple[PricedLine, ...]
+    campaign_discounts: Dict[UUID, int]
+    subtotal: int
+    total_discount: int
+
+    @property
+    def total(self) -> int:
+        return self.subtotal - self.total_discount
+
+
+@lru_cache(maxsize=4096)
+def price_lines(lines: Tuple[Line, ...], rules: CompiledRules) -> PricedReceipt:
+    quantities = {product_id: quantity for product_id, quantity, _ in lines}
+    prices = {product_id: price for product_id, _, price in lines}
+    subtotal = sum(quantity * price for _, quantity, price in lines)
+
+    line_discounts: Dict[UUID, int] = {}
+    campaign_discounts: Dict[UUID, int] = {}
+    for rule in rules.rules_for(list(quantities)):
+        discounts = rule.line_discounts(quantities, prices)
+        for product_id, discount in discounts.items():
+            line_discounts[product_id] = line_discounts.get(product_id, 0) + discount
+        campaign_discount = sum(discounts.values())
+        if campaign_discount > 0:
+            campaign_discounts[rule.campaign.id] = campaign_discount
+
+    total_discount = sum(line_discounts.values())
+    threshold = rules.threshold_campaign(subtotal)
+    if threshold is not None:
+        campaign_discounts[threshold.id] = round(threshold.percentage * subtotal / 100)
+        total_discount += campaign_discounts[threshold.id]
+
+    return PricedReceipt(
+        lines=tuple(
+            PricedLine(product_id, quantity, price, line_discounts.get(product_id, 0))
+            for product_id, quantity, price in lines
+        ),
+        campaign_discounts=campaign_discounts,
+        subtotal=subtotal,
+        total_discount=total_discount,
+    )
+
+
+@dataclass
+class PricingEngine:
+    campaigns: CampaignEngine
+
+    def price(self, receipt_items: List[ReceiptItem]) -> PricedReceipt:
+        lines = tuple(
+            sorted(
+                (item.product_id, item.quantity, item.unit_price)
+                for item in receipt_items
+            )
+        )
+        return price_lines(lines, self.campaigns.rules())
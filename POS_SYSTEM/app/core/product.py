@@ -1,29 +1,52 @@
 from dataclasses import dataclass
-from typing import List, Protocol
+from typing import Dict, Iterable, Iterator, List, Protocol, Set, Tuple
 from uuid import UUID, uuid4
 
-from app.core.Models.product import CreateProductRequest, Product, UpdateProductRequest
+from app.core.Models.product import (
+    BulkProductResponse,
+    BulkRowError,
+    BulkUpdateProductRequest,
+    CreateProductRequest,
+    Product,
+    UpdateProductRequest,
+)
+from app.core.pagination import DEFAULT_LIMIT, Page, iterate, read_page
 
 
 class ProductRepository(Protocol):
     def read(self, product_id: UUID) -> Product | None:
         pass
 
-    def create(self, create_request: CreateProductRequest) -> UUID:
+    def read_many(self, product_ids: Iterable[UUID]) -> Dict[UUID, Product]:
         pass
 
     def add(self, product: Product) -> Product:
         pass
 
+    def add_many(self, products: List[Product]) -> None:
+        pass
+
     def find_by_name(self, name: str) -> Product | None:
         pass
 
+    def find_by_names(self, names: List[str]) -> Dict[str, UUID]:
+        pass
+
+    def existing_ids(self, product_ids: List[UUID]) -> Set[UUID]:
+        pass
+
     def read_all(self) -> List[Product]:
         pass
 
+    def read_page(self, after: str | None, limit: int) -> List[Product]:
+        pass
+
     def update(self, product: Product) -> None:
         pass
 
+    def update_many(self, products: List[Product]) -> None:
+        pass
+
 
 @dataclass
 class ProductService:
@@ -36,6 +59,14 @@ class ProductService:
 
         raise ValueError(f"Product with id '{product_id}' does not exist")
 
+    def read_many(self, product_ids: Iterable[UUID]) -> Dict[UUID, Product]:
+        wanted = set(product_ids)
+        products = self.products.read_many(wanted)
+        for product_id in wanted:
+            if product_id not in products:
+                raise ValueError(f"Product with id '{product_id}' does not exist")
+        return products
+
     def create(self, create_request: CreateProductRequest) -> UUID:
         existing_product = self.products.find_by_name(create_request.name)
         if existing_product:
@@ -48,9 +79,43 @@ class ProductService:
         self.products.add(product)
         return product.id
 
+    def create_many(
+        self, create_requests: Iterable[Tuple[int, CreateProductRequest]]
+    ) -> BulkProductResponse:
+        rows = list(create_requests)
+        taken = self.products.find_by_names([request.name for _, request in rows])
+        response = BulkProductResponse()
+        products = []
+        for row, request in rows:
+            if request.name in taken:
+                response.errors.append(
+                    BulkRowError(
+                        row=row,
+                        message=f"Product with name '{request.name}' already exists",
+                    )
+                )
+                continue
+
+            product = Product(**request.model_dump())
+            product.id = uuid4()
+            taken[product.name] = product.id
+            products.append(product)
+
+        self.products.add_many(products)
+        response.products = [product.id for product in products]
+        return response
+
     def read_all(self) -> List[Product]:
         return self.products.read_all()
 
+    def read_page(
+        self, after: str | None = None, limit: int = DEFAULT_LIMIT
+    ) -> Page[Product]:
+        return read_page(self.products.read_page, _product_key, after, limit)
+
+    def iter_all(self) -> Iterator[Product]:
+        return iterate(self.products.read_page, _product_key)
+
     def update_product(
         self, update_request: UpdateProductRequest, product_id: UUID
     ) -> None:
@@ -61,3 +126,31 @@ class ProductService:
         product = Product(**update_request.model_dump())
         product.id = product_id
         self.products.update(product)
+
+    def update_many(
+        self, update_requests: Iterable[Tuple[int, BulkUpdateProductRequest]]
+    ) -> BulkProductResponse:
+        rows = list(update_requests)
+        existing = self.products.existing_ids([request.id for _, request in rows])
+        taken = self.products.find_by_names([request.name for _, request in rows])
+        response = BulkProductResponse()
+        products = []
+        for row, request in rows:
+            if request.id not in existing:
+                message = f"Product with id '{request.id}' does not exist"
+            elif taken.get(request.name, request.id) != request.id:
+                message = f"Product with name '{request.name}' already exists"
+            else:
+                taken[request.name] = request.id
+                products.append(Product(**request.model_dump()))
+                continue
+
+            response.errors.append(BulkRowError(row=row, message=message))
+
+        self.products.update_many(products)
+        response.products = [product.id for product in products]
+        return response
+
+
+def _product_key(product: Product) -> str:
+    return str(product.id)
@@ -0,0 +1,136 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Dict, Iterable, List, Set
+from uuid import UUID
+
+from app.core.Models.product import Product
+from app.core.pagination import iterate
+from app.core.product import ProductRepository
+from app.core.unit_of_work import NoTransactionManager, TransactionManager
+
+
+@dataclass
+class ProductCache:
+    products: ProductRepository
+    capacity: int = 10_000
+    transactions: TransactionManager = field(default_factory=NoTransactionManager)
+
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    _entries: "OrderedDict[UUID, Product]" = field(
+        default_factory=OrderedDict, init=False
+    )
+    _generation: int = field(default=0, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def read(self, product_id: UUID) -> Product | None:
+        with self._lock:
+            cached = self._get(product_id)
+            generation = self._generation
+        if cached is not None:
+            return cached
+
+        product = self.products.read(product_id)
+        if product is not None:
+            self._store({product_id: product}, generation)
+        return product
+
+    def read_many(self, product_ids: Iterable[UUID]) -> Dict[UUID, Product]:
+        found: Dict[UUID, Product] = {}
+        missing: List[UUID] = []
+        with self._lock:
+            for product_id in set(product_ids):
+                cached = self._get(product_id)
+                if cached is None:
+                    missing.append(product_id)
+                else:
+                    found[product_id] = cached
+            generation = self._generation
+
+        if missing:
+            loaded = self.products.read_many(missing)
+            self._store(loaded, generation)
+            found.update(loaded)
+        return found
+
+    def add(self, product: Product) -> Product:
+        added = self.products.add(product)
+        self.invalidate([product.id])
+        return added
+
+    def add_many(self, products: List[Product]) -> None:
+        self.products.add_many(products)
+        self.invalidate([product.id for product in products])
+
+    def find_by_name(self, name: str) -> Product | None:
+        return self.products.find_by_name(name)
+
+    def find_by_names(self, names: List[str]) -> Dict[str, UUID]:
+        return self.products.find_by_names(names)
+
+    def existing_ids(self, product_ids: List[UUID]) -> Set[UUID]:
+        return self.products.existing_ids(product_ids)
+
+    def read_all(self) -> List[Product]:
+        return self.products.read_all()
+
+    def read_page(self, after: str | None, limit: int) -> List[Product]:
+        return self.products.read_page(after, limit)
+
+    def update(self, product: Product) -> None:
+        self.products.update(product)
+        self.invalidate([product.id])
+
+    def update_many(self, products: List[Product]) -> None:
+        self.products.update_many(products)
+        self.invalidate([product.id for product in products])
+
+    def invalidate(self, product_ids: Iterable[UUID]) -> None:
+        stale = list(product_ids)
+        self._evict(stale)
+        self.transactions.after_commit(lambda: self._evict(stale))
+
+    def warm(self) -> None:
+        with self._lock:
+            generation = self._generation
+        catalog = islice(
+            iterate(self.products.read_page, lambda p: str(p.id)), self.capacity
+        )
+        self._store({p.id: p for p in catalog}, generation)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+            }
+
+    def _get(self, product_id: UUID) -> Product | None:
+        cached = self._entries.get(product_id)
+        if cached is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(product_id)
+        return cached
+
+    def _evict(self, product_ids: List[UUID]) -> None:
+        with self._lock:
+            self._generation += 1
+            for product_id in product_ids:
+                self._entries.pop(product_id, None)
+
+    def _store(self, products: Dict[UUID, Product], generation: int) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+
+            for product_id, product in products.items():
+                self._entries[product_id] = product
+                self._entries.move_to_end(product_id)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Tuple, TypeVar
+from uuid import UUID
+
+T = TypeVar("T")
+
+Snapshot = Tuple[object, ...]
+
+
+@dataclass(frozen=True)
+class CachedQuote:
+    snapshot: Snapshot
+    version: object
+    checked_at: float
+    value: Any
+
+
+def _unversioned() -> object:
+    return None
+
+
+@dataclass
+class QuoteCache:
+    capacity: int = 10_000
+    poll_interval: float = 1.0
+    clock: Callable[[], float] = time.monotonic
+
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    _entries: "OrderedDict[UUID, Dict[Hashable, CachedQuote]]" = field(
+        default_factory=OrderedDict, init=False
+    )
+    _generation: int = field(default=0, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def get_or_load(
+        self,
+        receipt_id: UUID,
+        key: Hashable,
+        snapshot: Snapshot,
+        load: Callable[[], T],
+        version: Callable[[], object] = _unversioned,
+    ) -> T:
+        with self._lock:
+            cached = self._lookup(receipt_id, key, snapshot)
+            if (
+                cached is not None
+                and self.clock() - cached.checked_at < self.poll_interval
+            ):
+                return self._hit(receipt_id, cached)  # type: ignore[no-any-return]
+            generation = self._generation
+
+        # the receipt may have been changed by another worker; its stored
+        # version is checked at most once per poll_interval
+        current = version()
+        with self._lock:
+            cached = self._lookup(receipt_id, key, snapshot)
+            if (
+                cached is not None
+                and cached.version == current
+                and generation == self._generation
+            ):
+                self._store(receipt_id, key, snapshot, current, cached.value)
+                return self._hit(receipt_id, cached)  # type: ignore[no-any-return]
+            self.misses += 1
+
+        value = load()
+        with self._lock:
+            if generation == self._generation:
+                self._store(receipt_id, key, snapshot, current, value)
+        return value
+
+    def invalidate(self, receipt_id: UUID) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(receipt_id, None)
+
+    def _lookup(
+        self, receipt_id: UUID, key: Hashable, snapshot: Snapshot
+    ) -> CachedQuote | None:
+        cached = self._entries.get(receipt_id, {}).get(key)
+        if cached is None or cached.snapshot != snapshot:
+            return None
+        return cached
+
+    def _hit(self, receipt_id: UUID, cached: CachedQuote) -> Any:
+        self.hits += 1
+        self._entries.move_to_end(receipt_id)
+        return cached.value
+
+    def _store(
+        self,
+        receipt_id: UUID,
+        key: Hashable,
+        snapshot: Snapshot,
+        version: object,
+        value: Any,
+    ) -> None:
+        self._entries.setdefault(receipt_id, {})[key] = CachedQuote(
+            snapshot, version, self.clock(), value
+        )
+        self._entries.move_to_end(receipt_id)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
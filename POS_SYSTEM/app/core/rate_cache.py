@@ -0,0 +1,95 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Protocol
+
+from app.core.currency import FALLBACK_RATES
+
+
+@dataclass(frozen=True)
+class RateSnapshot:
+    rates: Dict[str, float]
+    fetched_at: float
+
+
+class RateSource(Protocol):
+    def fetch(self) -> Dict[str, float]:
+        pass
+
+
+class RateStore(Protocol):
+    def load(self) -> RateSnapshot | None:
+        pass
+
+    def save(self, snapshot: RateSnapshot) -> None:
+        pass
+
+
+@dataclass
+class RateCache:
+    source: RateSource
+    store: RateStore | None = None
+    ttl: float = 3600.0
+    failure_threshold: int = 3
+    cooldown: float = 300.0
+    clock: Callable[[], float] = time.time
+
+    _snapshot: RateSnapshot = field(
+        default_factory=lambda: RateSnapshot(dict(FALLBACK_RATES), 0.0), init=False
+    )
+    _failures: int = field(default=0, init=False)
+    _open_until: float = field(default=0.0, init=False)
+    _refreshing: bool = field(default=False, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def __post_init__(self) -> None:
+        stored = self.store.load() if self.store else None
+        if stored is not None:
+            self._snapshot = stored
+
+    def rates(self) -> Dict[str, float]:
+        self.refresh_if_stale()
+        return self._snapshot.rates
+
+    def snapshot(self) -> RateSnapshot:
+        return self._snapshot
+
+    def refresh_if_stale(self) -> None:
+        if self.clock() - self._snapshot.fetched_at >= self.ttl:
+            self.refresh_in_background()
+
+    def refresh_in_background(self) -> None:
+        if self._claim():
+            threading.Thread(target=self._refresh_claimed, daemon=True).start()
+
+    def refresh(self) -> bool:
+        if not self._claim():
+            return False
+        return self._refresh_claimed()
+
+    def _claim(self) -> bool:
+        with self._lock:
+            if self._refreshing or self.clock() < self._open_until:
+                return False
+            self._refreshing = True
+            return True
+
+    def _refresh_claimed(self) -> bool:
+        try:
+            rates = self.source.fetch()
+        except Exception:
+            with self._lock:
+                self._refreshing = False
+                self._failures += 1
+                if self._failures >= self.failure_threshold:
+                    self._open_until = self.clock() + self.cooldown
+            return False
+
+        snapshot = RateSnapshot(rates, self.clock())
+        with self._lock:
+            self._snapshot = snapshot
+            self._failures = 0
+            self._refreshing = False
+        if self.store is not None:
+            self.store.save(snapshot)
+        return True
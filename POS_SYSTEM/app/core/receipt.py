@@ -1,19 +1,42 @@
-from dataclasses import dataclass, field
-from typing import List, Protocol
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import (
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Protocol,
+    Tuple,
+    TypeVar,
+)
 from uuid import UUID, uuid4
 
 from app.core.currency import Currency, CurrencyService
 from app.core.Models.product import Product
 from app.core.Models.receipt import (
     AddItemRequest,
+    CheckoutRequest,
     PaymentRequest,
     QuoteResponse,
     Receipt,
     ReceiptItem,
+    ReceiptQuery,
     ReceiptState,
 )
+from app.core.pagination import DEFAULT_LIMIT, Page, iterate, read_page
+from app.core.pricing import PricedReceipt, PricingEngine
+from app.core.quote_cache import QuoteCache, Snapshot
 from app.core.receipt_item import ReceiptItemRepository
+from app.core.report import ReportRepository
 from app.core.shift import ShiftService
+from app.core.unit_of_work import (
+    NoTransactionManager,
+    ReceiptUnitOfWork,
+    TransactionManager,
+)
+
+T = TypeVar("T")
 
 
 class ReceiptRepository(Protocol):
@@ -26,22 +49,34 @@ class ReceiptRepository(Protocol):
     def update(self, receipt: Receipt) -> None:
         pass
 
+    def version(self, receipt_id: UUID) -> int | None:
+        pass
+
     def read_by_shift(self, shift_id: UUID) -> List[Receipt]:
         pass
 
     def get_all(self) -> List[Receipt]:
         pass
 
+    def read_page(self, after: str | None, limit: int) -> List[Receipt]:
+        pass
+
+    def search(
+        self, query: ReceiptQuery, after: str | None, limit: int
+    ) -> List[Receipt]:
+        pass
+
 
 @dataclass
 class ReceiptService:
-    from app.core.campaign_observers import ICampaign
-
     receipts: ReceiptRepository
     receipt_items: ReceiptItemRepository
     shift_service: ShiftService
     currency_service: CurrencyService
-    observers: List[ICampaign] = field(default_factory=list)
+    pricing: PricingEngine | None = None
+    transactions: TransactionManager = field(default_factory=NoTransactionManager)
+    reports: ReportRepository | None = None
+    quotes: QuoteCache | None = None
 
     def create(self) -> UUID:
         shift_id = self.shift_service.get_open_shift()
@@ -54,86 +89,105 @@ class ReceiptService:
     def add_item(
         self, receipt_id: UUID, add_request: AddItemRequest, product: Product
     ) -> None:
-        receipt = self.receipts.read(receipt_id)
-        if not receipt:
-            raise ValueError(f"Receipt with id '{receipt_id}' does not exist")
+        self.add_items(receipt_id, [add_request], {add_request.product_id: product})
 
-        if receipt.state != ReceiptState.OPEN:
-            raise ValueError(f"Cannot add items to receipt in {receipt.state} state")
-
-        item = ReceiptItem(
-            product_id=add_request.product_id,
-            quantity=add_request.quantity,
-            receipt_id=receipt_id,
-        )
+    def add_items(
+        self,
+        receipt_id: UUID,
+        add_requests: List[AddItemRequest],
+        products: Dict[UUID, Product],
+    ) -> None:
+        with self._unit_of_work() as uow:
+            receipt = uow.read_receipt(receipt_id)
+            if not receipt:
+                raise ValueError(f"Receipt with id '{receipt_id}' does not exist")
+
+            if receipt.state != ReceiptState.OPEN:
+                raise ValueError(
+                    f"Cannot add items to receipt in {receipt.state} state"
+                )
 
-        current_item = self.receipt_items.read(receipt_id, add_request.product_id)
-        if current_item:
-            item.quantity += current_item.quantity
-            self.receipt_items.update(item)
-        else:
-            self.receipt_items.create(item)
+            self._add_items(uow, receipt, add_requests, products)
+        self._invalidate(receipt_id)
 
-        receipt.subtotal += item.quantity * product.price
-        for observer in self.observers:
-            observer.update(receipt)
+    def calculate_total(self, receipt_id: UUID) -> int:
+        with self._unit_of_work() as uow:
+            receipt = uow.read_receipt(receipt_id)
+            if not receipt:
+                raise ValueError(f"Receipt with id '{receipt_id}' does not exist")
 
-    def calculate_total(self, receipt_id: UUID) -> float:
-        receipt = self.receipts.read(receipt_id)
-        if not receipt:
-            raise ValueError(f"Receipt with id '{receipt_id}' does not exist")
-
-        if receipt.state != ReceiptState.OPEN:
-            raise ValueError(
-                f"Cannot calculate total for receipt in {receipt.state} state"
-            )
+            if receipt.state != ReceiptState.OPEN:
+                raise ValueError(
+                    f"Cannot calculate total for receipt in {receipt.state} state"
+                )
 
-        self.receipts.update(receipt)
+            self._reprice(receipt, uow.read_items(receipt_id))
 
+        self._invalidate(receipt_id)
         return receipt.subtotal - receipt.total_discount
 
     def close_receipt(self, receipt_id: UUID) -> None:
-        receipt = self.receipts.read(receipt_id)
-        if not receipt:
-            raise ValueError(f"Receipt with id '{receipt_id}' does not exist")
-
-        if receipt.state != ReceiptState.PAYED:
-            raise ValueError(f"Cannot close receipt that is in {receipt.state} state")
+        with self._unit_of_work() as uow:
+            receipt = uow.read_receipt(receipt_id)
+            if not receipt:
+                raise ValueError(f"Receipt with id '{receipt_id}' does not exist")
+
+            if receipt.state != ReceiptState.PAYED:
+                raise ValueError(
+                    f"Cannot close receipt that is in {receipt.state} state"
+                )
 
-        receipt.state = ReceiptState.CLOSED
-        self.receipts.update(receipt)
+            receipt.state = ReceiptState.CLOSED
+        self._invalidate(receipt_id)
 
     def get_quote(self, receipt_id: UUID, currency: Currency) -> QuoteResponse:
+        return self._cached(
+            receipt_id, ("quote", currency), lambda: self._quote(receipt_id, currency)
+        )
+
+    def _quote(self, receipt_id: UUID, currency: Currency) -> QuoteResponse:
         receipt = self.receipts.read(receipt_id)
         if not receipt:
             raise ValueError(f"Receipt with id '{receipt_id}' does not exist")
 
-        subtotal_converted = self._convert_currency(receipt.subtotal, currency)
-        discount_converted = self._convert_currency(receipt.total_discount, currency)
-        total_converted = subtotal_converted - discount_converted
+        receipt = self._current(receipt)
+        subtotal_converted, discount_converted = self._convert_many(
+            [receipt.subtotal, receipt.total_discount], currency
+        )
 
         return QuoteResponse(
             subtotal=subtotal_converted,
             total_discount=discount_converted,
-            total=total_converted,
+            total=subtotal_converted - discount_converted,
             currency=currency,
         )
 
     def get_receipt(
         self, receipt_id: UUID, currency: Currency = Currency.GEL
     ) -> Receipt:
+        return self._cached(
+            receipt_id,
+            ("receipt", currency),
+            lambda: self._read_receipt(receipt_id, currency),
+        )
+
+    def _read_receipt(self, receipt_id: UUID, currency: Currency) -> Receipt:
         receipt = self.receipts.read(receipt_id)
         if not receipt:
             raise ValueError(f"Receipt with id '{receipt_id}' does not exist")
 
+        receipt = self._current(receipt)
         if currency != Currency.GEL:
+            subtotal, total_discount = self._convert_many(
+                [receipt.subtotal, receipt.total_discount], currency
+            )
             converted_receipt = Receipt(
                 id=receipt.id,
                 shift_id=receipt.shift_id,
                 state=receipt.state,
                 created_at=receipt.created_at,
-                subtotal=self._convert_currency(receipt.subtotal, currency),
-                total_discount=self._convert_currency(receipt.total_discount, currency),
+                subtotal=subtotal,
+                total_discount=total_discount,
                 payment_amount=receipt.payment_amount,
                 payment_currency=receipt.payment_currency,
             )
@@ -150,44 +204,203 @@ class ReceiptService:
     def get_receipt_items(
         self, receipt_id: UUID, currency: Currency = Currency.GEL
     ) -> List[ReceiptItem]:
+        return self._cached(
+            receipt_id,
+            ("items", currency),
+            lambda: self._read_items(receipt_id, currency),
+        )
+
+    def _read_items(self, receipt_id: UUID, currency: Currency) -> List[ReceiptItem]:
         items = self.receipt_items.read_by_receipt(receipt_id)
         if currency != Currency.GEL:
-            converted_items = []
-            for item in items:
-                converted_item = ReceiptItem(
-                    receipt_id=item.receipt_id,
-                    product_id=item.product_id,
-                    quantity=item.quantity,
-                )
-                converted_items.append(converted_item)
-            return converted_items
+            prices = self._convert_many([item.unit_price for item in items], currency)
+            return [
+                replace(item, unit_price=price) for item, price in zip(items, prices)
+            ]
 
         return items
 
+    def read_page(
+        self, after: str | None = None, limit: int = DEFAULT_LIMIT
+    ) -> Page[Receipt]:
+        return read_page(self.receipts.read_page, _receipt_key, after, limit)
+
+    def iter_all(self) -> Iterator[Receipt]:
+        return iterate(self.receipts.read_page, _receipt_key)
+
+    def search(
+        self,
+        query: ReceiptQuery,
+        after: str | None = None,
+        limit: int = DEFAULT_LIMIT,
+    ) -> Page[Receipt]:
+        if query.start and query.end and query.start > query.end:
+            raise ValueError("Search start is after its end")
+        if after is not None:
+            _parse_search_key(after)
+
+        return read_page(
+            lambda cursor, size: self.receipts.search(query, cursor, size),
+            _search_key,
+            after,
+            limit,
+        )
+
     def process_payment(self, receipt_id: UUID, payment: PaymentRequest) -> None:
-        receipt = self.receipts.read(receipt_id)
-        if not receipt:
-            raise ValueError(f"Receipt with id '{receipt_id}' does not exist")
+        with self._unit_of_work() as uow:
+            receipt = uow.read_receipt(receipt_id)
+            if not receipt:
+                raise ValueError(f"Receipt with id '{receipt_id}' does not exist")
+
+            self._pay(uow, receipt, payment.amount, payment.currency)
+        self._invalidate(receipt_id)
 
-        payment_in_gel = self._convert_to_gel(payment.amount, payment.currency)
+    def checkout(
+        self, checkout_request: CheckoutRequest, products: Dict[UUID, Product]
+    ) -> Receipt:
+        if not checkout_request.items:
+            raise ValueError("Checkout requires at least one item")
 
-        if payment_in_gel != receipt.total:
+        shift = self.shift_service.get_open_shift()
+        if not shift:
+            raise ValueError("Shift is not open")
+
+        with self._unit_of_work() as uow:
+            receipt = Receipt(id=uuid4(), shift_id=shift.shift_id)
+            uow.add_receipt(receipt)
+            self._add_items(uow, receipt, checkout_request.items, products)
+
+            if checkout_request.amount is None:
+                receipt.payment_amount = self._total_in(
+                    receipt, checkout_request.currency
+                )
+                receipt.payment_currency = checkout_request.currency
+                uow.record_sale(receipt)
+            else:
+                self._pay(
+                    uow, receipt, checkout_request.amount, checkout_request.currency
+                )
+
+            receipt.state = ReceiptState.CLOSED
+        return receipt
+
+    def _add_items(
+        self,
+        uow: ReceiptUnitOfWork,
+        receipt: Receipt,
+        add_requests: List[AddItemRequest],
+        products: Dict[UUID, Product],
+    ) -> None:
+        quantities: Dict[UUID, int] = {}
+        for add_request in add_requests:
+            quantities[add_request.product_id] = (
+                quantities.get(add_request.product_id, 0) + add_request.quantity
+            )
+
+        uow.read_items(receipt.id)
+        for product_id, quantity in quantities.items():
+            current_item = uow.read_item(receipt.id, product_id)
+            if current_item:
+                current_item.quantity += quantity
+            else:
+                uow.add_item(
+                    ReceiptItem(
+                        product_id=product_id,
+                        quantity=quantity,
+                        receipt_id=receipt.id,
+                        unit_price=products[product_id].price,
+                        product_name=products[product_id].name,
+                    )
+                )
+
+        self._reprice(receipt, uow.read_items(receipt.id))
+
+    def _pay(
+        self,
+        uow: ReceiptUnitOfWork,
+        receipt: Receipt,
+        amount: int,
+        currency: Currency,
+    ) -> None:
+        if receipt.state != ReceiptState.OPEN:
+            raise ValueError(f"Cannot pay receipt in {receipt.state} state")
+
+        self._reprice(receipt, uow.read_items(receipt.id))
+        if amount != self._total_in(receipt, currency):
             raise ValueError("Payment amount is not correct")
 
         receipt.state = ReceiptState.PAYED
-        receipt.payment_amount = payment.amount
-        receipt.payment_currency = payment.currency
-        self.receipts.update(receipt)
-
-    def add_observer(self, observer: ICampaign) -> None:
-        self.observers.append(observer)
-
-    def _convert_currency(self, amount: float, target_currency: Currency) -> float:
-        if target_currency == Currency.GEL:
-            return amount
-        return self.currency_service.convert(amount, Currency.GEL, target_currency)
-
-    def _convert_to_gel(self, amount: float, from_currency: Currency) -> float:
-        if from_currency == Currency.GEL:
-            return amount
-        return self.currency_service.convert(amount, from_currency, Currency.GEL)
+        receipt.payment_amount = amount
+        receipt.payment_currency = currency
+        uow.record_sale(receipt)
+
+    def _price(self, receipt_items: List[ReceiptItem]) -> PricedReceipt | None:
+        if self.pricing is None:
+            return None
+        return self.pricing.price(receipt_items)
+
+    def _reprice(self, receipt: Receipt, receipt_items: List[ReceiptItem]) -> None:
+        priced = self._price(receipt_items)
+        if priced is None:
+            receipt.subtotal = sum(
+                item.quantity * item.unit_price for item in receipt_items
+            )
+        else:
+            receipt.subtotal = priced.subtotal
+            receipt.total_discount = priced.total_discount
+
+    def _current(self, receipt: Receipt) -> Receipt:
+        if receipt.state != ReceiptState.OPEN:
+            return receipt
+        current = replace(receipt)
+        self._reprice(current, self.receipt_items.read_by_receipt(receipt.id))
+        return current
+
+    def _cached(self, receipt_id: UUID, key: Hashable, load: Callable[[], T]) -> T:
+        if self.quotes is None:
+            return load()
+        rules = self.pricing.campaigns.rules() if self.pricing else None
+        snapshot: Snapshot = (self.currency_service.cross_rates(), rules)
+        return self.quotes.get_or_load(
+            receipt_id, key, snapshot, load, lambda: self.receipts.version(receipt_id)
+        )
+
+    def _invalidate(self, receipt_id: UUID) -> None:
+        quotes = self.quotes
+        if quotes is not None:
+            quotes.invalidate(receipt_id)
+            self.transactions.after_commit(lambda: quotes.invalidate(receipt_id))
+
+    def _unit_of_work(self) -> ReceiptUnitOfWork:
+        return ReceiptUnitOfWork(
+            self.receipts, self.receipt_items, self.transactions, self.reports
+        )
+
+    def _total_in(self, receipt: Receipt, currency: Currency) -> int:
+        subtotal, total_discount = self._convert_many(
+            [receipt.subtotal, receipt.total_discount], currency
+        )
+        return subtotal - total_discount
+
+    def _convert_many(self, amounts: List[int], target_currency: Currency) -> List[int]:
+        return self.currency_service.convert_many(
+            amounts, Currency.GEL, target_currency
+        )
+
+
+def _receipt_key(receipt: Receipt) -> str:
+    return str(receipt.id)
+
+
+def _search_key(receipt: Receipt) -> str:
+    return f"{receipt.created_at}|{receipt.id}"
+
+
+def _parse_search_key(key: str) -> Tuple[datetime, UUID]:
+    created_at, separator, receipt_id = key.partition("|")
+    try:
+        if not separator:
+            raise ValueError
+        return datetime.fromisoformat(created_at), UUID(receipt_id)
+    except ValueError:
+        raise ValueError(f"Invalid search cursor '{key}'")
@@ -11,6 +11,12 @@ class ReceiptItemRepository(Protocol):
     def update(self, item: ReceiptItem) -> None:
         pass
 
+    def create_many(self, items: List[ReceiptItem]) -> None:
+        pass
+
+    def update_many(self, items: List[ReceiptItem]) -> None:
+        pass
+
     def read(self, receipt_id: UUID, item_id: UUID) -> ReceiptItem | None:
         pass
 
@@ -1,61 +1,93 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Protocol
+from uuid import UUID
 
-from app.core.Models.report import ReportRevenue, XReport, XReportItem
-from app.core.receipt import ReceiptRepository
-from app.core.receipt_item import ReceiptItemRepository
+from app.core.Models.receipt import Receipt, ReceiptItem
+from app.core.Models.report import HourlyRevenue, ReportRevenue, XReport, XReportItem
 from app.core.shift import ShiftService
+from app.core.unit_of_work import NoTransactionManager, TransactionManager
+
+
+class ReportRepository(Protocol):
+    def count_receipts(self, shift_id: UUID) -> int:
+        pass
+
+    def items_sold(self, shift_id: UUID) -> List[XReportItem]:
+        pass
+
+    def revenue(self, shift_id: UUID) -> List[ReportRevenue]:
+        pass
+
+    def revenue_between(
+        self, start: date | None, end: date | None
+    ) -> List[ReportRevenue]:
+        pass
+
+    def hourly_revenue(self, day: date) -> List[HourlyRevenue]:
+        pass
+
+    def roll_up_shift(self, shift_id: UUID) -> None:
+        pass
+
+    def record_sale(self, receipt: Receipt, items: List[ReceiptItem]) -> None:
+        pass
+
+    def summarized_shifts(self) -> List[UUID]:
+        pass
+
+    def rebuild(self) -> None:
+        pass
 
 
 @dataclass
 class ReportService:
-    receipts: ReceiptRepository
-    receipt_items: ReceiptItemRepository
+    reports: ReportRepository
     shift_service: ShiftService
+    transactions: TransactionManager = field(default_factory=NoTransactionManager)
 
     def generate_x_report(self) -> XReport:
         shift_id = self.shift_service.get_open_shift()
         if not shift_id:
             raise ValueError("Shift is not open")
 
-        receipts = self.receipts.read_by_shift(shift_id.shift_id)
-        item_sales = {}
-        revenue_by_currency = {}
-
-        for receipt in receipts:
-            receipt_items = self.receipt_items.read_by_receipt(receipt.id)
-            if receipt.payment_currency not in revenue_by_currency:
-                revenue_by_currency[receipt.payment_currency] = 0.0
-            revenue_by_currency[receipt.payment_currency] += receipt.payment_amount
-
-            for item in receipt_items:
-                if item.product_id not in item_sales:
-                    item_sales[item.product_id] = 0
-                item_sales[item.product_id] += item.quantity
-
-        items_sold = [
-            XReportItem(product_id=product_id, sold_amount=amount)
-            for product_id, amount in item_sales.items()
-        ]
-
-        revenue = [
-            ReportRevenue(currency=currency, amount=amount)
-            for currency, amount in revenue_by_currency.items()
-        ]
-
         return XReport(
-            receipt_number=len(receipts), items_sold=items_sold, revenue=revenue
+            receipt_number=self.reports.count_receipts(shift_id.shift_id),
+            items_sold=self.reports.items_sold(shift_id.shift_id),
+            revenue=self.reports.revenue(shift_id.shift_id),
         )
 
-    def generate_z_report(self) -> list[ReportRevenue]:
-        receipts = self.receipts.get_all()
-        revenue_by_currency = {}
+    def generate_z_report(
+        self, start: date | None = None, end: date | None = None
+    ) -> list[ReportRevenue]:
+        if start and end and start > end:
+            raise ValueError("Report start date is after its end date")
+        return self.reports.revenue_between(start, end)
 
-        for receipt in receipts:
-            if receipt.payment_currency not in revenue_by_currency:
-                revenue_by_currency[receipt.payment_currency] = 0.0
-            revenue_by_currency[receipt.payment_currency] += receipt.payment_amount
+    def generate_hourly_report(self, day: date) -> list[HourlyRevenue]:
+        return self.reports.hourly_revenue(day)
 
+    def close_shift(self, shift_id: UUID) -> None:
+        with self.transactions.transaction():
+            self.shift_service.close(shift_id)
+            self.reports.roll_up_shift(shift_id)
+
+    def rebuild_summaries(self) -> List[UUID]:
+        before = self._summaries()
+        self.reports.rebuild()
+        after = self._summaries()
         return [
-            ReportRevenue(currency=currency, amount=amount)
-            for currency, amount in revenue_by_currency.items()
+            shift_id
+            for shift_id in before.keys() | after.keys()
+            if before.get(shift_id) != after.get(shift_id)
         ]
+
+    def _summaries(self) -> Dict[UUID, XReport]:
+        return {
+            shift_id: XReport(
+                receipt_number=self.reports.count_receipts(shift_id),
+                items_sold=self.reports.items_sold(shift_id),
+                revenue=self.reports.revenue(shift_id),
+            )
+            for shift_id in self.reports.summarized_shifts()
+        }
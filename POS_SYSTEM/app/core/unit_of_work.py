@@ -0,0 +1,186 @@
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    List,
+    Protocol,
+    Set,
+    Tuple,
+)
+from uuid import UUID
+
+from app.core.Models.receipt import Receipt, ReceiptItem
+from app.core.receipt_item import ReceiptItemRepository
+
+if TYPE_CHECKING:
+    from app.core.receipt import ReceiptRepository
+    from app.core.report import ReportRepository
+
+
+class TransactionManager(Protocol):
+    def transaction(self) -> ContextManager[Any]:
+        pass
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        pass
+
+
+class NoTransactionManager:
+    def transaction(self) -> ContextManager[Any]:
+        return nullcontext()
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        callback()
+
+
+ItemKey = Tuple[UUID, UUID]
+
+
+def _snapshot(entity: Any) -> Dict[str, Any]:
+    return dict(vars(entity))
+
+
+def _changed_fields(entity: Any, snapshot: Dict[str, Any]) -> Set[str]:
+    return {name for name, value in vars(entity).items() if snapshot[name] != value}
+
+
+@dataclass
+class ReceiptUnitOfWork:
+    receipts: "ReceiptRepository"
+    receipt_items: ReceiptItemRepository
+    transactions: TransactionManager = field(default_factory=NoTransactionManager)
+    reports: "ReportRepository | None" = None
+
+    _receipts: Dict[UUID, Receipt | None] = field(default_factory=dict, init=False)
+    _receipt_snapshots: Dict[UUID, Dict[str, Any]] = field(
+        default_factory=dict, init=False
+    )
+    _new_receipts: Set[UUID] = field(default_factory=set, init=False)
+    _items: Dict[ItemKey, ReceiptItem | None] = field(default_factory=dict, init=False)
+    _item_snapshots: Dict[ItemKey, Dict[str, Any]] = field(
+        default_factory=dict, init=False
+    )
+    _new_items: Set[ItemKey] = field(default_factory=set, init=False)
+    _loaded_receipts: Set[UUID] = field(default_factory=set, init=False)
+    _sales: List[Receipt] = field(default_factory=list, init=False)
+
+    def __enter__(self) -> "ReceiptUnitOfWork":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.commit()
+
+    def read_receipt(self, receipt_id: UUID) -> Receipt | None:
+        if receipt_id not in self._receipts:
+            receipt = self.receipts.read(receipt_id)
+            self._receipts[receipt_id] = receipt
+            if receipt is not None:
+                self._receipt_snapshots[receipt_id] = _snapshot(receipt)
+        return self._receipts[receipt_id]
+
+    def add_receipt(self, receipt: Receipt) -> None:
+        self._receipts[receipt.id] = receipt
+        self._new_receipts.add(receipt.id)
+        self._loaded_receipts.add(receipt.id)
+
+    def read_item(self, receipt_id: UUID, product_id: UUID) -> ReceiptItem | None:
+        key = (receipt_id, product_id)
+        if key not in self._items and receipt_id not in self._loaded_receipts:
+            self._track_item(key, self.receipt_items.read(receipt_id, product_id))
+        return self._items.get(key)
+
+    def read_items(self, receipt_id: UUID) -> List[ReceiptItem]:
+        if receipt_id not in self._loaded_receipts:
+            for item in self.receipt_items.read_by_receipt(receipt_id):
+                key = (item.receipt_id, item.product_id)
+                if key not in self._items:
+                    self._track_item(key, item)
+            self._loaded_receipts.add(receipt_id)
+
+        return [
+            item
+            for (item_receipt_id, _), item in self._items.items()
+            if item_receipt_id == receipt_id and item is not None
+        ]
+
+    def add_item(self, item: ReceiptItem) -> None:
+        key = (item.receipt_id, item.product_id)
+        self._items[key] = item
+        self._new_items.add(key)
+
+    def record_sale(self, receipt: Receipt) -> None:
+        self._sales.append(receipt)
+
+    def changes(self, entity: Receipt | ReceiptItem) -> Set[str]:
+        if isinstance(entity, Receipt):
+            if entity.id in self._new_receipts:
+                return set(vars(entity))
+            return _changed_fields(entity, self._receipt_snapshots[entity.id])
+
+        key = (entity.receipt_id, entity.product_id)
+        if key in self._new_items:
+            return set(vars(entity))
+        return _changed_fields(entity, self._item_snapshots[key])
+
+    def commit(self) -> None:
+        dirty_receipts = [
+            receipt
+            for receipt in self._receipts.values()
+            if receipt is not None and self.changes(receipt)
+        ]
+        dirty_items = [
+            item
+            for item in self._items.values()
+            if item is not None and self.changes(item)
+        ]
+        if not dirty_receipts and not dirty_items:
+            return
+
+        with self.transactions.transaction():
+            for receipt in dirty_receipts:
+                if receipt.id in self._new_receipts:
+                    self.receipts.create(receipt)
+                else:
+                    self.receipts.update(receipt)
+            new_items, changed_items = [], []
+            for item in dirty_items:
+                if (item.receipt_id, item.product_id) in self._new_items:
+                    new_items.append(item)
+                else:
+                    changed_items.append(item)
+            if new_items:
+                self.receipt_items.create_many(new_items)
+            if changed_items:
+                self.receipt_items.update_many(changed_items)
+            if self.reports is not None:
+                for receipt in self._sales:
+                    self.reports.record_sale(receipt, self.read_items(receipt.id))
+
+        self._mark_clean()
+
+    def _track_item(self, key: ItemKey, item: ReceiptItem | None) -> None:
+        self._items[key] = item
+        if item is not None:
+            self._item_snapshots[key] = _snapshot(item)
+
+    def _mark_clean(self) -> None:
+        for receipt_id, receipt in self._receipts.items():
+            if receipt is not None:
+                self._receipt_snapshots[receipt_id] = _snapshot(receipt)
+        for key, item in self._items.items():
+            if item is not None:
+                self._item_snapshots[key] = _snapshot(item)
+        self._new_receipts.clear()
+        self._new_items.clear()
+        self._sales.clear()
@@ -0,0 +1,47 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, ParamSpec, TypeVar
+
+from app.infrastructure.write_scheduler import WriteScheduler
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+DEFAULT_WORKERS = 8
+
+
+@dataclass
+class DbExecutor:
+    workers: int = DEFAULT_WORKERS
+    writer: WriteScheduler | None = None
+
+    _pool: ThreadPoolExecutor | None = field(default=None, init=False)
+
+    def start(self) -> None:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="db")
+        if self.writer is not None:
+            self.writer.start()
+
+    async def run(self, call: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        if self._pool is None:
+            raise RuntimeError("DB executor is not running")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._pool, functools.partial(call, *args, **kwargs)
+        )
+
+    async def write(self, call: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        if self.writer is None:
+            return await self.run(call, *args, **kwargs)
+        job = functools.partial(call, *args, **kwargs)
+        return await asyncio.wrap_future(self.writer.submit(job))
+
+    def shutdown(self) -> None:
+        if self.writer is not None:
+            self.writer.shutdown()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
@@ -0,0 +1,51 @@
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict
+
+import requests
+
+from app.core.rate_cache import RateSnapshot
+
+DEFAULT_URL = "https://open.er-api.com/v6/latest/GEL"
+
+
+@dataclass
+class HttpRateSource:
+    url: str = DEFAULT_URL
+    timeout: float = 2.0
+
+    def fetch(self) -> Dict[str, float]:
+        response = requests.get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        data = response.json()
+        if data.get("result") != "success":
+            raise ValueError(f"Exchange rate lookup failed: {data.get('result')}")
+
+        return {code: float(rate) for code, rate in data["rates"].items()}
+
+
+@dataclass
+class RateFile:
+    path: str = "./rates.json"
+
+    def load(self) -> RateSnapshot | None:
+        try:
+            data = json.loads(Path(self.path).read_text())
+            return RateSnapshot(
+                {code: float(rate) for code, rate in data["rates"].items()},
+                float(data["fetched_at"]),
+            )
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    def save(self, snapshot: RateSnapshot) -> None:
+        partial = f"{self.path}.tmp"
+        try:
+            Path(partial).write_text(
+                json.dumps({"rates": snapshot.rates, "fetched_at": snapshot.fetched_at})
+            )
+            os.replace(partial, self.path)
+        except OSError:
+            pass
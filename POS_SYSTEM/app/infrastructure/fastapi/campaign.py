@@ -1,37 +1,38 @@
-from typing import Any
+from typing import Any, List
 from uuid import UUID
 
 from fastapi import APIRouter, HTTPException
 
-from app.core.campaign import CampaignService
-from app.core.Models.campaign import CreateCampaignRequest
-from app.infrastructure.fastapi.dependables import CampaignRepositoryDependable
+from app.core.Models.campaign import Campaign, CreateCampaignRequest
+from app.infrastructure.fastapi.dependables import ServicesDependable
 
 campaign_api: APIRouter = APIRouter()
 
 
 @campaign_api.post("/campaigns", status_code=201, response_model=dict[str, Any])
 async def create_campaign(
-    request: CreateCampaignRequest, campaigns: CampaignRepositoryDependable
+    request: CreateCampaignRequest, services: ServicesDependable
 ) -> dict[str, Any]:
     try:
-        campaign_id = CampaignService(campaigns).create(request)
+        campaign_id = await services.db.write(services.campaigns.create, request)
         return {"campaign": {"id": str(campaign_id)}}
     except ValueError as e:
         raise HTTPException(status_code=400, detail={"error": {"message": str(e)}})
 
 
-@campaign_api.get("/campaigns", response_model=dict[str, Any])
-async def list_campaigns(campaigns: CampaignRepositoryDependable) -> dict[str, Any]:
-    return {"campaigns": CampaignService(campaigns).read_all()}
+@campaign_api.get("/campaigns", response_model=dict[str, List[Campaign]])
+async def list_campaigns(
+    services: ServicesDependable,
+) -> dict[str, List[Campaign]]:
+    return {"campaigns": await services.db.run(services.campaigns.read_all)}
 
 
 @campaign_api.delete("/campaigns/{campaign_id}", status_code=200)
 async def deactivate_campaign(
-    campaign_id: UUID, campaigns: CampaignRepositoryDependable
+    campaign_id: UUID, services: ServicesDependable
 ) -> dict[str, Any]:
     try:
-        CampaignService(campaigns).deactivate(campaign_id)
+        await services.db.write(services.campaigns.deactivate, campaign_id)
         return {"status": "success"}
     except Exception as e:
         raise HTTPException(status_code=404, detail={"error": {"message": str(e)}})
@@ -1,27 +1,47 @@
 from __future__ import annotations
 
-from typing import Any, no_type_check
+import codecs
+import csv
+from typing import Any, AsyncIterator, List, Tuple, Type, TypeVar, no_type_check
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException
-from starlette.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import BaseModel, ValidationError
+from starlette.responses import JSONResponse, StreamingResponse
 
-from app.core.Models.product import CreateProductRequest, UpdateProductRequest
-from app.core.product import ProductService
-from app.infrastructure.fastapi.dependables import ProductRepositoryDependable
+from app.core.Models.product import (
+    BulkProductResponse,
+    BulkRowError,
+    BulkUpdateProductRequest,
+    CreateProductRequest,
+    Product,
+    ProductPage,
+    UpdateProductRequest,
+)
+from app.core.pagination import DEFAULT_LIMIT
+from app.infrastructure.fastapi.dependables import ServicesDependable
+from app.infrastructure.fastapi.streaming import ndjson_response
 
 product_api: APIRouter = APIRouter()
 
+RowT = TypeVar("RowT", bound=BaseModel)
+
+
+@product_api.get("/products/export", status_code=200, response_model=None)
+@no_type_check
+async def export_products(services: ServicesDependable) -> StreamingResponse:
+    return ndjson_response(services.products.iter_all())
+
 
 @product_api.get(
-    "/products/{product_id}", status_code=200, response_model=dict[str, Any]
+    "/products/{product_id}", status_code=200, response_model=dict[str, Product]
 )
 @no_type_check
-def read_product(
-    product_id: UUID, products: ProductRepositoryDependable
-) -> dict[str, Any] | JSONResponse:
+async def read_product(
+    product_id: UUID, services: ServicesDependable
+) -> dict[str, Product] | JSONResponse:
     try:
-        return {"product": ProductService(products).read(product_id)}
+        return {"product": await services.db.run(services.products.read, product_id)}
     except ValueError as e:
         return JSONResponse(
             status_code=404,
@@ -31,32 +51,117 @@ def read_product(
 
 @product_api.post("/products", status_code=201, response_model=dict[str, Any])
 @no_type_check
-def create_product(
-    request: CreateProductRequest, products: ProductRepositoryDependable
+async def create_product(
+    request: CreateProductRequest, services: ServicesDependable
 ) -> dict[str, Any] | JSONResponse:
     try:
-        return {"product": ProductService(products).create(request)}
+        return {"product": await services.db.write(services.products.create, request)}
     except ValueError as e:
         raise HTTPException(status_code=409, detail={"error": {"message": str(e)}})
 
 
-@product_api.get("/products", status_code=200, response_model=dict[str, Any])
+@product_api.post("/products/bulk", status_code=201, response_model=None)
 @no_type_check
-def read_all_products(
-    products: ProductRepositoryDependable,
-) -> dict[str, Any]:
-    return {"products": ProductService(products).read_all()}
+async def create_products(
+    request: Request, services: ServicesDependable
+) -> BulkProductResponse:
+    errors: List[BulkRowError] = []
+    rows = await _read_rows(request, CreateProductRequest, errors)
+    response = await services.db.write(services.products.create_many, rows)
+    response.errors = sorted(errors + response.errors, key=lambda e: e.row)
+    return response
+
+
+@product_api.patch("/products/bulk", status_code=200, response_model=None)
+@no_type_check
+async def update_products_in_bulk(
+    request: Request, services: ServicesDependable
+) -> BulkProductResponse:
+    errors: List[BulkRowError] = []
+    rows = await _read_rows(request, BulkUpdateProductRequest, errors)
+    response = await services.db.write(services.products.update_many, rows)
+    response.errors = sorted(errors + response.errors, key=lambda e: e.row)
+    return response
+
+
+@product_api.get(
+    "/products",
+    status_code=200,
+    response_model=ProductPage,
+    response_model_exclude_unset=True,
+)
+@no_type_check
+async def read_all_products(
+    services: ServicesDependable,
+    after: str | None = None,
+    limit: int = DEFAULT_LIMIT,
+) -> ProductPage:
+    try:
+        page = await services.db.run(services.products.read_page, after, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail={"error": {"message": str(e)}})
+
+    response = ProductPage(products=page.items)
+    if page.next_cursor:
+        response.next_cursor = page.next_cursor
+    return response
 
 
 @product_api.patch("/products/{product_id}", status_code=200, response_model=None)
 @no_type_check
-def update_products(
+async def update_products(
     request: UpdateProductRequest,
     product_id: UUID,
-    products: ProductRepositoryDependable,
+    services: ServicesDependable,
 ) -> None:
     try:
-        ProductService(products).update_product(request, product_id)
+        await services.db.write(services.products.update_product, request, product_id)
         return {"product updated"}
     except ValueError as e:
         raise HTTPException(status_code=409, detail={"error": {"message": str(e)}})
+
+
+async def _read_lines(request: Request) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in request.stream():
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def _read_rows(
+    request: Request, model: Type[RowT], errors: List[BulkRowError]
+) -> List[Tuple[int, RowT]]:
+    is_csv = request.headers.get("content-type", "").startswith("text/csv")
+    header: List[str] | None = None
+    rows: List[Tuple[int, RowT]] = []
+    row = 0
+    async for line in _read_lines(request):
+        row += 1
+        if not line.strip():
+            continue
+        try:
+            if not is_csv:
+                rows.append((row, model.model_validate_json(line)))
+            elif header is None:
+                header = next(csv.reader([line]))
+            else:
+                values = dict(zip(header, next(csv.reader([line]))))
+                rows.append((row, model.model_validate(values)))
+        except ValidationError as e:
+            errors.append(BulkRowError(row=row, message=_describe(e)))
+    return rows
+
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        ".".join(str(part) for part in e["loc"]) + f": {e['msg']}"
+        if e["loc"]
+        else e["msg"]
+        for e in error.errors()
+    )
@@ -1,50 +1,36 @@
-from typing import Any, no_type_check
+from typing import Annotated, Any, List, no_type_check
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from starlette.responses import StreamingResponse
 
-from app.core.campaign_observers import (
-    BuyNGetNCampaign,
-    ComboCampaign,
-    DiscountCampaign,
-    WholeReceiptDiscountCampaign,
-)
 from app.core.currency import Currency
 from app.core.Models.receipt import (
     AddItemRequest,
+    CheckoutRequest,
     GetReceiptResponse,
     PaymentRequest,
     QuoteRequest,
+    QuoteResponse,
+    Receipt,
+    ReceiptItem,
+    ReceiptPage,
     ReceiptProduct,
+    ReceiptSearchRequest,
 )
-from app.core.product import ProductService
-from app.core.receipt import (
-    ReceiptService,
-)
-from app.infrastructure.fastapi.dependables import (
-    CurrencyServiceDependable,
-    ProductRepositoryDependable,
-    ReceiptItemRepositoryDependable,
-    ReceiptRepositoryDependable,
-    ShiftServiceDependable,
-)
+from app.core.money import to_major
+from app.core.pagination import DEFAULT_LIMIT, Page
+from app.infrastructure.fastapi.dependables import ServicesDependable
+from app.infrastructure.fastapi.streaming import ndjson_response
 
 receipt_api: APIRouter = APIRouter()
 
 
 @receipt_api.post("/newReceipt", status_code=201)
 @no_type_check
-def create_receipt(
-    receipts: ReceiptRepositoryDependable,
-    receipt_items: ReceiptItemRepositoryDependable,
-    currency_service: CurrencyServiceDependable,
-    shift_service: ShiftServiceDependable,
-) -> dict[str, Any]:
+async def create_receipt(services: ServicesDependable) -> dict[str, Any]:
     try:
-        service = ReceiptService(
-            receipts, receipt_items, shift_service, currency_service
-        )
-        receipt_id = service.create()
+        receipt_id = await services.db.write(services.receipts.create)
         return {"receipt_id": receipt_id}
     except ValueError as e:
         raise HTTPException(status_code=400, detail={"error": {"message": str(e)}})
@@ -52,162 +38,176 @@ def create_receipt(
 
 @receipt_api.post("/receipts/addItem/{receipt_id}")
 @no_type_check
-def add_item(
-    receipt_id: UUID,
-    request: AddItemRequest,
-    receipts: ReceiptRepositoryDependable,
-    receipt_items: ReceiptItemRepositoryDependable,
-    currency_service: CurrencyServiceDependable,
-    products: ProductRepositoryDependable,
-    shift_service: ShiftServiceDependable,
+async def add_item(
+    receipt_id: UUID, request: AddItemRequest, services: ServicesDependable
 ) -> None:
     try:
-        product = ProductService(products).read(request.product_id)
-        service = ReceiptService(
-            receipts, receipt_items, shift_service, currency_service
+        product = await services.db.run(services.products.read, request.product_id)
+        await services.db.write(
+            services.receipts.add_item, receipt_id, request, product
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail={"error": {"message": str(e)}})
+
+
+@receipt_api.post("/receipts/addItems/{receipt_id}")
+@no_type_check
+async def add_items(
+    receipt_id: UUID, request: List[AddItemRequest], services: ServicesDependable
+) -> None:
+    try:
+        scanned = await services.db.run(
+            services.products.read_many, [item.product_id for item in request]
+        )
+        await services.db.write(
+            services.receipts.add_items, receipt_id, request, scanned
         )
-        service.add_item(receipt_id, request, product)
     except ValueError as e:
         raise HTTPException(status_code=400, detail={"error": {"message": str(e)}})
 
 
 @receipt_api.get("/receipts/calculate/{receipt_id}")
 @no_type_check
-def calculate_total(
-    receipt_id: UUID,
-    receipts: ReceiptRepositoryDependable,
-    receipt_items: ReceiptItemRepositoryDependable,
-    currency_service: CurrencyServiceDependable,
-    shift_service: ShiftServiceDependable,
+async def calculate_total(
+    receipt_id: UUID, services: ServicesDependable
 ) -> dict[str, float]:
     try:
-        service = ReceiptService(
-            receipts, receipt_items, shift_service, currency_service
-        )
-        total = service.calculate_total(receipt_id)
-        return {"total": total}
+        total = await services.db.write(services.receipts.calculate_total, receipt_id)
+        return {"total": to_major(total)}
     except ValueError as e:
         raise HTTPException(status_code=400, detail={"error": {"message": str(e)}})
 
 
 @receipt_api.get("/receipts/quotes/{receipt_id}")
 @no_type_check
-def get_quote(
-    receipt_id: UUID,
-    request: QuoteRequest,
-    receipts: ReceiptRepositoryDependable,
-    receipt_items: ReceiptItemRepositoryDependable,
-    currency_service: CurrencyServiceDependable,
-    shift_service: ShiftServiceDependable,
-) -> dict[str, Any]:
+async def get_quote(
+    receipt_id: UUID, request: QuoteRequest, services: ServicesDependable
+) -> QuoteResponse:
     try:
-        service = ReceiptService(
-            receipts, receipt_items, shift_service, currency_service
+        return await services.db.run(
+            services.receipts.get_quote, receipt_id, request.currency
         )
-        quote = service.get_quote(receipt_id, request.currency)
-        return {
-            "subtotal": quote.subtotal,
-            "total_discount": quote.total_discount,
-            "total": quote.total,
-            "currency": quote.currency.value,
-        }
     except ValueError as e:
         raise HTTPException(status_code=400, detail={"error": {"message": str(e)}})
 
 
 @receipt_api.post("/receipts/close/{receipt_id}")
 @no_type_check
-def close_receipt(
-    receipt_id: UUID,
-    receipts: ReceiptRepositoryDependable,
-    receipt_items: ReceiptItemRepositoryDependable,
-    currency_service: CurrencyServiceDependable,
-    shift_service: ShiftServiceDependable,
-) -> None:
+async def close_receipt(receipt_id: UUID, services: ServicesDependable) -> None:
+    try:
+        await services.db.write(services.receipts.close_receipt, receipt_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail={"error": {"message": str(e)}})
+
+
+@receipt_api.get("/receipts", response_model_exclude_unset=True)
+@no_type_check
+async def list_receipts(
+    services: ServicesDependable,
+    after: str | None = None,
+    limit: int = DEFAULT_LIMIT,
+) -> ReceiptPage:
+    try:
+        page = await services.db.run(services.receipts.read_page, after, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail={"error": {"message": str(e)}})
+
+    return _receipt_page(page)
+
+
+@receipt_api.get("/receipts/search", response_model_exclude_unset=True)
+@no_type_check
+async def search_receipts(
+    query: Annotated[ReceiptSearchRequest, Query()], services: ServicesDependable
+) -> ReceiptPage:
     try:
-        service = ReceiptService(
-            receipts, receipt_items, shift_service, currency_service
+        page = await services.db.run(
+            services.receipts.search, query, query.after, query.limit
         )
-        service.close_receipt(receipt_id)
     except ValueError as e:
         raise HTTPException(status_code=400, detail={"error": {"message": str(e)}})
 
+    return _receipt_page(page)
+
+
+@receipt_api.get("/receipts/export", response_model=None)
+@no_type_check
+async def export_receipts(services: ServicesDependable) -> StreamingResponse:
+    return ndjson_response(services.receipts.iter_all())
+
 
 @receipt_api.get("/receipts/{receipt_id}")
 @no_type_check
-def get_receipt(
+async def get_receipt(
     receipt_id: UUID,
-    receipts: ReceiptRepositoryDependable,
-    receipt_items: ReceiptItemRepositoryDependable,
-    currency_service: CurrencyServiceDependable,
-    products: ProductRepositoryDependable,
-    shift_service: ShiftServiceDependable,
+    services: ServicesDependable,
     currency: Currency = Currency.GEL,
 ) -> GetReceiptResponse:
     try:
-        service = ReceiptService(
-            receipts, receipt_items, shift_service, currency_service
+        receipt = await services.db.run(
+            services.receipts.get_receipt, receipt_id, currency
         )
-        receipt = service.get_receipt(receipt_id, currency)
-        items = service.get_receipt_items(receipt_id, currency)
-
-        receipt_items = []
-        for item in items:
-            cur_product = products.read(item.product_id)
-            receipt_items.append(
-                ReceiptProduct(
-                    id=cur_product.id,
-                    name=cur_product.name,
-                    price=cur_product.price,
-                    quantity=item.quantity,
-                )
-            )
-
-        return GetReceiptResponse(
-            id=receipt.id,
-            state=receipt.state.value,
-            subtotal=receipt.subtotal,
-            total_discount=receipt.total_discount,
-            total=receipt.total,
-            savings=receipt.savings,
-            currency=receipt.payment_currency,
-            items=receipt_items,
+        items = await services.db.run(
+            services.receipts.get_receipt_items, receipt_id, currency
         )
+        return _receipt_response(receipt, items)
     except ValueError as e:
         raise HTTPException(status_code=404, detail={"error": {"message": str(e)}})
 
 
 @receipt_api.post("/receipts/pay/{receipt_id}")
 @no_type_check
-def process_payment(
-    receipt_id: UUID,
-    payment: PaymentRequest,
-    receipts: ReceiptRepositoryDependable,
-    receipt_items: ReceiptItemRepositoryDependable,
-    currency_service: CurrencyServiceDependable,
-    shift_service: ShiftServiceDependable,
+async def process_payment(
+    receipt_id: UUID, payment: PaymentRequest, services: ServicesDependable
 ) -> None:
     try:
-        service = ReceiptService(
-            receipts, receipt_items, shift_service, currency_service
+        await services.db.write(services.receipts.process_payment, receipt_id, payment)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail={"error": {"message": str(e)}})
+
+
+@receipt_api.post("/checkout", status_code=201)
+@no_type_check
+async def checkout(
+    request: CheckoutRequest, services: ServicesDependable
+) -> GetReceiptResponse:
+    try:
+        scanned = await services.db.run(
+            services.products.read_many, [item.product_id for item in request.items]
         )
-        service.process_payment(receipt_id, payment)
+        receipt = await services.db.write(services.receipts.checkout, request, scanned)
+        items = await services.db.run(services.receipts.get_receipt_items, receipt.id)
+        return _receipt_response(receipt, items)
     except ValueError as e:
         raise HTTPException(status_code=400, detail={"error": {"message": str(e)}})
 
 
-def create_receipt_service(
-    receipts: ReceiptRepositoryDependable,
-    receipt_items: ReceiptItemRepositoryDependable,
-    currency_service: CurrencyServiceDependable,
-    shift_service: ShiftServiceDependable,
-) -> ReceiptService:
-    service = ReceiptService(receipts, receipt_items, shift_service, currency_service)
+def _receipt_page(page: Page[Receipt]) -> ReceiptPage:
+    response = ReceiptPage(receipts=page.items)
+    if page.next_cursor:
+        response.next_cursor = page.next_cursor
+    return response
 
-    # Register observers
-    service.add_observer(BuyNGetNCampaign())
-    service.add_observer(DiscountCampaign())
-    service.add_observer(ComboCampaign())
-    service.add_observer(WholeReceiptDiscountCampaign())
 
-    return service
+@no_type_check
+def _receipt_response(receipt: Receipt, items: List[ReceiptItem]) -> GetReceiptResponse:
+    receipt_items = [
+        ReceiptProduct(
+            id=item.product_id,
+            name=item.product_name,
+            price=item.unit_price,
+            quantity=item.quantity,
+        )
+        for item in items
+    ]
+
+    return GetReceiptResponse(
+        id=receipt.id,
+        state=receipt.state.value,
+        subtotal=receipt.subtotal,
+        total_discount=receipt.total_discount,
+        total=receipt.total,
+        savings=receipt.savings,
+        currency=receipt.payment_currency,
+        items=receipt_items,
+    )
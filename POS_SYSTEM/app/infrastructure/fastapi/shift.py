@@ -1,73 +1,65 @@
+from datetime import date
 from typing import Any
 from uuid import UUID
 
 from fastapi import APIRouter, HTTPException
 
-from app.core.Models.report import ReportRevenue, XReport
-from app.core.report import ReportService
-from app.core.shift import ShiftService
-from app.infrastructure.fastapi.dependables import (
-    ReceiptItemRepositoryDependable,
-    ReceiptRepositoryDependable,
-    ShiftRepositoryDependable,
-    ShiftServiceDependable,
-)
+from app.core.Models.report import HourlyRevenue, ReportRevenue, XReport
+from app.infrastructure.fastapi.dependables import ServicesDependable
 
 shift_api: APIRouter = APIRouter()
 
 
 @shift_api.post("/shifts/open", status_code=201)
-def open_shift(shifts: ShiftRepositoryDependable) -> dict[str, Any]:
+async def open_shift(services: ServicesDependable) -> dict[str, Any]:
     try:
-        service = ShiftService(shifts)
-        shift_id = service.create()
+        shift_id = await services.db.write(services.shifts.create)
         return {"shift_id": shift_id}
     except ValueError as e:
         raise HTTPException(status_code=400, detail={"error": {"message": str(e)}})
 
 
 @shift_api.get("/shifts/state/{shift_id}")
-def get_shift_state(
-    shift_id: UUID, shifts: ShiftRepositoryDependable
+async def get_shift_state(
+    shift_id: UUID, services: ServicesDependable
 ) -> dict[str, str]:
     try:
-        service = ShiftService(shifts)
-        state = service.state(shift_id)
+        state = await services.db.run(services.shifts.state, shift_id)
         return {"shift_id": str(shift_id), "state": state.value}
     except ValueError as e:
         raise HTTPException(status_code=404, detail={"error": {"message": str(e)}})
 
 
 @shift_api.post("/shifts/close/{shift_id}")
-def close_shift(shift_id: UUID, shifts: ShiftRepositoryDependable) -> None:
+async def close_shift(shift_id: UUID, services: ServicesDependable) -> None:
     try:
-        service = ShiftService(shifts)
-        service.close(shift_id)
+        await services.db.write(services.reports.close_shift, shift_id)
     except ValueError as e:
         raise HTTPException(status_code=400, detail={"error": {"message": str(e)}})
 
 
 @shift_api.get("/shifts/x-reports")
-def get_x_report(
-    receipts: ReceiptRepositoryDependable,
-    receipt_items: ReceiptItemRepositoryDependable,
-    shifts: ShiftServiceDependable,
-) -> XReport:
+async def get_x_report(services: ServicesDependable) -> XReport:
     try:
-        service = ReportService(receipts, receipt_items, shifts)
-        return service.generate_x_report()
+        return await services.db.run(services.reports.generate_x_report)
     except ValueError as e:
         raise HTTPException(status_code=404, detail={"error": {"message": str(e)}})
 
 
 @shift_api.get("/shifts/z-reports")
-def get_y_report(
-    receipts: ReceiptRepositoryDependable,
-    receipt_items: ReceiptItemRepositoryDependable,
-    shifts: ShiftServiceDependable,
+async def get_y_report(
+    services: ServicesDependable,
+    start: date | None = None,
+    end: date | None = None,
 ) -> list[ReportRevenue]:
     try:
-        service = ReportService(receipts, receipt_items, shifts)
-        return service.generate_z_report()
+        return await services.db.run(services.reports.generate_z_report, start, end)
     except ValueError as e:
-        raise HTTPException(status_code=404, detail={"error": {"message": str(e)}})
+        raise HTTPException(status_code=400, detail={"error": {"message": str(e)}})
+
+
+@shift_api.get("/shifts/z-reports/hourly")
+async def get_hourly_report(
+    day: date, services: ServicesDependable
+) -> list[HourlyRevenue]:
+    return await services.db.run(services.reports.generate_hourly_report, day)
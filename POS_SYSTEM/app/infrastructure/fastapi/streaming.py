@@ -0,0 +1,18 @@
+from typing import Any, Dict, Iterable, Iterator
+
+from pydantic import TypeAdapter
+from starlette.responses import StreamingResponse
+
+_adapters: Dict[type, TypeAdapter[Any]] = {}
+
+
+def ndjson_response(items: Iterable[Any]) -> StreamingResponse:
+    return StreamingResponse(_lines(items), media_type="application/x-ndjson")
+
+
+def _lines(items: Iterable[Any]) -> Iterator[bytes]:
+    for item in items:
+        adapter = _adapters.get(type(item))
+        if adapter is None:
+            adapter = _adapters[type(item)] = TypeAdapter(type(item))
+        yield adapter.dump_json(item) + b"\n"
@@ -1,47 +1,27 @@
 import sqlite3
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 
 from app.core.Models.campaign import Campaign, CampaignType
+from app.infrastructure.sqlite.connection import ConnectionManager
+from app.infrastructure.sqlite.schema import migrate
 
 
 class CampaignDb:
-    def __init__(self, db_path: str = "./store.db"):
+    def __init__(
+        self,
+        db_path: str = "./store.db",
+        connections: ConnectionManager | None = None,
+    ):
         self.db_path = db_path
+        self.connections = connections or ConnectionManager.shared(db_path)
         self.up()
 
     def up(self) -> None:
-        with sqlite3.connect(self.db_path) as connection:
-            cursor = connection.cursor()
-            # Create campaigns table
-            create_campaigns_table_query = """
-            CREATE TABLE IF NOT EXISTS campaigns (
-                id TEXT PRIMARY KEY,
-                type TEXT,
-                amount_to_exceed REAL,
-                percentage REAL,
-                is_active INTEGER,
-                amount INTEGER,
-                gift_amount INTEGER,
-                gift_product_type TEXT
-            )
-            """
-            cursor.execute(create_campaigns_table_query)
-
-            # Create campaign_relations table
-            create_relations_table_query = """
-            CREATE TABLE IF NOT EXISTS campaign_relations (
-                campaign_id TEXT,
-                product_id TEXT,
-                PRIMARY KEY (campaign_id, product_id),
-                FOREIGN KEY (campaign_id) REFERENCES campaigns (id)
-            )
-            """
-            cursor.execute(create_relations_table_query)
-            connection.commit()
+        migrate(self.connections.connection())
 
     def clear(self) -> None:
-        with sqlite3.connect(self.db_path) as connection:
+        with self.connections.transaction() as connection:
             cursor = connection.cursor()
             # Clear both tables
             truncate_campaigns_query = """
@@ -52,38 +32,13 @@ class CampaignDb:
             """
             cursor.execute(truncate_campaigns_query)
             cursor.execute(truncate_relations_query)
-            connection.commit()
+            self._bump_version(cursor)
 
     def read(self, campaign_id: UUID) -> Campaign:
-        select_query = """
-            SELECT type, amount_to_exceed, percentage, is_active, 
-            amount, gift_amount, gift_product_type 
-            FROM campaigns 
-            WHERE id = ?;
-        """
-        with sqlite3.connect(self.db_path) as connection:
-            cursor = connection.cursor()
-            cursor.execute(select_query, (str(campaign_id),))
-            row = cursor.fetchone()
-            if row:
-                campaign_type = CampaignType(row[0])
-                campaign = Campaign(
-                    type=campaign_type,
-                    amount_to_exceed=row[1],
-                    percentage=row[2],
-                    is_active=bool(row[3]),
-                    amount=row[4],
-                    gift_amount=row[5],
-                    gift_product_type=row[6],
-                    id=campaign_id,
-                )
-
-                product_ids = self.get_campaign_product_ids(campaign_id)
-                campaign.product_ids = product_ids
-
-                return campaign
-            else:
-                raise Exception(f"campaign with {campaign_id} does not exist")
+        campaigns = self._load("WHERE c.id = ?", (str(campaign_id),))
+        if campaigns:
+            return campaigns[0]
+        raise Exception(f"campaign with {campaign_id} does not exist")
 
     def add(self, campaign: Campaign) -> Campaign:
         insert_query = """
@@ -91,7 +46,7 @@ class CampaignDb:
             amount, gift_amount, gift_product_type)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?);
         """
-        with sqlite3.connect(self.db_path) as connection:
+        with self.connections.transaction() as connection:
             cursor = connection.cursor()
             cursor.execute(
                 insert_query,
@@ -110,40 +65,11 @@ class CampaignDb:
             if hasattr(campaign, "product_ids") and campaign.product_ids:
                 self.add_campaign_product_ids(campaign.id, campaign.product_ids, cursor)
 
-            connection.commit()
+            self._bump_version(cursor)
             return campaign
 
     def read_all(self) -> List[Campaign]:
-        select_query = """
-            SELECT id, type, amount_to_exceed, percentage, is_active, 
-            amount, gift_amount, gift_product_type 
-            FROM campaigns;
-        """
-        with sqlite3.connect(self.db_path) as connection:
-            cursor = connection.cursor()
-            cursor.execute(select_query)
-            rows = cursor.fetchall()
-
-            campaigns = []
-            for row in rows:
-                campaign_id = UUID(row[0])
-                campaign = Campaign(
-                    id=campaign_id,
-                    type=CampaignType(row[1]),
-                    amount_to_exceed=row[2],
-                    percentage=row[3],
-                    is_active=bool(row[4]),
-                    amount=row[5],
-                    gift_amount=row[6],
-                    gift_product_type=row[7],
-                )
-
-                product_ids = self.get_campaign_product_ids(campaign_id)
-                campaign.product_ids = product_ids
-
-                campaigns.append(campaign)
-
-            return campaigns
+        return self._load()
 
     def deactivate(self, campaign_id: UUID) -> None:
         update_query = """
@@ -151,12 +77,18 @@ class CampaignDb:
             SET is_active = 0 
             WHERE id = ?;
         """
-        with sqlite3.connect(self.db_path) as connection:
+        with self.connections.transaction() as connection:
             cursor = connection.cursor()
             cursor.execute(update_query, (str(campaign_id),))
             if cursor.rowcount == 0:
                 raise Exception(f"campaign with {campaign_id} does not exist")
-            connection.commit()
+            self._bump_version(cursor)
+
+    def version(self) -> int:
+        cursor = self.connections.connection().cursor()
+        cursor.execute("SELECT version FROM campaign_version WHERE id = 0;")
+        version: int = cursor.fetchone()[0]
+        return version
 
     def add_campaign_product_ids(
         self,
@@ -168,34 +100,59 @@ class CampaignDb:
             INSERT INTO campaign_relations (campaign_id, product_id)
             VALUES (?, ?);
         """
-        should_commit = cursor is None
+        if cursor is not None:
+            for product_id in product_ids:
+                cursor.execute(insert_query, (str(campaign_id), product_id))
+            return
 
-        if should_commit:
-            connection = sqlite3.connect(self.db_path)
+        with self.connections.transaction() as connection:
             c = connection.cursor()
-        else:
-            assert cursor is not None
-            c = cursor
-
-        try:
             for product_id in product_ids:
                 c.execute(insert_query, (str(campaign_id), product_id))
 
-            if should_commit:
-                connection.commit()
-                connection.close()
-        except Exception as e:
-            if should_commit:
-                connection.close()
-            raise e
-
     def get_campaign_product_ids(self, campaign_id: UUID) -> List[str]:
         select_query = """
             SELECT product_id FROM campaign_relations
             WHERE campaign_id = ?;
         """
-        with sqlite3.connect(self.db_path) as connection:
-            cursor = connection.cursor()
-            cursor.execute(select_query, (str(campaign_id),))
-            rows = cursor.fetchall()
-            return [row[0] for row in rows]
+        cursor = self.connections.connection().cursor()
+        cursor.execute(select_query, (str(campaign_id),))
+        rows = cursor.fetchall()
+        return [row[0] for row in rows]
+
+    def _bump_version(self, cursor: sqlite3.Cursor) -> None:
+        cursor.execute(
+            "UPDATE campaign_version SET version = version + 1 WHERE id = 0;"
+        )
+
+    def _load(self, where: str = "", params: Tuple[str, ...] = ()) -> List[Campaign]:
+        select_query = f"""
+            SELECT c.id, c.type, c.amount_to_exceed, c.percentage, c.is_active,
+            c.amount, c.gift_amount, c.gift_product_type, r.product_id
+            FROM campaigns c
+            LEFT JOIN campaign_relations r ON r.campaign_id = c.id
+            {where}
+            ORDER BY c.rowid, r.product_id;
+        """
+        cursor = self.connections.connection().cursor()
+        cursor.execute(select_query, params)
+
+        campaigns: Dict[str, Campaign] = {}
+        for row in cursor:
+            campaign = campaigns.get(row[0])
+            if campaign is None:
+                campaign = Campaign(
+                    id=UUID(row[0]),
+                    type=CampaignType(row[1]),
+                    amount_to_exceed=row[2],
+                    percentage=row[3],
+                    is_active=bool(row[4]),
+                    amount=row[5],
+                    gift_amount=row[6],
+                    gift_product_type=row[7],
+                )
+                campaigns[row[0]] = campaign
+            if row[8] is not None:
+                campaign.product_ids.append(row[8])
+
+        return list(campaigns.values())
@@ -0,0 +1,90 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List
+
+
+class ConnectionManager:
+    PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": "-16000",
+        "mmap_size": "268435456",
+        "busy_timeout": "5000",
+    }
+
+    _shared: Dict[str, "ConnectionManager"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, db_path: str = "./store.db") -> None:
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+
+    @classmethod
+    def shared(cls, db_path: str) -> "ConnectionManager":
+        with cls._shared_lock:
+            if db_path not in cls._shared:
+                cls._shared[db_path] = cls(db_path)
+            return cls._shared[db_path]
+
+    def connection(self) -> sqlite3.Connection:
+        connection: sqlite3.Connection | None = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._connect()
+            self._local.connection = connection
+            self._local.depth = 0
+            self._local.committed = []
+        return connection
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        connection = self.connection()
+        depth: int = self._local.depth
+        savepoint = f"sp_{depth}"
+
+        connection.execute("BEGIN" if depth == 0 else f"SAVEPOINT {savepoint}")
+        self._local.depth = depth + 1
+        try:
+            yield connection
+        except BaseException:
+            self._local.depth = depth
+            if depth == 0:
+                self._local.committed = []
+                connection.execute("ROLLBACK")
+            else:
+                connection.execute(f"ROLLBACK TO {savepoint}")
+                connection.execute(f"RELEASE {savepoint}")
+            raise
+        self._local.depth = depth
+        connection.execute("COMMIT" if depth == 0 else f"RELEASE {savepoint}")
+        if depth == 0:
+            callbacks, self._local.committed = self._local.committed, []
+            for callback in callbacks:
+                callback()
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        self.connection()
+        if self._local.depth == 0:
+            callback()
+        else:
+            self._local.committed.append(callback)
+
+    def close(self) -> None:
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self.db_path, isolation_level=None, check_same_thread=False
+        )
+        connection.row_factory = sqlite3.Row
+        for pragma, value in self.PRAGMAS.items():
+            connection.execute(f"PRAGMA {pragma} = {value}")
+        with self._lock:
+            self._connections.append(connection)
+        return connection
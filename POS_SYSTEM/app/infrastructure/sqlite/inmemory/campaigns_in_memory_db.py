@@ -8,6 +8,7 @@ class InMemoryCampaignDb:
     def __init__(self) -> None:
         self.campaigns: Dict[str, Campaign] = {}
         self.campaign_relations: Dict[str, List[str]] = {}
+        self._version = 0
 
     def up(self) -> None:
         # No setup needed for in-memory database
@@ -16,6 +17,7 @@ class InMemoryCampaignDb:
     def clear(self) -> None:
         self.campaigns.clear()
         self.campaign_relations.clear()
+        self._version += 1
 
     def read(self, campaign_id: UUID) -> Campaign:
         campaign_id_str = str(campaign_id)
@@ -35,6 +37,7 @@ class InMemoryCampaignDb:
         if hasattr(campaign, "product_ids") and campaign.product_ids:
             self.add_campaign_product_ids(campaign.id, campaign.product_ids)
 
+        self._version += 1
         return campaign
 
     def read_all(self) -> List[Campaign]:
@@ -64,6 +67,10 @@ class InMemoryCampaignDb:
         campaign = self.campaigns[campaign_id_str]
         campaign.is_active = False
         self.campaigns[campaign_id_str] = campaign
+        self._version += 1
+
+    def version(self) -> int:
+        return self._version
 
     def add_campaign_product_ids(
         self, campaign_id: UUID, product_ids: List[str]
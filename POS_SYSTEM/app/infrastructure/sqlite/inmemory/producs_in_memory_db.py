@@ -1,4 +1,4 @@
-from typing import Dict, List
+from typing import Dict, Iterable, List, Set
 from uuid import UUID
 
 from app.core.Models.product import Product
@@ -18,20 +18,52 @@ class InMemoryProductDb:
     def read(self, product_id: UUID) -> Product | None:
         return self.products.get(str(product_id))
 
+    def read_many(self, product_ids: Iterable[UUID]) -> Dict[UUID, Product]:
+        return {
+            product_id: self.products[str(product_id)]
+            for product_id in product_ids
+            if str(product_id) in self.products
+        }
+
     def add(self, product: Product) -> Product:
         self.products[str(product.id)] = product
         return product
 
+    def add_many(self, products: List[Product]) -> None:
+        for product in products:
+            self.add(product)
+
     def find_by_name(self, name: str) -> Product | None:
         for product in self.products.values():
             if product.name == name:
                 return product
         return None
 
+    def find_by_names(self, names: List[str]) -> Dict[str, UUID]:
+        wanted = set(names)
+        return {
+            product.name: product.id
+            for product in self.products.values()
+            if product.name in wanted
+        }
+
+    def existing_ids(self, product_ids: List[UUID]) -> Set[UUID]:
+        return {pid for pid in product_ids if str(pid) in self.products}
+
     def read_all(self) -> List[Product]:
         return list(self.products.values())
 
+    def read_page(self, after: str | None, limit: int) -> List[Product]:
+        ids = sorted(
+            product_id for product_id in self.products if product_id > (after or "")
+        )
+        return [self.products[product_id] for product_id in ids[:limit]]
+
     def update(self, product: Product) -> None:
         if str(product.id) not in self.products:
             raise KeyError(f"Product with id {product.id} not found")
         self.products[str(product.id)] = product
+
+    def update_many(self, products: List[Product]) -> None:
+        for product in products:
+            self.update(product)
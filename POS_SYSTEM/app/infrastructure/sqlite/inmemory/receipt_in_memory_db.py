@@ -1,19 +1,22 @@
 from typing import Dict, List
 from uuid import UUID
 
-from app.core.Models.receipt import Receipt
+from app.core.Models.receipt import Receipt, ReceiptQuery
 from app.core.receipt import ReceiptRepository
 
 
 class InMemoryReceiptDb(ReceiptRepository):
     def __init__(self) -> None:
         self.receipts: Dict[str, Receipt] = {}
+        self.by_shift: Dict[UUID, List[str]] = {}
+        self.versions: Dict[str, int] = {}
 
     def up(self) -> None:
         pass
 
     def create(self, receipt: Receipt) -> Receipt:
         self.receipts[str(receipt.id)] = receipt
+        self.by_shift.setdefault(receipt.shift_id, []).append(str(receipt.id))
         return receipt
 
     def read(self, receipt_id: UUID) -> Receipt | None:
@@ -22,13 +25,48 @@ class InMemoryReceiptDb(ReceiptRepository):
     def update(self, receipt: Receipt) -> None:
         if str(receipt.id) in self.receipts:
             self.receipts[str(receipt.id)] = receipt
+            self.versions[str(receipt.id)] = self.versions.get(str(receipt.id), 0) + 1
+
+    def version(self, receipt_id: UUID) -> int | None:
+        if str(receipt_id) not in self.receipts:
+            return None
+        return self.versions.get(str(receipt_id), 0)
 
     def read_by_shift(self, shift_id: UUID) -> List[Receipt]:
         return [
-            receipt
-            for receipt in self.receipts.values()
-            if receipt.shift_id == shift_id
+            self.receipts[receipt_id]
+            for receipt_id in self.by_shift.get(shift_id, [])
+            if receipt_id in self.receipts
         ]
 
     def get_all(self) -> List[Receipt]:
         return list(self.receipts.values())
+
+    def read_page(self, after: str | None, limit: int) -> List[Receipt]:
+        ids = sorted(
+            receipt_id for receipt_id in self.receipts if receipt_id > (after or "")
+        )
+        return [self.receipts[receipt_id] for receipt_id in ids[:limit]]
+
+    def search(
+        self, query: ReceiptQuery, after: str | None, limit: int
+    ) -> List[Receipt]:
+        matches = [
+            receipt
+            for receipt in self.receipts.values()
+            if _matches(receipt, query)
+            and (after is None or f"{receipt.created_at}|{receipt.id}" < after)
+        ]
+        matches.sort(key=lambda r: (str(r.created_at), str(r.id)), reverse=True)
+        return matches[:limit]
+
+
+def _matches(receipt: Receipt, query: ReceiptQuery) -> bool:
+    return (
+        (query.start is None or receipt.created_at >= query.start)
+        and (query.end is None or receipt.created_at < query.end)
+        and (query.state is None or receipt.state == query.state)
+        and (query.currency is None or receipt.payment_currency == query.currency)
+        and (query.min_amount is None or receipt.payment_amount >= query.min_amount)
+        and (query.max_amount is None or receipt.payment_amount <= query.max_amount)
+    )
@@ -28,6 +28,14 @@ class InMemoryReceiptItemDb(ReceiptItemRepository):
                     self.receipt_items[key][i] = item
                     break
 
+    def create_many(self, items: List[ReceiptItem]) -> None:
+        for item in items:
+            self.create(item)
+
+    def update_many(self, items: List[ReceiptItem]) -> None:
+        for item in items:
+            self.update(item)
+
     def read(self, receipt_id: UUID, product_id: UUID) -> ReceiptItem | None:
         key = str(receipt_id)
         if key not in self.receipt_items:
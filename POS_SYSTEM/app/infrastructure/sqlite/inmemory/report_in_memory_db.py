@@ -0,0 +1,136 @@
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Set, Tuple
+from uuid import UUID
+
+from app.core.currency import Currency
+from app.core.Models.receipt import Receipt, ReceiptItem, ReceiptState
+from app.core.Models.report import HourlyRevenue, ReportRevenue, XReportItem
+from app.core.report import ReportRepository
+from app.infrastructure.sqlite.inmemory.receipt_in_memory_db import InMemoryReceiptDb
+from app.infrastructure.sqlite.inmemory.receipt_item_in_memory_db import (
+    InMemoryReceiptItemDb,
+)
+
+Bucket = Tuple[datetime, Currency | None]
+
+
+class InMemoryReportDb(ReportRepository):
+    def __init__(
+        self, receipts: InMemoryReceiptDb, receipt_items: InMemoryReceiptItemDb
+    ) -> None:
+        self.receipts = receipts
+        self.receipt_items = receipt_items
+        self.receipt_counts: Dict[UUID, int] = {}
+        self.sold: Dict[UUID, Dict[UUID, int]] = {}
+        self.revenues: Dict[UUID, Dict[Currency | None, int]] = {}
+        self.hourly: Dict[Bucket, Tuple[int, int]] = {}
+        self.rolled_up: Set[UUID] = set()
+
+    def up(self) -> None:
+        pass
+
+    def count_receipts(self, shift_id: UUID) -> int:
+        return self.receipt_counts.get(shift_id, 0)
+
+    def items_sold(self, shift_id: UUID) -> List[XReportItem]:
+        return [
+            XReportItem(product_id=product_id, sold_amount=amount)
+            for product_id, amount in self.sold.get(shift_id, {}).items()
+        ]
+
+    def revenue(self, shift_id: UUID) -> List[ReportRevenue]:
+        return [
+            ReportRevenue(currency=currency, amount=amount)
+            for currency, amount in self.revenues.get(shift_id, {}).items()
+        ]
+
+    def revenue_between(
+        self, start: date | None, end: date | None
+    ) -> List[ReportRevenue]:
+        revenue: Dict[Currency | None, int] = {}
+        for (hour, currency), (_, amount) in self._buckets():
+            if (start is None or hour.date() >= start) and (
+                end is None or hour.date() <= end
+            ):
+                revenue[currency] = revenue.get(currency, 0) + amount
+        return [
+            ReportRevenue(currency=currency, amount=amount)
+            for currency, amount in revenue.items()
+        ]
+
+    def hourly_revenue(self, day: date) -> List[HourlyRevenue]:
+        hourly: Dict[Bucket, Tuple[int, int]] = {}
+        for bucket, totals in self._buckets():
+            if bucket[0].date() == day:
+                _add(hourly, bucket, totals)
+        return [
+            HourlyRevenue(
+                hour=hour, currency=currency, receipt_count=count, amount=amount
+            )
+            for (hour, currency), (count, amount) in sorted(
+                hourly.items(), key=lambda entry: entry[0][0]
+            )
+        ]
+
+    def roll_up_shift(self, shift_id: UUID) -> None:
+        if shift_id in self.rolled_up:
+            return
+
+        self.rolled_up.add(shift_id)
+        for bucket, totals in _by_hour(self._sold(shift_id)):
+            _add(self.hourly, bucket, totals)
+
+    def record_sale(self, receipt: Receipt, items: List[ReceiptItem]) -> None:
+        shift_id = receipt.shift_id
+        self.receipt_counts[shift_id] = self.receipt_counts.get(shift_id, 0) + 1
+        sold = self.sold.setdefault(shift_id, {})
+        for item in items:
+            sold[item.product_id] = sold.get(item.product_id, 0) + item.quantity
+        revenue = self.revenues.setdefault(shift_id, {})
+        revenue[receipt.payment_currency] = (
+            revenue.get(receipt.payment_currency, 0) + receipt.payment_amount
+        )
+        if shift_id in self.rolled_up:
+            for bucket, totals in _by_hour([receipt]):
+                _add(self.hourly, bucket, totals)
+
+    def summarized_shifts(self) -> List[UUID]:
+        return list(self.receipt_counts)
+
+    def rebuild(self) -> None:
+        self.receipt_counts.clear()
+        self.sold.clear()
+        self.revenues.clear()
+        self.hourly.clear()
+        for receipt in self.receipts.get_all():
+            if receipt.state in (ReceiptState.PAYED, ReceiptState.CLOSED):
+                self.record_sale(
+                    receipt, self.receipt_items.read_by_receipt(receipt.id)
+                )
+
+    def _sold(self, shift_id: UUID) -> List[Receipt]:
+        return [
+            receipt
+            for receipt in self.receipts.read_by_shift(shift_id)
+            if receipt.state in (ReceiptState.PAYED, ReceiptState.CLOSED)
+        ]
+
+    def _buckets(self) -> Iterable[Tuple[Bucket, Tuple[int, int]]]:
+        yield from self.hourly.items()
+        for shift_id in self.receipts.by_shift.keys() - self.rolled_up:
+            yield from _by_hour(self._sold(shift_id))
+
+
+def _by_hour(receipts: List[Receipt]) -> Iterable[Tuple[Bucket, Tuple[int, int]]]:
+    for receipt in receipts:
+        hour = receipt.created_at.replace(minute=0, second=0, microsecond=0)
+        yield (hour, receipt.payment_currency), (1, receipt.payment_amount)
+
+
+def _add(
+    buckets: Dict[Bucket, Tuple[int, int]],
+    bucket: Bucket,
+    totals: Tuple[int, int],
+) -> None:
+    count, amount = buckets.get(bucket, (0, 0))
+    buckets[bucket] = (count + totals[0], amount + totals[1])
@@ -1,29 +1,29 @@
-import sqlite3
-from typing import List
+import json
+from typing import Dict, Iterable, List, Set
 from uuid import UUID
 
 from app.core.Models.product import Product
+from app.infrastructure.sqlite.connection import ConnectionManager
+from app.infrastructure.sqlite.schema import migrate
+
+MAX_VARIABLES = 999
 
 
 class ProductDb(object):
-    def __init__(self, db_path: str = "./store.db"):
+    def __init__(
+        self,
+        db_path: str = "./store.db",
+        connections: ConnectionManager | None = None,
+    ):
         self.db_path = db_path
+        self.connections = connections or ConnectionManager.shared(db_path)
         self.up()
 
     def up(self) -> None:
-        with sqlite3.connect(self.db_path) as connection:
-            cursor = connection.cursor()
-            create_table_query = """
-                        CREATE TABLE IF NOT EXISTS products (
-                            id TEXT,
-                            name TEXT,
-                            price FLOAT
-                        )
-                    """
-            cursor.execute(create_table_query)
+        migrate(self.connections.connection())
 
     def clear(self) -> None:
-        with sqlite3.connect(self.db_path) as connection:
+        with self.connections.transaction() as connection:
             cursor = connection.cursor()
 
             truncate_products_query = """
@@ -31,67 +31,133 @@ class ProductDb(object):
             """
 
             cursor.execute(truncate_products_query)
-            connection.commit()
 
     def read(self, product_id: UUID) -> Product | None:
         select_query = """
             SELECT name, price, id FROM products WHERE id = ?;
         """
-        with sqlite3.connect(self.db_path) as connection:
-            cursor = connection.cursor()
-            cursor.execute(select_query, (str(product_id),))
-            row = cursor.fetchone()
-            if row:
-                return Product(
+        cursor = self.connections.connection().cursor()
+        cursor.execute(select_query, (str(product_id),))
+        row = cursor.fetchone()
+        if row:
+            return Product(
+                name=row[0],
+                price=row[1],
+                id=UUID(row[2]),
+            )
+        return None
+
+    def read_many(self, product_ids: Iterable[UUID]) -> Dict[UUID, Product]:
+        ids = list({str(product_id) for product_id in product_ids})
+        cursor = self.connections.connection().cursor()
+        products = {}
+        for start in range(0, len(ids), MAX_VARIABLES):
+            chunk = ids[start : start + MAX_VARIABLES]
+            placeholders = ", ".join("?" * len(chunk))
+            cursor.execute(
+                f"SELECT name, price, id FROM products WHERE id IN ({placeholders})",
+                chunk,
+            )
+            for row in cursor.fetchall():
+                product_id = UUID(row[2])
+                products[product_id] = Product(
                     name=row[0],
                     price=row[1],
-                    id=row[2],
+                    id=product_id,
                 )
-        return None
+        return products
 
     def add(self, product: Product) -> Product:
         insert_query = """
             INSERT INTO products (id, name, price)
             VALUES (?, ?, ?);
         """
-        with sqlite3.connect(self.db_path) as connection:
+        with self.connections.transaction() as connection:
             cursor = connection.cursor()
             cursor.execute(insert_query, (str(product.id), product.name, product.price))
-            connection.commit()
             return product
 
+    def add_many(self, products: List[Product]) -> None:
+        insert_query = """
+            INSERT INTO products (id, name, price)
+            VALUES (?, ?, ?);
+        """
+        with self.connections.transaction() as connection:
+            cursor = connection.cursor()
+            cursor.executemany(
+                insert_query,
+                (
+                    (str(product.id), product.name, product.price)
+                    for product in products
+                ),
+            )
+
     def find_by_name(self, name: str) -> Product | None:
         select_query = """
             SELECT name, price, id FROM products WHERE name = ?;
         """
-        with sqlite3.connect(self.db_path) as connection:
-            cursor = connection.cursor()
-            cursor.execute(select_query, (name,))
-            row = cursor.fetchone()
-            if row:
-                return Product(
-                    name=row[0],
-                    price=row[1],
-                    id=row[2],
-                )
-            return None
+        cursor = self.connections.connection().cursor()
+        cursor.execute(select_query, (name,))
+        row = cursor.fetchone()
+        if row:
+            return Product(
+                name=row[0],
+                price=row[1],
+                id=UUID(row[2]),
+            )
+        return None
+
+    def find_by_names(self, names: List[str]) -> Dict[str, UUID]:
+        select_query = """
+            SELECT name, id FROM products
+            WHERE name IN (SELECT value FROM json_each(?));
+        """
+        cursor = self.connections.connection().cursor()
+        cursor.execute(select_query, (json.dumps(names),))
+        return {row[0]: UUID(row[1]) for row in cursor.fetchall()}
+
+    def existing_ids(self, product_ids: List[UUID]) -> Set[UUID]:
+        select_query = """
+            SELECT id FROM products
+            WHERE id IN (SELECT value FROM json_each(?));
+        """
+        cursor = self.connections.connection().cursor()
+        cursor.execute(select_query, (json.dumps([str(pid) for pid in product_ids]),))
+        return {UUID(row[0]) for row in cursor.fetchall()}
 
     def read_all(self) -> List[Product]:
         select_query = """
             SELECT name, price, id FROM products;
         """
-        with sqlite3.connect(self.db_path) as connection:
-            cursor = connection.cursor()
-            cursor.execute(select_query)
-            rows = cursor.fetchall()
-            return [
-                Product(
-                    name=row[0],
-                    price=row[1],
-                    id=row[2],
-                )
-                for row in rows
-            ]
+        cursor = self.connections.connection().cursor()
+        cursor.execute(select_query)
+        rows = cursor.fetchall()
+        return [
+            Product(
+                name=row[0],
+                price=row[1],
+                id=UUID(row[2]),
+            )
+            for row in rows
+        ]
+
+    def read_page(self, after: str | None, limit: int) -> List[Product]:
+        select_query = """
+            SELECT name, price, id FROM products
+            WHERE id > ?
+            ORDER BY id
+            LIMIT ?;
+        """
+        cursor = self.connections.connection().cursor()
+        cursor.execute(select_query, (after or "", limit))
+        return [
+            Product(
+                name=row[0],
+                price=row[1],
+                id=UUID(row[2]),
+            )
+            for row in cursor.fetchall()
+        ]
 
     def update(self, product: Product) -> None:
         update_query = """
@@ -100,7 +166,23 @@ class ProductDb(object):
                 price = ?
             WHERE id = ?
         """
-        with sqlite3.connect(self.db_path) as connection:
+        with self.connections.transaction() as connection:
             cursor = connection.cursor()
             cursor.execute(update_query, (product.name, product.price, str(product.id)))
-            connection.commit()
+
+    def update_many(self, products: List[Product]) -> None:
+        update_query = """
+            UPDATE products
+            SET name = ?,
+                price = ?
+            WHERE id = ?
+        """
+        with self.connections.transaction() as connection:
+            cursor = connection.cursor()
+            cursor.executemany(
+                update_query,
+                (
+                    (product.name, product.price, str(product.id))
+                    for product in products
+                ),
+            )
@@ -1,41 +1,35 @@
 import sqlite3
-from typing import List
+from datetime import datetime
+from typing import Any, List, Tuple
 from uuid import UUID
 
 from app.core.currency import Currency
-from app.core.Models.receipt import Receipt, ReceiptState
+from app.core.Models.receipt import Receipt, ReceiptQuery, ReceiptState
 from app.core.receipt import ReceiptRepository
+from app.infrastructure.sqlite.connection import ConnectionManager
+from app.infrastructure.sqlite.schema import migrate
 
 
 class ReceiptDb(ReceiptRepository):
-    def __init__(self, db_path: str = "./store.db"):
+    def __init__(
+        self,
+        db_path: str = "./store.db",
+        connections: ConnectionManager | None = None,
+    ):
         self.db_path = db_path
+        self.connections = connections or ConnectionManager.shared(db_path)
         self.up()
 
     def up(self) -> None:
-        with sqlite3.connect(self.db_path) as connection:
-            cursor = connection.cursor()
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS receipts (
-                    id TEXT PRIMARY KEY,
-                    shift_id TEXT,
-                    state TEXT,
-                    created_at TIMESTAMP,
-                    subtotal FLOAT,
-                    total_discount FLOAT,
-                    payment_amount FLOAT,
-                    payment_currency TEXT,
-                    FOREIGN KEY (shift_id) REFERENCES shifts (shift_id)
-                )
-            """)
+        migrate(self.connections.connection())
 
     def create(self, receipt: Receipt) -> Receipt:
-        with sqlite3.connect(self.db_path) as connection:
+        with self.connections.transaction() as connection:
             cursor = connection.cursor()
             cursor.execute(
                 """
                 INSERT INTO receipts (
-                    id, shift_id, state, created_at, 
+                    id, shift_id, state, created_at,
                     subtotal, total_discount, payment_amount, payment_currency
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """,
@@ -52,43 +46,28 @@ class ReceiptDb(ReceiptRepository):
                     else None,
                 ),
             )
-            connection.commit()
             return receipt
 
     def read(self, receipt_id: UUID) -> Receipt | None:
-        with sqlite3.connect(self.db_path) as connection:
-            connection.row_factory = sqlite3.Row
-            cursor = connection.cursor()
-            cursor.execute("SELECT * FROM receipts WHERE id = ?", (str(receipt_id),))
-            row = cursor.fetchone()
-            if row:
-                payment_currency = None
-                if row["payment_currency"]:
-                    payment_currency = Currency(row["payment_currency"])
-
-                return Receipt(
-                    id=UUID(row["id"]),
-                    shift_id=UUID(row["shift_id"]),
-                    state=ReceiptState(row["state"]),
-                    created_at=row["created_at"],
-                    subtotal=row["subtotal"],
-                    total_discount=row["total_discount"],
-                    payment_amount=row["payment_amount"],
-                    payment_currency=payment_currency,
-                )
-            return None
+        cursor = self.connections.connection().cursor()
+        cursor.execute("SELECT * FROM receipts WHERE id = ?", (str(receipt_id),))
+        row = cursor.fetchone()
+        if row:
+            return self._to_receipt(row)
+        return None
 
     def update(self, receipt: Receipt) -> None:
-        with sqlite3.connect(self.db_path) as connection:
+        with self.connections.transaction() as connection:
             cursor = connection.cursor()
             cursor.execute(
                 """
-                UPDATE receipts 
+                UPDATE receipts
                 SET state = ?,
                     subtotal = ?,
                     total_discount = ?,
                     payment_amount = ?,
-                    payment_currency = ?
+                    payment_currency = ?,
+                    version = version + 1
                 WHERE id = ?
                 """,
                 (
@@ -102,57 +81,79 @@ class ReceiptDb(ReceiptRepository):
                     str(receipt.id),
                 ),
             )
-            connection.commit()
+
+    def version(self, receipt_id: UUID) -> int | None:
+        cursor = self.connections.connection().cursor()
+        cursor.execute("SELECT version FROM receipts WHERE id = ?", (str(receipt_id),))
+        row = cursor.fetchone()
+        return int(row[0]) if row else None
 
     def read_by_shift(self, shift_id: UUID) -> List[Receipt]:
-        with sqlite3.connect(self.db_path) as connection:
-            connection.row_factory = sqlite3.Row
-            cursor = connection.cursor()
-            cursor.execute(
-                "SELECT * FROM receipts WHERE shift_id = ?", (str(shift_id),)
-            )
-            rows = cursor.fetchall()
-            receipts = []
-
-            for row in rows:
-                payment_currency = None
-                if row["payment_currency"]:
-                    payment_currency = Currency(row["payment_currency"])
-
-                receipt = Receipt(
-                    id=UUID(row["id"]),
-                    shift_id=UUID(row["shift_id"]),
-                    state=ReceiptState(row["state"]),
-                    created_at=row["created_at"],
-                    subtotal=row["subtotal"],
-                    total_discount=row["total_discount"],
-                    payment_amount=row["payment_amount"],
-                    payment_currency=payment_currency,
-                )
-                receipts.append(receipt)
-        return receipts
+        cursor = self.connections.connection().cursor()
+        cursor.execute("SELECT * FROM receipts WHERE shift_id = ?", (str(shift_id),))
+        return [self._to_receipt(row) for row in cursor.fetchall()]
 
     def get_all(self) -> List[Receipt]:
-        with sqlite3.connect(self.db_path) as connection:
-            connection.row_factory = sqlite3.Row
-            cursor = connection.cursor()
-            cursor.execute("SELECT * FROM receipts")
-            rows = cursor.fetchall()
-            receipts = []
-            for row in rows:
-                payment_currency = None
-                if row["payment_currency"]:
-                    payment_currency = Currency(row["payment_currency"])
-
-                receipt = Receipt(
-                    id=UUID(row["id"]),
-                    shift_id=UUID(row["shift_id"]),
-                    state=ReceiptState(row["state"]),
-                    created_at=row["created_at"],
-                    subtotal=row["subtotal"],
-                    total_discount=row["total_discount"],
-                    payment_amount=row["payment_amount"],
-                    payment_currency=payment_currency,
-                )
-                receipts.append(receipt)
-        return receipts
+        cursor = self.connections.connection().cursor()
+        cursor.execute("SELECT * FROM receipts")
+        return [self._to_receipt(row) for row in cursor.fetchall()]
+
+    def read_page(self, after: str | None, limit: int) -> List[Receipt]:
+        cursor = self.connections.connection().cursor()
+        cursor.execute(
+            "SELECT * FROM receipts WHERE id > ? ORDER BY id LIMIT ?",
+            (after or "", limit),
+        )
+        return [self._to_receipt(row) for row in cursor.fetchall()]
+
+    def search(
+        self, query: ReceiptQuery, after: str | None, limit: int
+    ) -> List[Receipt]:
+        cursor = self.connections.connection().cursor()
+        cursor.execute(*self.search_query(query, after, limit))
+        return [self._to_receipt(row) for row in cursor.fetchall()]
+
+    def search_query(
+        self, query: ReceiptQuery, after: str | None, limit: int
+    ) -> Tuple[str, List[Any]]:
+        conditions, params = [], []
+        for condition, value in [
+            ("created_at >= ?", query.start),
+            ("created_at < ?", query.end),
+            ("state = ?", query.state.value if query.state else None),
+            ("payment_currency = ?", query.currency.value if query.currency else None),
+            ("payment_amount >= ?", query.min_amount),
+            ("payment_amount <= ?", query.max_amount),
+        ]:
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+        if after:
+            conditions.append("(created_at, id) < (?, ?)")
+            params.extend(after.split("|", 1))
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return (
+            f"""
+            SELECT * FROM receipts {where}
+            ORDER BY created_at DESC, id DESC
+            LIMIT ?
+            """,
+            params + [limit],
+        )
+
+    def _to_receipt(self, row: sqlite3.Row) -> Receipt:
+        payment_currency = None
+        if row["payment_currency"]:
+            payment_currency = Currency(row["payment_currency"])
+
+        return Receipt(
+            id=UUID(row["id"]),
+            shift_id=UUID(row["shift_id"]),
+            state=ReceiptState(row["state"]),
+            created_at=datetime.fromisoformat(row["created_at"]),
+            subtotal=row["subtotal"],
+            total_discount=row["total_discount"],
+            payment_amount=row["payment_amount"],
+            payment_currency=payment_currency,
+        )
@@ -1,50 +1,40 @@
 import sqlite3
-from typing import List
+from typing import List, Tuple
 from uuid import UUID
 
 from app.core.Models.receipt import ReceiptItem
 from app.core.receipt_item import ReceiptItemRepository
+from app.infrastructure.sqlite.connection import ConnectionManager
+from app.infrastructure.sqlite.schema import migrate
+
+COLUMNS = "receipt_id, product_id, quantity, unit_price, product_name"
 
 
 class ReceiptItemDb(ReceiptItemRepository):
-    def __init__(self, db_path: str = "./store.db"):
+    def __init__(
+        self,
+        db_path: str = "./store.db",
+        connections: ConnectionManager | None = None,
+    ):
         self.db_path = db_path
+        self.connections = connections or ConnectionManager.shared(db_path)
         self.up()
 
     def up(self) -> None:
-        with sqlite3.connect(self.db_path) as connection:
-            cursor = connection.cursor()
-            cursor.execute("""
-                   CREATE TABLE IF NOT EXISTS receipt_items (
-                       receipt_id TEXT NOT NULL,
-                       product_id TEXT NOT NULL,
-                       quantity INTEGER,
-                       PRIMARY KEY (receipt_id, product_id),
-                       FOREIGN KEY (receipt_id) REFERENCES receipts (id),
-                       FOREIGN KEY (product_id) REFERENCES products (id)
-                   )
-               """)
+        migrate(self.connections.connection())
 
     def create(self, item: ReceiptItem) -> ReceiptItem:
-        with sqlite3.connect(self.db_path) as connection:
+        with self.connections.transaction() as connection:
             cursor = connection.cursor()
             cursor.execute(
-                """
-                INSERT INTO receipt_items (
-                    receipt_id, product_id, quantity
-                ) VALUES (?, ?, ?)
-                """,
-                (
-                    str(item.receipt_id),
-                    str(item.product_id),
-                    item.quantity,
-                ),
+                f"INSERT INTO receipt_items ({COLUMNS}) VALUES (?, ?, ?, ?, ?)",
+                self._to_row(item),
             )
-            connection.commit()
+            self._touch(connection, [item])
             return item
 
     def update(self, item: ReceiptItem) -> None:
-        with sqlite3.connect(self.db_path) as connection:
+        with self.connections.transaction() as connection:
             cursor = connection.cursor()
             cursor.execute(
                 """
@@ -58,39 +48,81 @@ class ReceiptItemDb(ReceiptItemRepository):
                     str(item.product_id),
                 ),
             )
-            connection.commit()
+            self._touch(connection, [item])
 
-    def read(self, receipt_id: UUID, item_id: UUID) -> ReceiptItem | None:
-        with sqlite3.connect(self.db_path) as connection:
-            cursor = connection.cursor()
-            cursor.execute(
+    def create_many(self, items: List[ReceiptItem]) -> None:
+        with self.connections.transaction() as connection:
+            connection.executemany(
+                f"INSERT INTO receipt_items ({COLUMNS}) VALUES (?, ?, ?, ?, ?)",
+                [self._to_row(item) for item in items],
+            )
+            self._touch(connection, items)
+
+    def update_many(self, items: List[ReceiptItem]) -> None:
+        with self.connections.transaction() as connection:
+            connection.executemany(
                 """
-                SELECT * FROM receipt_items 
-                WHERE product_id = ? AND receipt_id = ?
+                UPDATE receipt_items
+                SET quantity = ?
+                WHERE receipt_id = ? AND product_id = ?
                 """,
-                (
-                    str(item_id),
-                    str(receipt_id),
-                ),
+                [
+                    (item.quantity, str(item.receipt_id), str(item.product_id))
+                    for item in items
+                ],
             )
-            row = cursor.fetchone()
-            if row:
-                return ReceiptItem(
-                    receipt_id=UUID(row[0]), product_id=UUID(row[1]), quantity=row[2]
-                )
-            return None
+            self._touch(connection, items)
+
+    def read(self, receipt_id: UUID, item_id: UUID) -> ReceiptItem | None:
+        cursor = self.connections.connection().cursor()
+        cursor.execute(
+            f"""
+            SELECT {COLUMNS} FROM receipt_items
+            WHERE product_id = ? AND receipt_id = ?
+            """,
+            (
+                str(item_id),
+                str(receipt_id),
+            ),
+        )
+        row = cursor.fetchone()
+        if row:
+            return self._to_item(row)
+        return None
 
     # todo
     def read_by_receipt(self, receipt_id: UUID) -> List[ReceiptItem]:
-        with sqlite3.connect(self.db_path) as connection:
-            cursor = connection.cursor()
-            cursor.execute(
-                "SELECT * FROM receipt_items WHERE receipt_id = ?", (str(receipt_id),)
-            )
-            rows = cursor.fetchall()
-            return [
-                ReceiptItem(
-                    receipt_id=UUID(row[0]), product_id=UUID(row[1]), quantity=row[2]
-                )
-                for row in rows
-            ]
+        cursor = self.connections.connection().cursor()
+        cursor.execute(
+            f"SELECT {COLUMNS} FROM receipt_items WHERE receipt_id = ?",
+            (str(receipt_id),),
+        )
+        rows = cursor.fetchall()
+        return [self._to_item(row) for row in rows]
+
+    @staticmethod
+    def _touch(connection: sqlite3.Connection, items: List[ReceiptItem]) -> None:
+        connection.executemany(
+            "UPDATE receipts SET version = version + 1 WHERE id = ?",
+            [(receipt_id,) for receipt_id in {str(item.receipt_id) for item in items}],
+        )
+
+    @staticmethod
+    def _to_row(item: ReceiptItem) -> Tuple[str, str, int, int, str]:
+        return (
+            str(item.receipt_id),
+            str(item.product_id),
+            item.quantity,
+            item.unit_price,
+            item.product_name,
+        )
+
+    @staticmethod
+    def _to_item(row: sqlite3.Row) -> ReceiptItem:
+        return ReceiptItem(
+            receipt_id=UUID(row[0]),
+            product_id=UUID(row[1]),
+            quantity=row[2],
+            unit_price=row[3],
+            product_name=row[4],
+        )
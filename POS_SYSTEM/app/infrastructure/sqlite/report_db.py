@@ -0,0 +1,264 @@
+from datetime import date, datetime, timedelta
+from typing import List
+from uuid import UUID
+
+from app.core.currency import Currency
+from app.core.Models.receipt import Receipt, ReceiptItem
+from app.core.Models.report import HourlyRevenue, ReportRevenue, XReportItem
+from app.core.report import ReportRepository
+from app.infrastructure.sqlite.connection import ConnectionManager
+from app.infrastructure.sqlite.schema import migrate
+
+SOLD = "('PAYED', 'CLOSED')"
+
+OPEN_SHIFT_RECEIPTS = f"""
+    FROM receipts
+    WHERE shift_id IN (SELECT shift_id FROM shifts WHERE state = 'OPEN')
+    AND state IN {SOLD}
+"""
+
+
+ROLLUPS = [("daily_revenue", "day", 10), ("hourly_revenue", "hour", 13)]
+
+
+class ReportDb(ReportRepository):
+    def __init__(
+        self,
+        db_path: str = "./store.db",
+        connections: ConnectionManager | None = None,
+    ):
+        self.db_path = db_path
+        self.connections = connections or ConnectionManager.shared(db_path)
+        self.up()
+
+    def up(self) -> None:
+        migrate(self.connections.connection())
+
+    def count_receipts(self, shift_id: UUID) -> int:
+        cursor = self.connections.connection().cursor()
+        cursor.execute(
+            "SELECT receipt_count FROM shift_summaries WHERE shift_id = ?",
+            (str(shift_id),),
+        )
+        row = cursor.fetchone()
+        return int(row[0]) if row else 0
+
+    def items_sold(self, shift_id: UUID) -> List[XReportItem]:
+        cursor = self.connections.connection().cursor()
+        cursor.execute(
+            """
+            SELECT product_id, quantity FROM shift_items_sold
+            WHERE shift_id = ?
+            ORDER BY product_id
+            """,
+            (str(shift_id),),
+        )
+        return [
+            XReportItem(product_id=UUID(row[0]), sold_amount=row[1])
+            for row in cursor.fetchall()
+        ]
+
+    def revenue(self, shift_id: UUID) -> List[ReportRevenue]:
+        cursor = self.connections.connection().cursor()
+        cursor.execute(
+            """
+            SELECT currency, amount FROM shift_revenue
+            WHERE shift_id = ?
+            ORDER BY currency
+            """,
+            (str(shift_id),),
+        )
+        return [
+            ReportRevenue(currency=_currency(row[0]), amount=row[1])
+            for row in cursor.fetchall()
+        ]
+
+    def revenue_between(
+        self, start: date | None, end: date | None
+    ) -> List[ReportRevenue]:
+        first = start.isoformat() if start else "0000-00-00"
+        last = end.isoformat() if end else "9999-99-99"
+        after_last = (end + timedelta(days=1)).isoformat() if end else "9999-99-99"
+        cursor = self.connections.connection().cursor()
+        cursor.execute(
+            f"""
+            SELECT currency, SUM(amount) FROM (
+                SELECT currency, amount FROM daily_revenue
+                WHERE day BETWEEN ? AND ?
+                UNION ALL
+                SELECT COALESCE(payment_currency, ''), payment_amount
+                {OPEN_SHIFT_RECEIPTS}
+                AND created_at >= ? AND created_at < ?
+            )
+            GROUP BY currency
+            ORDER BY currency
+            """,
+            (first, last, first, after_last),
+        )
+        return [
+            ReportRevenue(currency=_currency(row[0]), amount=row[1])
+            for row in cursor.fetchall()
+        ]
+
+    def hourly_revenue(self, day: date) -> List[HourlyRevenue]:
+        cursor = self.connections.connection().cursor()
+        cursor.execute(
+            f"""
+            SELECT hour, currency, SUM(receipt_count), SUM(amount) FROM (
+                SELECT hour, currency, receipt_count, amount FROM hourly_revenue
+                WHERE hour BETWEEN ? AND ?
+                UNION ALL
+                SELECT substr(created_at, 1, 13), COALESCE(payment_currency, ''),
+                       1, payment_amount
+                {OPEN_SHIFT_RECEIPTS}
+                AND created_at >= ? AND created_at < ?
+            )
+            GROUP BY hour, currency
+            ORDER BY hour, currency
+            """,
+            (
+                f"{day.isoformat()} 00",
+                f"{day.isoformat()} 23",
+                day.isoformat(),
+                (day + timedelta(days=1)).isoformat(),
+            ),
+        )
+        return [
+            HourlyRevenue(
+                hour=datetime.strptime(row[0], "%Y-%m-%d %H"),
+                currency=_currency(row[1]),
+                receipt_count=row[2],
+                amount=row[3],
+            )
+            for row in cursor.fetchall()
+        ]
+
+    def roll_up_shift(self, shift_id: UUID) -> None:
+        with self.connections.transaction() as connection:
+            cursor = connection.execute(
+                "INSERT OR IGNORE INTO rolled_up_shifts (shift_id) VALUES (?)",
+                (str(shift_id),),
+            )
+            if cursor.rowcount == 0:
+                return
+
+            for table, bucket, width in ROLLUPS:
+                connection.execute(
+                    f"""
+                    INSERT INTO {table} ({bucket}, currency, receipt_count, amount)
+                    SELECT substr(created_at, 1, {width}),
+                           COALESCE(payment_currency, ''),
+                           COUNT(*), SUM(payment_amount)
+                    FROM receipts
+                    WHERE shift_id = ? AND state IN {SOLD}
+                    GROUP BY 1, 2
+                    ON CONFLICT ({bucket}, currency) DO UPDATE
+                    SET receipt_count = receipt_count + excluded.receipt_count,
+                        amount = amount + excluded.amount
+                    """,
+                    (str(shift_id),),
+                )
+
+    def record_sale(self, receipt: Receipt, items: List[ReceiptItem]) -> None:
+        shift_id = str(receipt.shift_id)
+        currency = receipt.payment_currency.value if receipt.payment_currency else ""
+        with self.connections.transaction() as connection:
+            connection.execute(
+                """
+                INSERT INTO shift_summaries (shift_id, receipt_count) VALUES (?, 1)
+                ON CONFLICT (shift_id)
+                DO UPDATE SET receipt_count = receipt_count + 1
+                """,
+                (shift_id,),
+            )
+            connection.executemany(
+                """
+                INSERT INTO shift_items_sold (shift_id, product_id, quantity)
+                VALUES (?, ?, ?)
+                ON CONFLICT (shift_id, product_id)
+                DO UPDATE SET quantity = quantity + excluded.quantity
+                """,
+                [(shift_id, str(item.product_id), item.quantity) for item in items],
+            )
+            connection.execute(
+                """
+                INSERT INTO shift_revenue (shift_id, currency, amount)
+                VALUES (?, ?, ?)
+                ON CONFLICT (shift_id, currency)
+                DO UPDATE SET amount = amount + excluded.amount
+                """,
+                (shift_id, currency, receipt.payment_amount),
+            )
+            for table, bucket, width in ROLLUPS:
+                connection.execute(
+                    f"""
+                    INSERT INTO {table} ({bucket}, currency, receipt_count, amount)
+                    SELECT substr(created_at, 1, {width}),
+                           COALESCE(payment_currency, ''), 1, payment_amount
+                    FROM receipts
+                    WHERE id = ?
+                    AND shift_id IN (SELECT shift_id FROM rolled_up_shifts)
+                    ON CONFLICT ({bucket}, currency) DO UPDATE
+                    SET receipt_count = receipt_count + excluded.receipt_count,
+                        amount = amount + excluded.amount
+                    """,
+                    (str(receipt.id),),
+                )
+
+    def summarized_shifts(self) -> List[UUID]:
+        cursor = self.connections.connection().cursor()
+        cursor.execute("SELECT shift_id FROM shift_summaries")
+        return [UUID(row[0]) for row in cursor.fetchall()]
+
+    def rebuild(self) -> None:
+        with self.connections.transaction() as connection:
+            connection.execute("DELETE FROM shift_summaries")
+            connection.execute("DELETE FROM shift_items_sold")
+            connection.execute("DELETE FROM shift_revenue")
+            for table, bucket, width in ROLLUPS:
+                connection.execute(f"DELETE FROM {table}")
+                connection.execute(
+                    f"""
+                    INSERT INTO {table} ({bucket}, currency, receipt_count, amount)
+                    SELECT substr(receipts.created_at, 1, {width}),
+                           COALESCE(receipts.payment_currency, ''),
+                           COUNT(*), SUM(receipts.payment_amount)
+                    FROM receipts
+                    JOIN rolled_up_shifts
+                    ON rolled_up_shifts.shift_id = receipts.shift_id
+                    WHERE receipts.state IN {SOLD}
+                    GROUP BY 1, 2
+                    """
+                )
+            connection.execute(
+                f"""
+                INSERT INTO shift_summaries (shift_id, receipt_count)
+                SELECT shift_id, COUNT(*) FROM receipts
+                WHERE state IN {SOLD}
+                GROUP BY shift_id
+                """
+            )
+            connection.execute(
+                f"""
+                INSERT INTO shift_items_sold (shift_id, product_id, quantity)
+                SELECT receipts.shift_id, receipt_items.product_id,
+                       SUM(receipt_items.quantity)
+                FROM receipts
+                JOIN receipt_items ON receipt_items.receipt_id = receipts.id
+                WHERE receipts.state IN {SOLD}
+                GROUP BY receipts.shift_id, receipt_items.product_id
+                """
+            )
+            connection.execute(
+                f"""
+                INSERT INTO shift_revenue (shift_id, currency, amount)
+                SELECT shift_id, COALESCE(payment_currency, ''), SUM(payment_amount)
+                FROM receipts
+                WHERE state IN {SOLD}
+                GROUP BY shift_id, COALESCE(payment_currency, '')
+                """
+            )
+
+
+def _currency(value: str) -> Currency | None:
+    return Currency(value) if value else None
@@ -0,0 +1,362 @@
+import sqlite3
+from typing import List
+
+
+def _rebuild(table: str, definition: str, columns: str, values: str) -> List[str]:
+    return [
+        f"CREATE TABLE {table}_new ({definition})",
+        f"INSERT INTO {table}_new ({columns}) SELECT {values} FROM {table}",
+        f"DROP TABLE {table}",
+        f"ALTER TABLE {table}_new RENAME TO {table}",
+    ]
+
+
+def _minor(column: str) -> str:
+    return f"CAST(ROUND({column} * 100) AS INTEGER)"
+
+
+MIGRATIONS: List[List[str]] = [
+    # 1: tables as originally created by the repositories
+    [
+        """
+        CREATE TABLE IF NOT EXISTS products (
+            id TEXT,
+            name TEXT,
+            price FLOAT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS campaigns (
+            id TEXT PRIMARY KEY,
+            type TEXT,
+            amount_to_exceed REAL,
+            percentage REAL,
+            is_active INTEGER,
+            amount INTEGER,
+            gift_amount INTEGER,
+            gift_product_type TEXT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS campaign_relations (
+            campaign_id TEXT,
+            product_id TEXT,
+            PRIMARY KEY (campaign_id, product_id),
+            FOREIGN KEY (campaign_id) REFERENCES campaigns (id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS receipts (
+            id TEXT PRIMARY KEY,
+            shift_id TEXT,
+            state TEXT,
+            created_at TIMESTAMP,
+            subtotal FLOAT,
+            total_discount FLOAT,
+            payment_amount FLOAT,
+            payment_currency TEXT,
+            FOREIGN KEY (shift_id) REFERENCES shifts (shift_id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS receipt_items (
+            receipt_id TEXT NOT NULL,
+            product_id TEXT NOT NULL,
+            quantity INTEGER,
+            PRIMARY KEY (receipt_id, product_id),
+            FOREIGN KEY (receipt_id) REFERENCES receipts (id),
+            FOREIGN KEY (product_id) REFERENCES products (id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS shifts (
+            shift_id TEXT PRIMARY KEY,
+            state TEXT
+        )
+        """,
+    ],
+    # 2: primary key and unique name for products, lookup indexes; a name
+    # reused under another id gets that id appended instead of being dropped
+    [
+        """
+        CREATE TABLE products_v2 (
+            id TEXT PRIMARY KEY,
+            name TEXT UNIQUE,
+            price FLOAT
+        )
+        """,
+        """
+        INSERT INTO products_v2 (id, name, price)
+        SELECT id,
+               CASE WHEN EXISTS (
+                   SELECT 1 FROM products AS earlier
+                   WHERE earlier.name = products.name
+                     AND earlier.id <> products.id
+                     AND earlier.rowid < products.rowid
+               ) THEN name || ' (' || id || ')' ELSE name END,
+               price
+        FROM products
+        WHERE id IS NOT NULL
+          AND rowid = (
+              SELECT MIN(rowid) FROM products AS same WHERE same.id = products.id
+          )
+        ORDER BY rowid
+        """,
+        "DROP TABLE products",
+        "ALTER TABLE products_v2 RENAME TO products",
+        "CREATE INDEX idx_receipts_shift_id ON receipts (shift_id)",
+        "CREATE INDEX idx_shifts_state ON shifts (state)",
+        """
+        CREATE INDEX idx_campaign_relations_product_id
+        ON campaign_relations (product_id)
+        """,
+    ],
+    # 3: counter bumped on every campaign change, polled by campaign caches
+    [
+        """
+        CREATE TABLE campaign_version (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            version INTEGER NOT NULL
+        )
+        """,
+        "INSERT INTO campaign_version (id, version) VALUES (0, 0)",
+    ],
+    # 4: product price and name as sold, backfilled from the current catalog
+    [
+        "ALTER TABLE receipt_items ADD COLUMN unit_price FLOAT NOT NULL DEFAULT 0",
+        "ALTER TABLE receipt_items ADD COLUMN product_name TEXT NOT NULL DEFAULT ''",
+        """
+        UPDATE receipt_items
+        SET unit_price = products.price, product_name = products.name
+        FROM products
+        WHERE products.id = receipt_items.product_id
+        """,
+    ],
+    # 5: per-shift totals kept up to date as receipts are paid
+    [
+        """
+        CREATE TABLE shift_summaries (
+            shift_id TEXT PRIMARY KEY,
+            receipt_count INTEGER NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE shift_items_sold (
+            shift_id TEXT NOT NULL,
+            product_id TEXT NOT NULL,
+            quantity INTEGER NOT NULL,
+            PRIMARY KEY (shift_id, product_id)
+        )
+        """,
+        """
+        CREATE TABLE shift_revenue (
+            shift_id TEXT NOT NULL,
+            currency TEXT NOT NULL,
+            amount FLOAT NOT NULL,
+            PRIMARY KEY (shift_id, currency)
+        )
+        """,
+        """
+        INSERT INTO shift_summaries (shift_id, receipt_count)
+        SELECT shift_id, COUNT(*) FROM receipts
+        WHERE state IN ('PAYED', 'CLOSED')
+        GROUP BY shift_id
+        """,
+        """
+        INSERT INTO shift_items_sold (shift_id, product_id, quantity)
+        SELECT receipts.shift_id, receipt_items.product_id, SUM(receipt_items.quantity)
+        FROM receipts
+        JOIN receipt_items ON receipt_items.receipt_id = receipts.id
+        WHERE receipts.state IN ('PAYED', 'CLOSED')
+        GROUP BY receipts.shift_id, receipt_items.product_id
+        """,
+        """
+        INSERT INTO shift_revenue (shift_id, currency, amount)
+        SELECT shift_id, COALESCE(payment_currency, ''), SUM(payment_amount)
+        FROM receipts
+        WHERE state IN ('PAYED', 'CLOSED')
+        GROUP BY shift_id, COALESCE(payment_currency, '')
+        """,
+    ],
+    # 6: daily and hourly revenue rollups, filled as shifts close
+    [
+        """
+        CREATE TABLE daily_revenue (
+            day TEXT NOT NULL,
+            currency TEXT NOT NULL,
+            receipt_count INTEGER NOT NULL,
+            amount FLOAT NOT NULL,
+            PRIMARY KEY (day, currency)
+        )
+        """,
+        """
+        CREATE TABLE hourly_revenue (
+            hour TEXT NOT NULL,
+            currency TEXT NOT NULL,
+            receipt_count INTEGER NOT NULL,
+            amount FLOAT NOT NULL,
+            PRIMARY KEY (hour, currency)
+        )
+        """,
+        "CREATE TABLE rolled_up_shifts (shift_id TEXT PRIMARY KEY)",
+        """
+        INSERT INTO rolled_up_shifts (shift_id)
+        SELECT shift_id FROM shifts WHERE state = 'CLOSED'
+        """,
+        """
+        INSERT INTO daily_revenue (day, currency, receipt_count, amount)
+        SELECT substr(receipts.created_at, 1, 10),
+               COALESCE(receipts.payment_currency, ''),
+               COUNT(*), SUM(receipts.payment_amount)
+        FROM receipts
+        JOIN rolled_up_shifts ON rolled_up_shifts.shift_id = receipts.shift_id
+        WHERE receipts.state IN ('PAYED', 'CLOSED')
+        GROUP BY 1, 2
+        """,
+        """
+        INSERT INTO hourly_revenue (hour, currency, receipt_count, amount)
+        SELECT substr(receipts.created_at, 1, 13),
+               COALESCE(receipts.payment_currency, ''),
+               COUNT(*), SUM(receipts.payment_amount)
+        FROM receipts
+        JOIN rolled_up_shifts ON rolled_up_shifts.shift_id = receipts.shift_id
+        WHERE receipts.state IN ('PAYED', 'CLOSED')
+        GROUP BY 1, 2
+        """,
+    ],
+    # 7: newest-first receipt search by time, optionally narrowed by state/currency
+    [
+        "CREATE INDEX idx_receipts_created_at ON receipts (created_at, id)",
+        """
+        CREATE INDEX idx_receipts_state_created_at
+        ON receipts (state, created_at, id)
+        """,
+        """
+        CREATE INDEX idx_receipts_currency_created_at
+        ON receipts (payment_currency, created_at, id)
+        """,
+    ],
+    # 8: money as INTEGER minor units (tetri, cents) instead of FLOAT
+    [
+        *_rebuild(
+            "products",
+            "id TEXT PRIMARY KEY, name TEXT UNIQUE, price INTEGER",
+            "id, name, price",
+            f"id, name, {_minor('price')}",
+        ),
+        *_rebuild(
+            "campaigns",
+            """
+            id TEXT PRIMARY KEY,
+            type TEXT,
+            amount_to_exceed INTEGER,
+            percentage REAL,
+            is_active INTEGER,
+            amount INTEGER,
+            gift_amount INTEGER,
+            gift_product_type TEXT
+            """,
+            "id, type, amount_to_exceed, percentage, is_active, amount, "
+            "gift_amount, gift_product_type",
+            f"id, type, {_minor('amount_to_exceed')}, percentage, is_active, "
+            "amount, gift_amount, gift_product_type",
+        ),
+        *_rebuild(
+            "receipts",
+            """
+            id TEXT PRIMARY KEY,
+            shift_id TEXT,
+            state TEXT,
+            created_at TIMESTAMP,
+            subtotal INTEGER,
+            total_discount INTEGER,
+            payment_amount INTEGER,
+            payment_currency TEXT,
+            FOREIGN KEY (shift_id) REFERENCES shifts (shift_id)
+            """,
+            "id, shift_id, state, created_at, "
+            "subtotal, total_discount, payment_amount, payment_currency",
+            f"id, shift_id, state, created_at, {_minor('subtotal')}, "
+            f"{_minor('total_discount')}, {_minor('payment_amount')}, "
+            "payment_currency",
+        ),
+        "CREATE INDEX idx_receipts_shift_id ON receipts (shift_id)",
+        "CREATE INDEX idx_receipts_created_at ON receipts (created_at, id)",
+        """
+        CREATE INDEX idx_receipts_state_created_at
+        ON receipts (state, created_at, id)
+        """,
+        """
+        CREATE INDEX idx_receipts_currency_created_at
+        ON receipts (payment_currency, created_at, id)
+        """,
+        *_rebuild(
+            "receipt_items",
+            """
+            receipt_id TEXT NOT NULL,
+            product_id TEXT NOT NULL,
+            quantity INTEGER,
+            unit_price INTEGER NOT NULL DEFAULT 0,
+            product_name TEXT NOT NULL DEFAULT '',
+            PRIMARY KEY (receipt_id, product_id),
+            FOREIGN KEY (receipt_id) REFERENCES receipts (id),
+            FOREIGN KEY (product_id) REFERENCES products (id)
+            """,
+            "receipt_id, product_id, quantity, unit_price, product_name",
+            f"receipt_id, product_id, quantity, {_minor('unit_price')}, product_name",
+        ),
+        *_rebuild(
+            "shift_revenue",
+            """
+            shift_id TEXT NOT NULL,
+            currency TEXT NOT NULL,
+            amount INTEGER NOT NULL,
+            PRIMARY KEY (shift_id, currency)
+            """,
+            "shift_id, currency, amount",
+            f"shift_id, currency, {_minor('amount')}",
+        ),
+        *(
+            statement
+            for table, bucket in [("daily_revenue", "day"), ("hourly_revenue", "hour")]
+            for statement in _rebuild(
+                table,
+                f"""
+                {bucket} TEXT NOT NULL,
+                currency TEXT NOT NULL,
+                receipt_count INTEGER NOT NULL,
+                amount INTEGER NOT NULL,
+                PRIMARY KEY ({bucket}, currency)
+                """,
+                f"{bucket}, currency, receipt_count, amount",
+                f"{bucket}, currency, receipt_count, {_minor('amount')}",
+            )
+        ),
+    ],
+    # 9: receipt version bumped on every receipt or line change, keys quote caches
+    ["ALTER TABLE receipts ADD COLUMN version INTEGER NOT NULL DEFAULT 0"],
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def schema_version(connection: sqlite3.Connection) -> int:
+    version: int = connection.execute("PRAGMA user_version").fetchone()[0]
+    return version
+
+
+def migrate(connection: sqlite3.Connection) -> None:
+    if schema_version(connection) >= SCHEMA_VERSION:
+        return
+
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        version = schema_version(connection)
+        for target in range(version + 1, SCHEMA_VERSION + 1):
+            for statement in MIGRATIONS[target - 1]:
+                connection.execute(statement)
+            connection.execute(f"PRAGMA user_version = {target}")
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
@@ -1,27 +1,26 @@
-import sqlite3
 from typing import List, Optional
 from uuid import UUID
 
 from app.core.shift import ShiftItem, ShiftRepository, ShiftState
+from app.infrastructure.sqlite.connection import ConnectionManager
+from app.infrastructure.sqlite.schema import migrate
 
 
 class ShiftDb(ShiftRepository):
-    def __init__(self, db_path: str = "./store.db"):
+    def __init__(
+        self,
+        db_path: str = "./store.db",
+        connections: ConnectionManager | None = None,
+    ):
         self.db_path = db_path
+        self.connections = connections or ConnectionManager.shared(db_path)
         self.up()
 
     def up(self) -> None:
-        with sqlite3.connect(self.db_path) as connection:
-            cursor = connection.cursor()
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS shifts (
-                    shift_id TEXT PRIMARY KEY,
-                    state TEXT
-                )
-            """)
+        migrate(self.connections.connection())
 
     def create(self, shift: ShiftItem) -> ShiftItem:
-        with sqlite3.connect(self.db_path) as connection:
+        with self.connections.transaction() as connection:
             cursor = connection.cursor()
             cursor.execute(
                 """
@@ -29,23 +28,20 @@ class ShiftDb(ShiftRepository):
                 """,
                 (str(shift.shift_id), shift.state.value),
             )
-            connection.commit()
             return shift
 
     def read(self, shift_id: UUID) -> Optional[ShiftItem]:
-        with sqlite3.connect(self.db_path) as connection:
-            connection.row_factory = sqlite3.Row
-            cursor = connection.cursor()
-            cursor.execute("SELECT * FROM shifts WHERE shift_id = ?", (str(shift_id),))
-            row = cursor.fetchone()
-            if row:
-                return ShiftItem(
-                    shift_id=UUID(row["shift_id"]), state=ShiftState(row["state"])
-                )
-            return None
+        cursor = self.connections.connection().cursor()
+        cursor.execute("SELECT * FROM shifts WHERE shift_id = ?", (str(shift_id),))
+        row = cursor.fetchone()
+        if row:
+            return ShiftItem(
+                shift_id=UUID(row["shift_id"]), state=ShiftState(row["state"])
+            )
+        return None
 
     def update(self, shift: ShiftItem) -> None:
-        with sqlite3.connect(self.db_path) as connection:
+        with self.connections.transaction() as connection:
             cursor = connection.cursor()
             cursor.execute(
                 """
@@ -55,19 +51,16 @@ class ShiftDb(ShiftRepository):
                 """,
                 (shift.state.value, str(shift.shift_id)),
             )
-            connection.commit()
 
     def read_by_state(self, state: ShiftState) -> List[ShiftItem]:
-        with sqlite3.connect(self.db_path) as connection:
-            connection.row_factory = sqlite3.Row
-            cursor = connection.cursor()
-            cursor.execute("SELECT * FROM shifts WHERE state = ?", (state.value,))
-            rows = cursor.fetchall()
-            shifts = []
-            for row in rows:
-                shifts.append(
-                    ShiftItem(
-                        shift_id=UUID(row["shift_id"]), state=ShiftState(row["state"])
-                    )
+        cursor = self.connections.connection().cursor()
+        cursor.execute("SELECT * FROM shifts WHERE state = ?", (state.value,))
+        rows = cursor.fetchall()
+        shifts = []
+        for row in rows:
+            shifts.append(
+                ShiftItem(
+                    shift_id=UUID(row["shift_id"]), state=ShiftState(row["state"])
                 )
-            return shifts
+            )
+        return shifts
@@ -0,0 +1,96 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Tuple, TypeVar
+
+from app.core.unit_of_work import TransactionManager
+
+T = TypeVar("T")
+
+Job = Tuple[Callable[[], Any], "Future[Any]"]
+
+
+@dataclass
+class WriteScheduler:
+    transactions: TransactionManager
+    window: float = 0.002
+    max_batch: int = 64
+
+    batches: int = field(default=0, init=False)
+    writes: int = field(default=0, init=False)
+    _queue: "queue.SimpleQueue[Job | None]" = field(
+        default_factory=queue.SimpleQueue, init=False
+    )
+    _thread: threading.Thread | None = field(default=None, init=False)
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="db-writer", daemon=True
+            )
+            self._thread.start()
+
+    def submit(self, call: Callable[[], T]) -> "Future[T]":
+        if self._thread is None:
+            raise RuntimeError("Write scheduler is not running")
+        future: Future[T] = Future()
+        self._queue.put((call, future))
+        return future
+
+    def shutdown(self) -> None:
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        running = True
+        while running:
+            batch, running = self._collect()
+            if batch:
+                self._commit(batch)
+
+    def _collect(self) -> Tuple[List[Job], bool]:
+        job = self._queue.get()
+        if job is None:
+            return [], False
+
+        batch = [job]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            try:
+                job = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if job is None:
+                return batch, False
+            batch.append(job)
+        return batch, True
+
+    def _commit(self, batch: List[Job]) -> None:
+        outcomes: List[Tuple[Future[Any], Any, BaseException | None]] = []
+        try:
+            with self.transactions.transaction():
+                for call, future in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with self.transactions.transaction():
+                            outcomes.append((future, call(), None))
+                    except BaseException as e:
+                        outcomes.append((future, None, e))
+        except BaseException as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.writes += len(outcomes)
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
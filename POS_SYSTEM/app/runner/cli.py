@@ -6,6 +6,10 @@ import uvicorn
 from dotenv import load_dotenv
 from typer import Typer
 
+from app.core.report import ReportService
+from app.core.shift import ShiftService
+from app.infrastructure.sqlite.report_db import ReportDb
+from app.infrastructure.sqlite.shift_db import ShiftDb
 from app.runner.setup import init_app
 
 cli = Typer(no_args_is_help=True, add_completion=False)
@@ -13,7 +17,21 @@ cli = Typer(no_args_is_help=True, add_completion=False)
 
 @cli.command()
 @no_type_check
-def run(host: str = "127.0.0.1", port: int = 8000) -> None:
+def run(
+    host: str = "127.0.0.1", port: int = 8000, warm_product_cache: bool = False
+) -> None:
     load_dotenv()
 
-    uvicorn.run(host=host, port=port, app=init_app())
+    uvicorn.run(
+        host=host, port=port, app=init_app(warm_product_cache=warm_product_cache)
+    )
+
+
+@cli.command()
+@no_type_check
+def rebuild_reports(db_path: str = "./store.db") -> None:
+    service = ReportService(ReportDb(db_path), ShiftService(ShiftDb(db_path)))
+    changed = service.rebuild_summaries()
+    print(f"Rebuilt shift summaries, {len(changed)} shift(s) differed")
+    for shift_id in changed:
+        print(f"  {shift_id}")
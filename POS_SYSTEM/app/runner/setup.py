@@ -1,26 +1,46 @@
+import os
+
 from fastapi import FastAPI
 
+from app.core.campaign import CampaignService
+from app.core.campaign_cache import CampaignCache
+from app.core.campaign_engine import CampaignEngine
 from app.core.currency import CurrencyService
+from app.core.pricing import PricingEngine
+from app.core.product import ProductService
+from app.core.product_cache import ProductCache
+from app.core.quote_cache import QuoteCache
+from app.core.rate_cache import RateCache
+from app.core.receipt import ReceiptService
+from app.core.report import ReportService
 from app.core.shift import ShiftService
+from app.core.unit_of_work import NoTransactionManager
+from app.infrastructure.db_executor import DEFAULT_WORKERS, DbExecutor
+from app.infrastructure.exchange_rates import DEFAULT_URL, HttpRateSource, RateFile
 from app.infrastructure.fastapi.campaign import campaign_api
+from app.infrastructure.fastapi.dependables import Services
 from app.infrastructure.fastapi.product import product_api
 from app.infrastructure.fastapi.receipt import receipt_api
 from app.infrastructure.fastapi.shift import shift_api
 from app.infrastructure.sqlite.campaign_db import CampaignDb
+from app.infrastructure.sqlite.connection import ConnectionManager
 from app.infrastructure.sqlite.inmemory.campaigns_in_memory_db import InMemoryCampaignDb
 from app.infrastructure.sqlite.inmemory.producs_in_memory_db import InMemoryProductDb
 from app.infrastructure.sqlite.inmemory.receipt_in_memory_db import InMemoryReceiptDb
 from app.infrastructure.sqlite.inmemory.receipt_item_in_memory_db import (
     InMemoryReceiptItemDb,
 )
+from app.infrastructure.sqlite.inmemory.report_in_memory_db import InMemoryReportDb
 from app.infrastructure.sqlite.inmemory.shift_in_memory_db import InMemoryShiftDb
 from app.infrastructure.sqlite.product_db import ProductDb
 from app.infrastructure.sqlite.receipt_db import ReceiptDb
 from app.infrastructure.sqlite.receipt_item_db import ReceiptItemDb
+from app.infrastructure.sqlite.report_db import ReportDb
 from app.infrastructure.sqlite.shift_db import ShiftDb
+from app.infrastructure.write_scheduler import WriteScheduler
 
 
-def init_app(db_type: str = "sqlite") -> FastAPI:
+def init_app(db_type: str = "sqlite", warm_product_cache: bool = False) -> FastAPI:
     app = FastAPI()
 
     # TODO:
@@ -31,18 +51,59 @@ def init_app(db_type: str = "sqlite") -> FastAPI:
     app.include_router(shift_api)
 
     if db_type == "sqlite":
-        app.state.product = ProductDb()
-        app.state.campaign = CampaignDb()
-        app.state.receipt = ReceiptDb()
-        app.state.receipt_items = ReceiptItemDb()
-        app.state.shift = ShiftDb()
+        connections = ConnectionManager.shared(os.getenv("DB_PATH", "./store.db"))
+        app.state.product = ProductCache(
+            ProductDb(connections=connections), transactions=connections
+        )
+        if warm_product_cache:
+            app.add_event_handler("startup", app.state.product.warm)
+        app.state.campaign = CampaignCache(CampaignDb(connections=connections))
+        app.state.receipt = ReceiptDb(connections=connections)
+        app.state.receipt_items = ReceiptItemDb(connections=connections)
+        app.state.reports = ReportDb(connections=connections)
+        app.state.shift = ShiftDb(connections=connections)
+        app.state.transactions = connections
+        rates = RateCache(
+            HttpRateSource(os.getenv("EXCHANGE_RATES_URL", DEFAULT_URL)),
+            RateFile(os.getenv("EXCHANGE_RATES_FILE", "./rates.json")),
+        )
+        app.add_event_handler("startup", rates.refresh_if_stale)
+        app.state.currency_service = CurrencyService(rates)
     else:
         app.state.product = InMemoryProductDb()
         app.state.receipt = InMemoryReceiptDb()
-        app.state.campaign = InMemoryCampaignDb()
+        app.state.campaign = CampaignCache(InMemoryCampaignDb())
         app.state.receipt_items = InMemoryReceiptItemDb()
+        app.state.reports = InMemoryReportDb(app.state.receipt, app.state.receipt_items)
         app.state.shift = InMemoryShiftDb()
+        app.state.transactions = NoTransactionManager()
+        app.state.currency_service = CurrencyService()
+
+    db = DbExecutor(
+        int(os.getenv("DB_WORKERS", DEFAULT_WORKERS)),
+        WriteScheduler(app.state.transactions),
+    )
+    app.add_event_handler("startup", db.start)
+    app.add_event_handler("shutdown", db.shutdown)
+    if db_type == "sqlite":
+        app.add_event_handler("shutdown", connections.close)
 
-    app.state.currency_service = CurrencyService()
-    app.state.shift_service = ShiftService(app.state.shift)
+    shifts = ShiftService(app.state.shift)
+    app.state.services = Services(
+        products=ProductService(app.state.product),
+        campaigns=CampaignService(app.state.campaign),
+        receipts=ReceiptService(
+            app.state.receipt,
+            app.state.receipt_items,
+            shifts,
+            app.state.currency_service,
+            pricing=PricingEngine(CampaignEngine(app.state.campaign)),
+            transactions=app.state.transactions,
+            reports=app.state.reports,
+            quotes=QuoteCache(),
+        ),
+        reports=ReportService(app.state.reports, shifts, app.state.transactions),
+        shifts=shifts,
+        db=db,
+    )
     return app
@@ -0,0 +1,72 @@
+from typing import List
+
+from app.core.campaign_cache import CampaignCache
+from app.core.Models.campaign import Campaign, CampaignType
+from app.infrastructure.sqlite.inmemory.campaigns_in_memory_db import InMemoryCampaignDb
+
+
+class CountingCampaignDb(InMemoryCampaignDb):
+    def __init__(self) -> None:
+        super().__init__()
+        self.loads = 0
+
+    def read_all(self) -> List[Campaign]:
+        self.loads += 1
+        return super().read_all()
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def campaign() -> Campaign:
+    return Campaign(
+        type=CampaignType.DISCOUNT,
+        amount_to_exceed=0,
+        percentage=10.0,
+        is_active=True,
+        amount=1,
+        gift_amount=0,
+        gift_product_type="",
+    )
+
+
+def test_should_load_active_campaigns_once() -> None:
+    repository = CountingCampaignDb()
+    repository.add(campaign())
+    cache = CampaignCache(repository, clock=FakeClock())
+
+    cache.read_active()
+    cache.read_active()
+    cache.read_active()
+
+    assert repository.loads == 1
+
+
+def test_should_invalidate_on_create_and_deactivate() -> None:
+    cache = CampaignCache(CountingCampaignDb(), clock=FakeClock())
+    created = campaign()
+
+    assert cache.read_active() == []
+    cache.add(created)
+    assert [c.id for c in cache.read_active()] == [created.id]
+    cache.deactivate(created.id)
+    assert cache.read_active() == []
+
+
+def test_should_pick_up_changes_from_other_workers_by_version() -> None:
+    repository = CountingCampaignDb()
+    clock = FakeClock()
+    worker = CampaignCache(repository, poll_interval=1.0, clock=clock)
+    other_worker = CampaignCache(repository, poll_interval=1.0, clock=clock)
+    worker.read_active()
+
+    other_worker.add(campaign())
+    assert worker.read_active() == []
+
+    clock.now += 1.0
+    assert len(worker.read_active()) == 1
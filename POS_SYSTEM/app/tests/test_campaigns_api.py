@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Any, Dict
+from typing import Any, Dict, Iterator
 from uuid import uuid4
 
 import pytest
@@ -31,8 +31,9 @@ class CampaignFake:
 
 
 @pytest.fixture
-def client() -> TestClient:
-    return TestClient(init_app("in_memory"))
+def client() -> Iterator[TestClient]:
+    with TestClient(init_app("in_memory")) as client:
+        yield client
 
 
 def clear_tables() -> None:
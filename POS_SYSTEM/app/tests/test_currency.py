@@ -0,0 +1,91 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+from app.core.currency import (
+    EXTRA_CURRENCIES,
+    Currency,
+    CurrencyService,
+    FixedRates,
+    currency_codes,
+)
+
+RATES = {"GEL": 1.0, "USD": 0.5, "EUR": 0.25, "GBP": 0.2}
+
+
+class SwitchingRates:
+    def __init__(self) -> None:
+        self.current: Dict[str, float] = dict(RATES)
+
+    def rates(self) -> Dict[str, float]:
+        return self.current
+
+
+def test_should_convert_amounts_in_batch() -> None:
+    service = CurrencyService(FixedRates(RATES))
+
+    assert service.convert_many([1000, 333, 1], Currency.GEL, Currency.USD) == [
+        500,
+        166,
+        0,
+    ]
+    assert service.convert_many([250, 3], Currency.EUR, Currency.USD) == [500, 6]
+    assert service.convert_many([], Currency.GEL, Currency.EUR) == []
+
+
+def test_should_rebuild_cross_rates_when_rates_change() -> None:
+    rates = SwitchingRates()
+    service = CurrencyService(rates)
+    matrix = service.cross_rates()
+
+    assert service.cross_rates() is matrix
+
+    rates.current = {**RATES, "USD": 0.4}
+    assert service.convert(1000, Currency.GEL, Currency.USD) == 400
+    assert service.cross_rates() is not matrix
+
+
+def test_should_read_configured_currency_codes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv(EXTRA_CURRENCIES, "gbp, TRY,,usd")
+
+    assert currency_codes() == ["GEL", "USD", "EUR", "GBP", "TRY"]
+
+    monkeypatch.setenv(EXTRA_CURRENCIES, "GB1")
+    with pytest.raises(ValueError, match="Invalid currency code 'GB1'"):
+        currency_codes()
+
+
+def test_should_expose_configured_currencies_at_startup() -> None:
+    script = """
+import json
+from app.core.currency import Currency, CurrencyService, FixedRates
+from app.runner.setup import init_app
+
+service = CurrencyService(FixedRates({"GEL": 1.0, "GBP": 0.2}))
+schema = init_app("in_memory").openapi()["components"]["schemas"]["Currency"]
+converted = service.convert(1000, Currency.GEL, Currency("GBP"))
+print(json.dumps([[code.value for code in Currency], schema["enum"], converted]))
+"""
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        env={**os.environ, EXTRA_CURRENCIES: "gbp, TRY"},
+        cwd=Path(__file__).parents[2],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    codes = ["GEL", "USD", "EUR", "GBP", "TRY"]
+    assert json.loads(result.stdout) == [codes, codes, 200]
+
+
+def test_should_reject_unconfigured_currency() -> None:
+    with pytest.raises(ValueError):
+        Currency("XYZ")
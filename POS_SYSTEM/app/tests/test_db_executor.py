@@ -0,0 +1,55 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.infrastructure.db_executor import DbExecutor
+from app.runner.setup import init_app
+
+
+def test_should_run_blocking_calls_off_the_event_loop() -> None:
+    db = DbExecutor(workers=4)
+    db.start()
+
+    def slow_read(value: int) -> str:
+        time.sleep(0.2)
+        return f"{threading.current_thread().name}:{value}"
+
+    async def serve() -> list[str]:
+        return list(await asyncio.gather(*(db.run(slow_read, i) for i in range(4))))
+
+    started = time.monotonic()
+    results = asyncio.run(serve())
+    db.shutdown()
+
+    assert time.monotonic() - started < 0.6
+    assert all(result.startswith("db") for result in results)
+    assert [result.split(":")[1] for result in results] == ["0", "1", "2", "3"]
+
+
+def test_should_raise_repository_errors_to_caller() -> None:
+    db = DbExecutor(workers=1)
+    db.start()
+
+    def missing() -> None:
+        raise ValueError("Receipt does not exist")
+
+    with pytest.raises(ValueError, match="does not exist"):
+        asyncio.run(db.run(missing))
+    db.shutdown()
+
+
+def test_should_run_db_threads_only_while_app_is_running() -> None:
+    def db_threads() -> list[str]:
+        return [t.name for t in threading.enumerate() if t.name.startswith("db")]
+
+    app = init_app("in_memory")
+    assert db_threads() == []
+
+    with TestClient(app) as client:
+        client.post("/shifts/open")
+        assert "db-writer" in db_threads()
+
+    assert db_threads() == []
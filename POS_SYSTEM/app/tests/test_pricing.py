@@ -0,0 +1,136 @@
+from typing import List
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.core.campaign_cache import CampaignCache
+from app.core.campaign_engine import CampaignEngine
+from app.core.Models.campaign import Campaign, CampaignType
+from app.core.Models.product import Product
+from app.core.Models.receipt import ReceiptItem
+from app.core.pricing import PricedReceipt, PricingEngine, price_lines
+from app.infrastructure.sqlite.inmemory.campaigns_in_memory_db import InMemoryCampaignDb
+
+
+def campaign(
+    campaign_type: CampaignType,
+    product_ids: List[UUID],
+    percentage: float = 10.0,
+    amount_to_exceed: int = 0,
+) -> Campaign:
+    return Campaign(
+        type=campaign_type,
+        amount_to_exceed=amount_to_exceed,
+        percentage=percentage,
+        is_active=True,
+        amount=1,
+        gift_amount=0,
+        gift_product_type="",
+        product_ids=[str(product_id) for product_id in product_ids],
+    )
+
+
+class Basket:
+    def __init__(self, pricing: PricingEngine) -> None:
+        self.pricing = pricing
+        self.items: dict[UUID, ReceiptItem] = {}
+        self.receipt_id = uuid4()
+
+    def scan(self, product: Product, quantity: int) -> PricedReceipt:
+        item = self.items.setdefault(
+            product.id,
+            ReceiptItem(self.receipt_id, product.id, 0, product.price, product.name),
+        )
+        item.quantity += quantity
+        return self.pricing.price(list(self.items.values()))
+
+
+@pytest.fixture
+def campaigns() -> InMemoryCampaignDb:
+    return InMemoryCampaignDb()
+
+
+@pytest.fixture
+def basket(campaigns: InMemoryCampaignDb) -> Basket:
+    return Basket(PricingEngine(CampaignEngine(CampaignCache(campaigns))))
+
+
+def product(price: int) -> Product:
+    return Product(name=str(uuid4()), price=price)
+
+
+def test_should_discount_product(basket: Basket, campaigns: InMemoryCampaignDb) -> None:
+    bread = product(1000)
+    campaigns.add(campaign(CampaignType.DISCOUNT, [bread.id], percentage=20.0))
+
+    basket.scan(bread, 2)
+    priced = basket.scan(bread, 1)
+
+    assert priced.subtotal == 3000
+    assert priced.total_discount == 600
+    assert priced.lines[0].discount == 600
+
+
+def test_should_discount_complete_combos(
+    basket: Basket, campaigns: InMemoryCampaignDb
+) -> None:
+    bread = product(1000)
+    milk = product(500)
+    campaigns.add(campaign(CampaignType.COMBO, [bread.id, milk.id]))
+
+    assert basket.scan(bread, 2).total_discount == 0
+    assert basket.scan(milk, 1).total_discount == 150
+
+
+def test_should_apply_highest_reached_threshold(
+    basket: Basket, campaigns: InMemoryCampaignDb
+) -> None:
+    bread = product(1000)
+    campaigns.add(
+        campaign(CampaignType.WHOLE_RECEIPT_DISCOUNT, [], 5.0, amount_to_exceed=1500)
+    )
+    campaigns.add(
+        campaign(CampaignType.WHOLE_RECEIPT_DISCOUNT, [], 10.0, amount_to_exceed=2500)
+    )
+
+    assert basket.scan(bread, 2).total_discount == 100
+
+    priced = basket.scan(bread, 1)
+    assert priced.total_discount == 300
+    assert list(priced.campaign_discounts.values()) == [300]
+
+
+def test_should_only_evaluate_campaigns_for_scanned_product(
+    basket: Basket, campaigns: InMemoryCampaignDb
+) -> None:
+    bread = product(1000)
+    for _ in range(100):
+        campaigns.add(campaign(CampaignType.DISCOUNT, [uuid4()]))
+
+    priced = basket.scan(bread, 1)
+
+    assert priced.total_discount == 0
+
+
+def test_should_price_lines_as_sold(basket: Basket) -> None:
+    bread = product(1000)
+    basket.scan(bread, 1)
+
+    bread.price = 1200
+    priced = basket.scan(bread, 1)
+
+    assert priced.subtotal == 2000
+
+
+def test_should_memoize_pricing_on_receipt_contents(
+    basket: Basket, campaigns: InMemoryCampaignDb
+) -> None:
+    bread = product(1000)
+    campaigns.add(campaign(CampaignType.DISCOUNT, [bread.id]))
+    price_lines.cache_clear()
+
+    first = basket.scan(bread, 1)
+    second = basket.pricing.price(list(basket.items.values()))
+
+    assert first is second
+    assert price_lines.cache_info().hits == 1
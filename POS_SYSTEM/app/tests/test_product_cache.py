@@ -0,0 +1,91 @@
+from typing import Dict, Iterable, List
+from uuid import UUID, uuid4
+
+from app.core.Models.product import Product
+from app.core.product_cache import ProductCache
+from app.infrastructure.sqlite.inmemory.producs_in_memory_db import InMemoryProductDb
+
+
+class CountingProductDb(InMemoryProductDb):
+    def __init__(self) -> None:
+        super().__init__()
+        self.loads = 0
+
+    def read(self, product_id: UUID) -> Product | None:
+        self.loads += 1
+        return super().read(product_id)
+
+    def read_many(self, product_ids: Iterable[UUID]) -> Dict[UUID, Product]:
+        self.loads += 1
+        return super().read_many(product_ids)
+
+    def read_page(self, after: str | None, limit: int) -> List[Product]:
+        self.loads += 1
+        return super().read_page(after, limit)
+
+
+def product(price: int = 100) -> Product:
+    return Product(name=str(uuid4()), price=price)
+
+
+def test_should_serve_repeated_reads_from_cache() -> None:
+    repository = CountingProductDb()
+    bread = repository.add(product())
+    cache = ProductCache(repository)
+
+    for _ in range(3):
+        assert cache.read(bread.id) == bread
+
+    assert repository.loads == 1
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_should_read_only_missing_products_in_batch() -> None:
+    repository = CountingProductDb()
+    bread, milk = repository.add(product()), repository.add(product())
+    cache = ProductCache(repository)
+    cache.read(bread.id)
+
+    assert cache.read_many([bread.id, milk.id]) == {bread.id: bread, milk.id: milk}
+    assert cache.read_many([bread.id, milk.id]) == {bread.id: bread, milk.id: milk}
+    assert repository.loads == 2
+
+
+def test_should_invalidate_on_update() -> None:
+    repository = CountingProductDb()
+    bread = repository.add(product(price=100))
+    cache = ProductCache(repository)
+    cache.read(bread.id)
+
+    cache.update(Product(name=bread.name, price=200, id=bread.id))
+
+    updated = cache.read(bread.id)
+    assert updated is not None and updated.price == 200
+
+
+def test_should_evict_least_recently_used() -> None:
+    repository = CountingProductDb()
+    bread, milk, eggs = (repository.add(product()) for _ in range(3))
+    cache = ProductCache(repository, capacity=2)
+
+    cache.read(bread.id)
+    cache.read(milk.id)
+    cache.read(bread.id)
+    cache.read(eggs.id)
+    repository.loads = 0
+
+    cache.read(bread.id)
+    cache.read(milk.id)
+    assert repository.loads == 1
+
+
+def test_should_warm_with_catalog() -> None:
+    repository = CountingProductDb()
+    catalog = [repository.add(product()) for _ in range(5)]
+    cache = ProductCache(repository)
+
+    cache.warm()
+
+    assert cache.read_many(p.id for p in catalog) == {p.id: p for p in catalog}
+    assert repository.loads == 1
+    assert cache.stats() == {"hits": 5, "misses": 0, "size": 5}
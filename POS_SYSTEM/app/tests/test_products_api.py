@@ -1,5 +1,6 @@
+import json
 from dataclasses import dataclass, field
-from typing import Any, Dict
+from typing import Any, Dict, Iterator
 from uuid import uuid4
 
 import pytest
@@ -32,8 +33,9 @@ class ProductFake:
 
 
 @pytest.fixture
-def client() -> TestClient:
-    return TestClient(init_app("in_memory"))
+def client() -> Iterator[TestClient]:
+    with TestClient(init_app("in_memory")) as client:
+        yield client
 
 
 def clear_tables() -> None:
@@ -94,3 +96,84 @@ def test_update_product(client: TestClient) -> None:
     assert response_get.json()["product"]["id"] == product_id
     assert response_get.json()["product"]["name"] == new_product.name
     assert response_get.json()["product"]["price"] == new_product.price
+
+
+def test_should_create_products_in_bulk_from_csv(client: TestClient) -> None:
+    clear_tables()
+    client.post("/products", json={"name": "milk", "price": 3})
+
+    response = client.post(
+        "/products/bulk",
+        content="name,price\nbread,2.5\nmilk,4\ncheese,abc\nbutter,6\n",
+        headers={"content-type": "text/csv"},
+    )
+
+    assert response.status_code == 201
+    assert len(response.json()["products"]) == 2
+    assert [error["row"] for error in response.json()["errors"]] == [3, 4]
+    names = {product["name"] for product in client.get("/products").json()["products"]}
+    assert names == {"milk", "bread", "butter"}
+
+
+def test_should_update_products_in_bulk_from_json_lines(client: TestClient) -> None:
+    clear_tables()
+    product_id = client.post("/products", json={"name": "milk", "price": 3}).json()[
+        "product"
+    ]
+    unknown_id = uuid4()
+
+    response = client.patch(
+        "/products/bulk",
+        content=(
+            f'{{"id": "{product_id}", "name": "milk", "price": 5}}\n'
+            f'{{"id": "{unknown_id}", "name": "bread", "price": 1}}\n'
+            "not json\n"
+        ),
+        headers={"content-type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["products"] == [product_id]
+    assert [error["row"] for error in response.json()["errors"]] == [2, 3]
+    assert client.get(f"/products/{product_id}").json()["product"]["price"] == 5
+
+
+def test_should_page_through_products(client: TestClient) -> None:
+    clear_tables()
+    created = {
+        client.post("/products", json={"name": f"p{i}", "price": i}).json()["product"]
+        for i in range(25)
+    }
+
+    seen, pages, after = [], 0, None
+    while True:
+        params: Dict[str, Any] = {"limit": 10}
+        if after:
+            params["after"] = after
+        page = client.get("/products", params=params).json()
+        seen += [product["id"] for product in page["products"]]
+        pages += 1
+        after = page.get("next_cursor")
+        if after is None:
+            break
+
+    assert pages == 3
+    assert seen == sorted(created)
+
+
+def test_should_reject_oversized_page(client: TestClient) -> None:
+    response = client.get("/products", params={"limit": 5000})
+
+    assert response.status_code == 400
+
+
+def test_should_export_products_as_json_lines(client: TestClient) -> None:
+    clear_tables()
+    for i in range(3):
+        client.post("/products", json={"name": f"p{i}", "price": i})
+
+    response = client.get("/products/export")
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["name"] for line in lines) == ["p0", "p1", "p2"]
@@ -0,0 +1,204 @@
+from pathlib import Path
+from typing import Dict, List
+from uuid import UUID
+
+import pytest
+
+from app.core.currency import Currency, CurrencyService
+from app.core.Models.product import Product
+from app.core.Models.receipt import (
+    AddItemRequest,
+    PaymentRequest,
+    Receipt,
+    ReceiptItem,
+)
+from app.core.quote_cache import QuoteCache
+from app.core.receipt import ReceiptService
+from app.core.shift import ShiftService
+from app.infrastructure.sqlite.connection import ConnectionManager
+from app.infrastructure.sqlite.inmemory.receipt_in_memory_db import InMemoryReceiptDb
+from app.infrastructure.sqlite.inmemory.receipt_item_in_memory_db import (
+    InMemoryReceiptItemDb,
+)
+from app.infrastructure.sqlite.inmemory.shift_in_memory_db import InMemoryShiftDb
+from app.infrastructure.sqlite.receipt_db import ReceiptDb
+from app.infrastructure.sqlite.receipt_item_db import ReceiptItemDb
+
+
+class CountingReceiptItemDb(InMemoryReceiptItemDb):
+    def __init__(self) -> None:
+        super().__init__()
+        self.reads = 0
+
+    def read_by_receipt(self, receipt_id: UUID) -> List[ReceiptItem]:
+        self.reads += 1
+        return super().read_by_receipt(receipt_id)
+
+
+class CountingReceiptDb(InMemoryReceiptDb):
+    def __init__(self) -> None:
+        super().__init__()
+        self.reads = 0
+
+    def read(self, receipt_id: UUID) -> Receipt | None:
+        self.reads += 1
+        return super().read(receipt_id)
+
+    def version(self, receipt_id: UUID) -> int | None:
+        self.reads += 1
+        return super().version(receipt_id)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class SwitchingRates:
+    def __init__(self) -> None:
+        self.current: Dict[str, float] = {"GEL": 1.0, "USD": 0.5, "EUR": 0.25}
+
+    def rates(self) -> Dict[str, float]:
+        return self.current
+
+
+@pytest.fixture
+def rates() -> SwitchingRates:
+    return SwitchingRates()
+
+
+@pytest.fixture
+def items() -> CountingReceiptItemDb:
+    return CountingReceiptItemDb()
+
+
+@pytest.fixture
+def receipts() -> CountingReceiptDb:
+    return CountingReceiptDb()
+
+
+@pytest.fixture
+def service(
+    rates: SwitchingRates, receipts: CountingReceiptDb, items: CountingReceiptItemDb
+) -> ReceiptService:
+    shift_service = ShiftService(InMemoryShiftDb())
+    shift_service.create()
+    return ReceiptService(
+        receipts,
+        items,
+        shift_service,
+        CurrencyService(rates),
+        quotes=QuoteCache(clock=FakeClock()),
+    )
+
+
+def scan(service: ReceiptService, receipt_id: UUID, product: Product) -> None:
+    service.add_item(
+        receipt_id, AddItemRequest(product_id=product.id, quantity=1), product
+    )
+
+
+def test_should_serve_repeated_quotes_from_memory(
+    service: ReceiptService, receipts: CountingReceiptDb, items: CountingReceiptItemDb
+) -> None:
+    receipt_id = service.create()
+    scan(service, receipt_id, Product(name="bread", price=1000))
+    items.reads = 0
+
+    first = service.get_quote(receipt_id, Currency.USD)
+    for _ in range(5):
+        assert service.get_quote(receipt_id, Currency.USD) is first
+        service.get_receipt_items(receipt_id, Currency.USD)
+
+    reads = receipts.reads
+    for _ in range(5):
+        service.get_quote(receipt_id, Currency.USD)
+
+    assert items.reads == 2
+    assert receipts.reads == reads
+    assert service.quotes is not None and service.quotes.hits == 14
+
+
+def test_should_requote_after_item_added(service: ReceiptService) -> None:
+    receipt_id = service.create()
+    scan(service, receipt_id, Product(name="bread", price=1000))
+    assert service.get_quote(receipt_id, Currency.USD).total == 500
+
+    scan(service, receipt_id, Product(name="milk", price=400))
+
+    assert service.get_quote(receipt_id, Currency.USD).total == 700
+
+
+def test_should_refresh_receipt_after_payment(service: ReceiptService) -> None:
+    receipt_id = service.create()
+    scan(service, receipt_id, Product(name="bread", price=1000))
+    assert service.get_receipt(receipt_id).payment_amount == 0
+
+    service.process_payment(
+        receipt_id, PaymentRequest(amount=10, currency=Currency.GEL)
+    )
+
+    assert service.get_receipt(receipt_id).payment_amount == 1000
+
+
+def test_should_requote_when_rates_change(
+    service: ReceiptService, rates: SwitchingRates
+) -> None:
+    receipt_id = service.create()
+    scan(service, receipt_id, Product(name="bread", price=1000))
+    assert service.get_quote(receipt_id, Currency.USD).total == 500
+
+    rates.current = {**rates.current, "USD": 0.4}
+
+    assert service.get_quote(receipt_id, Currency.USD).total == 400
+
+
+def test_should_requote_after_change_made_by_another_worker(tmp_path: Path) -> None:
+    connections = ConnectionManager(str(tmp_path / "store.db"))
+    clock = FakeClock()
+    shift_service = ShiftService(InMemoryShiftDb())
+    shift_service.create()
+
+    def worker() -> ReceiptService:
+        return ReceiptService(
+            ReceiptDb(connections=connections),
+            ReceiptItemDb(connections=connections),
+            shift_service,
+            CurrencyService(),
+            quotes=QuoteCache(poll_interval=1.0, clock=clock),
+        )
+
+    first, second = worker(), worker()
+    bread = Product(name="bread", price=1000)
+    receipt_id = first.create()
+    scan(first, receipt_id, bread)
+    assert first.get_quote(receipt_id, Currency.GEL).total == 1000
+    assert first.get_receipt_items(receipt_id)[0].quantity == 1
+
+    scan(second, receipt_id, bread)
+    scan(second, receipt_id, Product(name="milk", price=400))
+    assert first.get_quote(receipt_id, Currency.GEL).total == 1000
+
+    clock.now += 1.0
+    assert first.get_quote(receipt_id, Currency.GEL).total == 2400
+    items = first.get_receipt_items(receipt_id)
+    assert {item.product_name: item.quantity for item in items} == {
+        "bread": 2,
+        "milk": 1,
+    }
+    connections.close()
+
+
+def test_should_not_store_value_loaded_before_invalidation() -> None:
+    cache = QuoteCache()
+    receipt_id = UUID(int=1)
+
+    def load() -> str:
+        cache.invalidate(receipt_id)
+        return "stale"
+
+    assert cache.get_or_load(receipt_id, "quote", (), load) == "stale"
+    assert cache.get_or_load(receipt_id, "quote", (), lambda: "fresh") == "fresh"
@@ -0,0 +1,116 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator
+
+import pytest
+
+from app.core.currency import FALLBACK_RATES, Currency, CurrencyService, FixedRates
+from app.core.rate_cache import RateCache
+from app.infrastructure.exchange_rates import HttpRateSource, RateFile
+
+
+class StubRates(BaseHTTPRequestHandler):
+    delay = 0.0
+    body = {"result": "success", "rates": {"GEL": 1, "USD": 0.5, "EUR": 0.25}}
+
+    def do_GET(self) -> None:
+        time.sleep(self.delay)
+        payload = json.dumps(self.body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def stub_url() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubRates)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/latest/GEL"
+    server.shutdown()
+    server.server_close()
+
+
+class FailingSource:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def fetch(self) -> Dict[str, float]:
+        self.calls += 1
+        raise ConnectionError("offline")
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def wait_for(cache: RateCache, fetched_at: float) -> None:
+    deadline = time.monotonic() + 5
+    while cache.snapshot().fetched_at == fetched_at:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_should_refresh_stale_rates_in_background(
+    stub_url: str, tmp_path: Path
+) -> None:
+    store = RateFile(str(tmp_path / "rates.json"))
+    cache = RateCache(HttpRateSource(stub_url), store)
+
+    assert cache.rates() == FALLBACK_RATES
+    wait_for(cache, 0.0)
+
+    assert cache.rates()["USD"] == 0.5
+    assert RateCache(FailingSource(), store).rates()["USD"] == 0.5
+
+
+def test_should_give_up_on_slow_source(
+    stub_url: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(StubRates, "delay", 1.0)
+    cache = RateCache(HttpRateSource(stub_url, timeout=0.1))
+
+    started = time.monotonic()
+    assert cache.refresh() is False
+    assert time.monotonic() - started < 1.0
+    assert cache.rates() == FALLBACK_RATES
+
+
+def test_should_stop_calling_failing_source_until_cooldown() -> None:
+    source, clock = FailingSource(), FakeClock()
+    cache = RateCache(source, failure_threshold=2, cooldown=60, clock=clock)
+
+    for _ in range(5):
+        cache.refresh()
+    assert source.calls == 2
+
+    clock.now += 60
+    cache.refresh()
+    cache.refresh()
+    assert source.calls == 3
+
+
+def test_should_ignore_unreadable_rate_file(tmp_path: Path) -> None:
+    path = tmp_path / "rates.json"
+    path.write_text("{not json")
+
+    assert RateFile(str(path)).load() is None
+
+
+def test_should_convert_from_current_rates() -> None:
+    service = CurrencyService(FixedRates({"GEL": 1.0, "USD": 0.5, "EUR": 0.25}))
+
+    assert service.convert(1000, Currency.GEL, Currency.USD) == 500
+    assert service.convert(500, Currency.USD, Currency.EUR) == 250
+    assert service.convert(333, Currency.EUR, Currency.GEL) == 1332
@@ -1,5 +1,6 @@
 from dataclasses import dataclass, field
-from typing import Any, Dict
+from pathlib import Path
+from typing import Any, Dict, Iterator
 from uuid import UUID, uuid4
 
 import pytest
@@ -7,8 +8,10 @@ from faker import Faker
 from fastapi.testclient import TestClient
 
 from app.core.currency import Currency
+from app.core.Models.campaign import CampaignType
 from app.core.Models.product import Product
 from app.core.Models.receipt import ReceiptState
+from app.infrastructure.sqlite.inmemory.campaigns_in_memory_db import InMemoryCampaignDb
 from app.infrastructure.sqlite.inmemory.producs_in_memory_db import InMemoryProductDb
 from app.infrastructure.sqlite.inmemory.receipt_in_memory_db import InMemoryReceiptDb
 from app.infrastructure.sqlite.inmemory.receipt_item_in_memory_db import (
@@ -53,12 +56,13 @@ class ProductFake:
 
 
 @pytest.fixture
-def client() -> TestClient:
-    app = init_app("in_memory")
-    return TestClient(app)
+def client() -> Iterator[TestClient]:
+    with TestClient(init_app("in_memory")) as client:
+        yield client
 
 
 def clear_tables() -> None:
+    InMemoryCampaignDb().clear()
     InMemoryProductDb().clear()
     InMemoryReceiptDb().receipts.clear()
     InMemoryReceiptItemDb().receipt_items.clear()
@@ -121,6 +125,44 @@ def test_should_add_item_to_receipt(client: TestClient) -> None:
     assert get_response.json()["items"][0]["quantity"] == add_request["quantity"]
 
 
+def test_should_add_items_in_batch(client: TestClient) -> None:
+    clear_tables()
+    first = create_product(client)
+    second = create_product(client)
+    client.post("/shifts/open")
+    receipt_id = client.post("/newReceipt").json()["receipt_id"]
+
+    response = client.post(
+        f"/receipts/addItems/{receipt_id}",
+        json=[
+            {"product_id": first["id"], "quantity": 2},
+            {"product_id": second["id"], "quantity": 1},
+            {"product_id": first["id"], "quantity": 3},
+        ],
+    )
+
+    assert response.status_code == 200
+
+    get_response = client.get(f"/receipts/{receipt_id}")
+    quantities = {item["id"]: item["quantity"] for item in get_response.json()["items"]}
+    assert quantities == {first["id"]: 5, second["id"]: 1}
+    assert get_response.json()["subtotal"] == 5 * first["price"] + second["price"]
+
+
+def test_should_not_add_items_with_unknown_product(client: TestClient) -> None:
+    clear_tables()
+    client.post("/shifts/open")
+    receipt_id = client.post("/newReceipt").json()["receipt_id"]
+
+    response = client.post(
+        f"/receipts/addItems/{receipt_id}",
+        json=[{"product_id": str(uuid4()), "quantity": 1}],
+    )
+
+    assert response.status_code == 400
+    assert client.get(f"/receipts/{receipt_id}").json()["items"] == []
+
+
 def test_should_calculate_total(client: TestClient) -> None:
     clear_tables()
     product = create_product(client)
@@ -202,3 +244,302 @@ def test_should_not_close_unpaid_receipt(client: TestClient) -> None:
 
     assert response.status_code == 400
     assert "state" in response.json()["detail"]["error"]["message"]
+
+
+def test_should_checkout_in_one_call(client: TestClient) -> None:
+    clear_tables()
+    product = create_product(client)
+    client.post("/shifts/open")
+
+    response = client.post(
+        "/checkout",
+        json={"items": [{"product_id": product["id"], "quantity": 2}]},
+    )
+
+    assert response.status_code == 201
+    assert response.json()["state"] == ReceiptState.CLOSED.value
+    assert response.json()["total"] == 2 * product["price"]
+    assert response.json()["items"][0]["quantity"] == 2
+
+    get_response = client.get(f"/receipts/{response.json()['id']}")
+    assert get_response.json()["state"] == ReceiptState.CLOSED.value
+
+
+def fail_checkout(client: TestClient) -> None:
+    product = create_product(client)
+    client.post("/shifts/open")
+
+    response = client.post(
+        "/checkout",
+        json={
+            "items": [{"product_id": product["id"], "quantity": 1}],
+            "amount": product["price"] + 1,
+        },
+    )
+
+    assert response.status_code == 400
+    assert client.get("/receipts").json()["receipts"] == []
+
+
+def test_should_not_persist_failed_checkout() -> None:
+    clear_tables()
+    app = init_app("in_memory")
+
+    with TestClient(app) as client:
+        fail_checkout(client)
+
+    assert app.state.receipt.receipts == {}
+    assert app.state.receipt_items.receipt_items == {}
+
+
+def test_should_roll_back_failed_checkout_in_sqlite(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "store.db"))
+    monkeypatch.setenv("EXCHANGE_RATES_URL", "http://127.0.0.1:9/rates")
+    monkeypatch.setenv("EXCHANGE_RATES_FILE", str(tmp_path / "rates.json"))
+    app = init_app()
+
+    with TestClient(app) as client:
+        fail_checkout(client)
+        counts = [
+            app.state.transactions.connection()
+            .execute(f"SELECT COUNT(*) FROM {table}")
+            .fetchone()[0]
+            for table in ["receipts", "receipt_items", "shift_revenue"]
+        ]
+
+    assert counts == [0, 0, 0]
+
+
+def test_should_show_price_at_time_of_sale(client: TestClient) -> None:
+    clear_tables()
+    product = create_product(client)
+    client.post("/shifts/open")
+    receipt_id = client.post("/newReceipt").json()["receipt_id"]
+    client.post(
+        f"/receipts/addItem/{receipt_id}",
+        json={"product_id": product["id"], "quantity": 1},
+    )
+
+    client.patch(
+        f"/products/{product['id']}",
+        json={"name": "renamed", "price": product["price"] + 5},
+    )
+
+    item = client.get(f"/receipts/{receipt_id}").json()["items"][0]
+    assert (item["name"], item["price"]) == (product["name"], product["price"])
+
+
+def test_should_list_and_export_receipts(client: TestClient) -> None:
+    clear_tables()
+    client.post("/shifts/open")
+    created = sorted(client.post("/newReceipt").json()["receipt_id"] for _ in range(3))
+
+    first = client.get("/receipts", params={"limit": 2}).json()
+    second = client.get(
+        "/receipts", params={"limit": 2, "after": first["next_cursor"]}
+    ).json()
+    exported = client.get("/receipts/export").text.splitlines()
+
+    assert [r["id"] for r in first["receipts"] + second["receipts"]] == created
+    assert "next_cursor" not in second
+    assert len(exported) == 3
+
+
+def test_should_search_receipts(client: TestClient) -> None:
+    clear_tables()
+    product = create_product(client)
+    client.post("/shifts/open")
+    sold = [
+        client.post(
+            "/checkout",
+            json={"items": [{"product_id": product["id"], "quantity": quantity}]},
+        ).json()["id"]
+        for quantity in (1, 2, 3)
+    ]
+    client.post("/newReceipt")
+
+    first = client.get(
+        "/receipts/search", params={"state": ReceiptState.CLOSED.value, "limit": 2}
+    ).json()
+    second = client.get(
+        "/receipts/search",
+        params={"state": ReceiptState.CLOSED.value, "after": first["next_cursor"]},
+    ).json()
+    large = client.get(
+        "/receipts/search", params={"min_amount": 2 * product["price"]}
+    ).json()
+
+    found = [r["id"] for r in first["receipts"] + second["receipts"]]
+    assert found == sold[::-1]
+    assert [r["id"] for r in large["receipts"]] == sold[:0:-1]
+
+
+def test_should_not_search_reversed_time_window(client: TestClient) -> None:
+    response = client.get(
+        "/receipts/search",
+        params={"start": "2025-02-01T00:00:00", "end": "2025-01-01T00:00:00"},
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "after", ["garbage", "2025-01-01|garbage", "x|" + str(uuid4())]
+)
+def test_should_not_search_after_malformed_cursor(
+    client: TestClient, after: str
+) -> None:
+    response = client.get("/receipts/search", params={"after": after})
+
+    assert response.status_code == 400
+    assert "Invalid search cursor" in response.json()["detail"]["error"]["message"]
+
+
+def test_should_pay_exact_total_of_fractional_prices(client: TestClient) -> None:
+    clear_tables()
+    product_id = client.post("/products", json={"name": "gum", "price": 2.35}).json()[
+        "product"
+    ]
+    client.post("/shifts/open")
+    receipt_id = client.post("/newReceipt").json()["receipt_id"]
+    client.post(
+        f"/receipts/addItem/{receipt_id}",
+        json={"product_id": product_id, "quantity": 3},
+    )
+
+    response = client.post(
+        f"/receipts/pay/{receipt_id}",
+        json={"amount": 7.05, "currency": Currency.GEL.value},
+    )
+
+    assert response.status_code == 200
+    assert client.get(f"/receipts/{receipt_id}").json()["total"] == 7.05
+
+
+def test_should_pay_quoted_total_in_foreign_currency(client: TestClient) -> None:
+    clear_tables()
+    product_id = client.post("/products", json={"name": "cake", "price": 9.56}).json()[
+        "product"
+    ]
+    client.post("/shifts/open")
+    receipt_id = client.post("/newReceipt").json()["receipt_id"]
+    client.post(
+        f"/receipts/addItem/{receipt_id}",
+        json={"product_id": product_id, "quantity": 1},
+    )
+    quote = client.request(
+        "GET",
+        f"/receipts/quotes/{receipt_id}",
+        json=ReceiptFake().quote_request(),
+    ).json()
+
+    response = client.post(
+        f"/receipts/pay/{receipt_id}",
+        json={"amount": quote["total"], "currency": Currency.USD.value},
+    )
+
+    assert response.status_code == 200
+    assert client.get(f"/receipts/{receipt_id}").json()["state"] == "PAYED"
+
+
+def test_should_checkout_with_exact_payment(client: TestClient) -> None:
+    clear_tables()
+    product_id = client.post("/products", json={"name": "gum", "price": 2.35}).json()[
+        "product"
+    ]
+    client.post("/shifts/open")
+
+    response = client.post(
+        "/checkout",
+        json={
+            "items": [{"product_id": product_id, "quantity": 3}],
+            "amount": 7.05,
+            "currency": Currency.GEL.value,
+        },
+    )
+
+    assert response.status_code == 201
+    assert response.json()["total"] == 7.05
+
+
+def test_should_apply_active_campaign_to_receipt(client: TestClient) -> None:
+    clear_tables()
+    client.post("/shifts/open")
+    product_id = client.post("/products", json={"name": "tea", "price": 4}).json()[
+        "product"
+    ]
+    client.post(
+        "/campaigns",
+        json={
+            "type": CampaignType.DISCOUNT.value,
+            "amount_to_exceed": 0,
+            "percentage": 25,
+            "is_active": True,
+            "amount": 0,
+            "gift_amount": 0,
+            "gift_product_type": "",
+            "product_ids": [product_id],
+        },
+    )
+    receipt_id = client.post("/newReceipt").json()["receipt_id"]
+
+    client.post(
+        f"/receipts/addItem/{receipt_id}",
+        json={"product_id": product_id, "quantity": 2},
+    )
+
+    receipt = client.get(f"/receipts/{receipt_id}").json()
+    assert receipt["subtotal"] == 8
+    assert receipt["total_discount"] == 2
+    assert receipt["total"] == 6
+
+
+def test_should_pay_total_repriced_after_campaign_change(client: TestClient) -> None:
+    clear_tables()
+    client.post("/shifts/open")
+    product_id = client.post("/products", json={"name": "jam", "price": 10}).json()[
+        "product"
+    ]
+    receipt_id = client.post("/newReceipt").json()["receipt_id"]
+    client.post(
+        f"/receipts/addItem/{receipt_id}",
+        json={"product_id": product_id, "quantity": 1},
+    )
+    campaign_id = client.post(
+        "/campaigns",
+        json={
+            "type": CampaignType.DISCOUNT.value,
+            "amount_to_exceed": 0,
+            "percentage": 50,
+            "is_active": True,
+            "amount": 0,
+            "gift_amount": 0,
+            "gift_product_type": "",
+            "product_ids": [product_id],
+        },
+    ).json()["campaign"]["id"]
+
+    quote = client.request(
+        "GET",
+        f"/receipts/quotes/{receipt_id}",
+        json={"currency": Currency.GEL.value},
+    ).json()
+    assert quote["total"] == 5
+    assert client.get(f"/receipts/{receipt_id}").json()["total"] == 5
+
+    client.delete(f"/campaigns/{campaign_id}")
+    assert client.get(f"/receipts/{receipt_id}").json()["total"] == 10
+    rejected = client.post(
+        f"/receipts/pay/{receipt_id}", json=ReceiptFake().payment_request(5)
+    )
+    assert rejected.status_code == 400
+
+    response = client.post(
+        f"/receipts/pay/{receipt_id}", json=ReceiptFake().payment_request(10)
+    )
+
+    assert response.status_code == 200
+    receipt = client.get(f"/receipts/{receipt_id}").json()
+    assert (receipt["state"], receipt["total"]) == (ReceiptState.PAYED.value, 10)
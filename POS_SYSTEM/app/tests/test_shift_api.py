@@ -1,3 +1,6 @@
+from datetime import date, timedelta
+from typing import Iterator
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -10,9 +13,9 @@ def clear_tables() -> None:
 
 
 @pytest.fixture
-def client() -> TestClient:
-    app = init_app("in_memory")
-    return TestClient(app)
+def client() -> Iterator[TestClient]:
+    with TestClient(init_app("in_memory")) as client:
+        yield client
 
 
 def test_should_open_shift(client: TestClient) -> None:
@@ -65,3 +68,97 @@ def test_should_generate_z_report(client: TestClient) -> None:
     response = client.get("/shifts/z-reports")
     assert response.status_code == 200
     assert isinstance(response.json(), list)
+
+
+def test_should_report_sales_of_open_shift(client: TestClient) -> None:
+    clear_tables()
+    product_id = client.post("/products", json={"name": "bread", "price": 2}).json()[
+        "product"
+    ]
+    client.post("/shifts/open")
+    for _ in range(2):
+        client.post(
+            "/checkout", json={"items": [{"product_id": product_id, "quantity": 3}]}
+        )
+
+    report = client.get("/shifts/x-reports").json()
+
+    assert report["receipt_number"] == 2
+    assert report["items_sold"] == [{"product_id": product_id, "sold_amount": 6}]
+    assert report["revenue"] == [{"currency": "GEL", "amount": 12.0}]
+
+
+def test_should_count_receipts_once_paid(client: TestClient) -> None:
+    clear_tables()
+    product_id = client.post("/products", json={"name": "milk", "price": 4}).json()[
+        "product"
+    ]
+    client.post("/shifts/open")
+    receipt_id = client.post("/newReceipt").json()["receipt_id"]
+    client.post(
+        f"/receipts/addItem/{receipt_id}",
+        json={"product_id": product_id, "quantity": 1},
+    )
+    assert client.get("/shifts/x-reports").json()["receipt_number"] == 0
+
+    payment = {"amount": 4, "currency": "GEL"}
+    assert client.post(f"/receipts/pay/{receipt_id}", json=payment).status_code == 200
+    assert client.post(f"/receipts/pay/{receipt_id}", json=payment).status_code == 400
+
+    report = client.get("/shifts/x-reports").json()
+    assert report["receipt_number"] == 1
+    assert report["revenue"] == [{"currency": "GEL", "amount": 4.0}]
+
+
+def test_should_report_revenue_by_date_range(client: TestClient) -> None:
+    clear_tables()
+    product_id = client.post("/products", json={"name": "tea", "price": 3}).json()[
+        "product"
+    ]
+    shift_id = client.post("/shifts/open").json()["shift_id"]
+    for _ in range(2):
+        client.post(
+            "/checkout", json={"items": [{"product_id": product_id, "quantity": 1}]}
+        )
+    today = date.today()
+    yesterday = today - timedelta(days=1)
+    expected = [{"currency": "GEL", "amount": 6.0}]
+
+    assert client.get(f"/shifts/z-reports?start={today}").json() == expected
+    client.post(f"/shifts/close/{shift_id}")
+    client.post(f"/shifts/close/{shift_id}")
+    assert client.get(f"/shifts/z-reports?start={today}&end={today}").json() == (
+        expected
+    )
+    assert client.get(f"/shifts/z-reports?end={yesterday}").json() == []
+
+    hourly = client.get(f"/shifts/z-reports/hourly?day={today}").json()
+    assert [(h["receipt_count"], h["amount"]) for h in hourly] == [(2, 6.0)]
+
+
+def test_should_report_receipt_paid_after_shift_closed(client: TestClient) -> None:
+    clear_tables()
+    product_id = client.post("/products", json={"name": "jam", "price": 2}).json()[
+        "product"
+    ]
+    shift_id = client.post("/shifts/open").json()["shift_id"]
+    receipt_id = client.post("/newReceipt").json()["receipt_id"]
+    client.post(
+        f"/receipts/addItem/{receipt_id}",
+        json={"product_id": product_id, "quantity": 1},
+    )
+    client.post(f"/shifts/close/{shift_id}")
+
+    payment = {"amount": 2, "currency": "GEL"}
+    assert client.post(f"/receipts/pay/{receipt_id}", json=payment).status_code == 200
+
+    today = date.today()
+    assert client.get(f"/shifts/z-reports?start={today}").json() == [
+        {"currency": "GEL", "amount": 2.0}
+    ]
+
+
+def test_should_reject_reversed_date_range(client: TestClient) -> None:
+    response = client.get("/shifts/z-reports?start=2024-02-02&end=2024-02-01")
+
+    assert response.status_code == 400
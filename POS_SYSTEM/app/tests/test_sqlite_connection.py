@@ -0,0 +1,86 @@
+import threading
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from app.core.Models.product import Product
+from app.infrastructure.sqlite.connection import ConnectionManager
+from app.infrastructure.sqlite.product_db import ProductDb
+
+
+@pytest.fixture
+def connections(tmp_path: Path) -> ConnectionManager:
+    return ConnectionManager(str(tmp_path / "store.db"))
+
+
+def test_should_enable_wal_journaling(connections: ConnectionManager) -> None:
+    row = connections.connection().execute("PRAGMA journal_mode").fetchone()
+
+    assert row[0] == "wal"
+
+
+def test_should_reuse_connection_within_thread(
+    connections: ConnectionManager,
+) -> None:
+    assert connections.connection() is connections.connection()
+
+
+def test_should_use_separate_connection_per_thread(
+    connections: ConnectionManager,
+) -> None:
+    other = []
+    thread = threading.Thread(target=lambda: other.append(connections.connection()))
+    thread.start()
+    thread.join()
+
+    assert other[0] is not connections.connection()
+
+
+def test_should_rollback_failed_transaction(connections: ConnectionManager) -> None:
+    products = ProductDb(connections=connections)
+    product = Product(name="bread", price=250)
+
+    with pytest.raises(ValueError):
+        with connections.transaction():
+            products.add(product)
+            raise ValueError("boom")
+
+    assert products.read(product.id) is None
+
+
+def test_should_rollback_only_failed_nested_transaction(
+    connections: ConnectionManager,
+) -> None:
+    products = ProductDb(connections=connections)
+    kept = Product(name="milk", price=300)
+    dropped = Product(name="eggs", price=400)
+
+    with connections.transaction():
+        products.add(kept)
+        with pytest.raises(ValueError):
+            with connections.transaction():
+                products.add(dropped)
+                raise ValueError("boom")
+
+    assert products.read(kept.id) is not None
+    assert products.read(dropped.id) is None
+
+
+def test_should_run_callbacks_after_outer_commit(
+    connections: ConnectionManager,
+) -> None:
+    calls: List[str] = []
+
+    with connections.transaction():
+        with connections.transaction():
+            connections.after_commit(lambda: calls.append("committed"))
+        assert calls == []
+    connections.after_commit(lambda: calls.append("immediate"))
+
+    with pytest.raises(ValueError):
+        with connections.transaction():
+            connections.after_commit(lambda: calls.append("rolled back"))
+            raise ValueError("boom")
+
+    assert calls == ["committed", "immediate"]
@@ -0,0 +1,189 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, List, Tuple
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.core.currency import Currency
+from app.core.Models.campaign import Campaign, CampaignType
+from app.core.Models.product import Product
+from app.core.Models.receipt import Receipt, ReceiptItem, ReceiptState
+from app.core.Models.report import HourlyRevenue, ReportRevenue
+from app.core.shift import ShiftItem, ShiftState
+from app.infrastructure.sqlite.campaign_db import CampaignDb
+from app.infrastructure.sqlite.connection import ConnectionManager
+from app.infrastructure.sqlite.product_db import ProductDb
+from app.infrastructure.sqlite.receipt_db import ReceiptDb
+from app.infrastructure.sqlite.receipt_item_db import ReceiptItemDb
+from app.infrastructure.sqlite.report_db import ReportDb
+from app.infrastructure.sqlite.shift_db import ShiftDb
+
+
+@pytest.fixture
+def connections(tmp_path: Path) -> ConnectionManager:
+    return ConnectionManager(str(tmp_path / "store.db"))
+
+
+def trace_queries(connections: ConnectionManager) -> List[str]:
+    queries: List[str] = []
+    connections.connection().set_trace_callback(queries.append)
+    return queries
+
+
+def campaign(product_ids: List[str]) -> Campaign:
+    return Campaign(
+        type=CampaignType.COMBO,
+        amount_to_exceed=0,
+        percentage=10.0,
+        is_active=True,
+        amount=1,
+        gift_amount=0,
+        gift_product_type="",
+        product_ids=product_ids,
+    )
+
+
+def test_should_load_campaigns_with_products_in_one_query(
+    connections: ConnectionManager,
+) -> None:
+    campaigns = CampaignDb(connections=connections)
+    created = [campaign(sorted([str(uuid4()), str(uuid4())])) for _ in range(5)]
+    created.append(campaign([]))
+    for item in created:
+        campaigns.add(item)
+
+    queries = trace_queries(connections)
+    loaded = campaigns.read_all()
+
+    assert len(queries) == 1
+    assert loaded == created
+
+
+def test_should_check_product_names_in_one_query(
+    connections: ConnectionManager,
+) -> None:
+    products = ProductDb(connections=connections)
+    created = [Product(name=f"product-{i}", price=100) for i in range(2000)]
+    products.add_many(created)
+
+    queries = trace_queries(connections)
+    taken = products.find_by_names([p.name for p in created[::2]] + ["missing"])
+
+    assert len(queries) == 1
+    assert taken == {p.name: p.id for p in created[::2]}
+
+
+def test_should_read_many_products_in_chunks(connections: ConnectionManager) -> None:
+    products = ProductDb(connections=connections)
+    created = [Product(name=f"product-{i}", price=i) for i in range(1500)]
+    products.add_many(created)
+
+    queries = trace_queries(connections)
+    loaded = products.read_many([p.id for p in created] + [uuid4()])
+
+    assert len(queries) == 2
+    assert loaded == {p.id: p for p in created}
+
+
+def test_should_keep_shift_summary_in_line_with_receipts(
+    connections: ConnectionManager,
+) -> None:
+    receipts = ReceiptDb(connections=connections)
+    items = ReceiptItemDb(connections=connections)
+    reports = ReportDb(connections=connections)
+    shift_id, bread, milk = uuid4(), uuid4(), uuid4()
+    receipts.create(Receipt(shift_id=shift_id, payment_amount=10000))
+    for i in range(5000):
+        receipt = receipts.create(
+            Receipt(
+                shift_id=shift_id,
+                state=ReceiptState.CLOSED,
+                payment_amount=200,
+                payment_currency=Currency.USD if i % 2 else Currency.GEL,
+            )
+        )
+        lines = [ReceiptItem(receipt.id, bread, 1), ReceiptItem(receipt.id, milk, 2)]
+        items.create_many(lines)
+        reports.record_sale(receipt, lines)
+
+    expected = (
+        5000,
+        sorted([(bread, 5000), (milk, 10000)], key=lambda line: str(line[0])),
+        [
+            ReportRevenue(currency=Currency.GEL, amount=500000),
+            ReportRevenue(currency=Currency.USD, amount=500000),
+        ],
+    )
+
+    queries = trace_queries(connections)
+    assert summary(reports, shift_id) == expected
+    assert len(queries) == 3
+
+    reports.rebuild()
+    assert summary(reports, shift_id) == expected
+
+
+def summary(reports: ReportDb, shift_id: UUID) -> Tuple[Any, ...]:
+    return (
+        reports.count_receipts(shift_id),
+        [(item.product_id, item.sold_amount) for item in reports.items_sold(shift_id)],
+        reports.revenue(shift_id),
+    )
+
+
+def test_should_roll_up_closed_shift_once(connections: ConnectionManager) -> None:
+    receipts = ReceiptDb(connections=connections)
+    shifts = ShiftDb(connections=connections)
+    reports = ReportDb(connections=connections)
+    shift = shifts.create(ShiftItem(shift_id=uuid4(), state=ShiftState.OPEN))
+    sold_at = datetime(2024, 3, 1, 9, 30)
+    for amount in (200, 300):
+        receipts.create(
+            Receipt(
+                shift_id=shift.shift_id,
+                state=ReceiptState.CLOSED,
+                created_at=sold_at,
+                payment_amount=amount,
+            )
+        )
+    day = sold_at.date()
+    expected = [ReportRevenue(currency=Currency.GEL, amount=500)]
+
+    assert reports.revenue_between(day, day) == expected
+    shifts.update(ShiftItem(shift_id=shift.shift_id, state=ShiftState.CLOSED))
+    reports.roll_up_shift(shift.shift_id)
+    reports.roll_up_shift(shift.shift_id)
+
+    assert reports.revenue_between(day, day) == expected
+    assert reports.revenue_between(None, day - timedelta(days=1)) == []
+    assert reports.hourly_revenue(day) == [
+        HourlyRevenue(datetime(2024, 3, 1, 9), Currency.GEL, 2, 500)
+    ]
+
+
+def test_should_roll_up_sale_paid_after_shift_closed(
+    connections: ConnectionManager,
+) -> None:
+    receipts = ReceiptDb(connections=connections)
+    reports = ReportDb(connections=connections)
+    shift_id = uuid4()
+    sold_at = datetime(2024, 3, 1, 9, 30)
+    receipt = receipts.create(Receipt(shift_id=shift_id, created_at=sold_at))
+    reports.roll_up_shift(shift_id)
+
+    receipt.state = ReceiptState.PAYED
+    receipt.payment_amount = 200
+    receipt.payment_currency = Currency.GEL
+    receipts.update(receipt)
+    reports.record_sale(receipt, [])
+
+    day = sold_at.date()
+    expected = [ReportRevenue(currency=Currency.GEL, amount=200)]
+    assert reports.revenue_between(day, day) == expected
+    assert reports.hourly_revenue(day) == [
+        HourlyRevenue(datetime(2024, 3, 1, 9), Currency.GEL, 1, 200)
+    ]
+
+    reports.rebuild()
+    assert reports.revenue_between(day, day) == expected
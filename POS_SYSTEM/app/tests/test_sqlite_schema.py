@@ -0,0 +1,178 @@
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+from app.core.currency import Currency
+from app.core.Models.receipt import ReceiptQuery, ReceiptState
+from app.infrastructure.sqlite.connection import ConnectionManager
+from app.infrastructure.sqlite.product_db import ProductDb
+from app.infrastructure.sqlite.receipt_db import ReceiptDb
+from app.infrastructure.sqlite.receipt_item_db import ReceiptItemDb
+from app.infrastructure.sqlite.schema import (
+    MIGRATIONS,
+    SCHEMA_VERSION,
+    migrate,
+    schema_version,
+)
+
+
+@pytest.fixture
+def connection(tmp_path: Path) -> sqlite3.Connection:
+    connection = ConnectionManager(str(tmp_path / "store.db")).connection()
+    migrate(connection)
+    return connection
+
+
+def query_plan(connection: sqlite3.Connection, query: str) -> str:
+    rows = connection.execute(f"EXPLAIN QUERY PLAN {query}", ("x",)).fetchall()
+    return " ".join(row["detail"] for row in rows)
+
+
+def test_should_migrate_legacy_database(tmp_path: Path) -> None:
+    db_path = str(tmp_path / "legacy.db")
+    product_id = str(uuid4())
+    with sqlite3.connect(db_path) as legacy:
+        legacy.execute("CREATE TABLE products (id TEXT, name TEXT, price FLOAT)")
+        legacy.execute(
+            "INSERT INTO products VALUES (?, ?, ?)", (product_id, "bread", 2.5)
+        )
+        legacy.execute(
+            "INSERT INTO products VALUES (?, ?, ?)", (product_id, "bread", 2.5)
+        )
+    legacy.close()
+
+    products = ProductDb(connections=ConnectionManager(db_path))
+
+    assert schema_version(products.connections.connection()) == SCHEMA_VERSION
+    assert len(products.read_all()) == 1
+    bread = products.find_by_name("bread")
+    assert bread is not None and bread.price == 250
+
+
+def test_should_rename_products_sharing_a_legacy_name(tmp_path: Path) -> None:
+    db_path = str(tmp_path / "legacy.db")
+    first, second = str(uuid4()), str(uuid4())
+    with sqlite3.connect(db_path) as legacy:
+        legacy.execute("CREATE TABLE products (id TEXT, name TEXT, price FLOAT)")
+        legacy.execute("INSERT INTO products VALUES (?, ?, ?)", (first, "bread", 2.5))
+        legacy.execute("INSERT INTO products VALUES (?, ?, ?)", (second, "bread", 3.0))
+    legacy.close()
+
+    products = ProductDb(connections=ConnectionManager(db_path))
+
+    assert sorted(product.name for product in products.read_all()) == [
+        "bread",
+        f"bread ({second})",
+    ]
+    renamed = products.find_by_name(f"bread ({second})")
+    assert renamed is not None and renamed.price == 300
+
+
+def test_should_backfill_receipt_item_prices(tmp_path: Path) -> None:
+    db_path = str(tmp_path / "store.db")
+    receipt_id, product_id = uuid4(), uuid4()
+    with sqlite3.connect(db_path) as old:
+        for statement in [s for migration in MIGRATIONS[:3] for s in migration]:
+            old.execute(statement)
+        old.execute("PRAGMA user_version = 3")
+        old.execute(
+            "INSERT INTO products VALUES (?, ?, ?)", (str(product_id), "bread", 2.5)
+        )
+        old.execute(
+            "INSERT INTO receipt_items VALUES (?, ?, ?)",
+            (str(receipt_id), str(product_id), 2),
+        )
+    old.close()
+
+    items = ReceiptItemDb(connections=ConnectionManager(db_path))
+    item = items.read(receipt_id, product_id)
+
+    assert item is not None
+    assert (item.unit_price, item.product_name) == (250, "bread")
+
+
+def test_should_store_money_in_minor_units(tmp_path: Path) -> None:
+    db_path = str(tmp_path / "store.db")
+    receipt_id = uuid4()
+    with sqlite3.connect(db_path) as old:
+        for statement in [s for migration in MIGRATIONS[:7] for s in migration]:
+            old.execute(statement)
+        old.execute("PRAGMA user_version = 7")
+        old.execute(
+            "INSERT INTO receipts VALUES (?, ?, 'CLOSED', ?, ?, ?, ?, 'GEL')",
+            (str(receipt_id), str(uuid4()), "2024-03-01", 12.34, 1.2, 11.14),
+        )
+    old.close()
+
+    receipts = ReceiptDb(connections=ConnectionManager(db_path))
+    receipt = receipts.read(receipt_id)
+    stored = receipts.connections.connection().execute(
+        "SELECT DISTINCT typeof(subtotal) FROM receipts"
+    )
+
+    assert receipt is not None
+    assert (receipt.subtotal, receipt.total_discount, receipt.payment_amount) == (
+        1234,
+        120,
+        1114,
+    )
+    assert [row[0] for row in stored] == ["integer"]
+
+
+def test_should_not_rerun_applied_migrations(connection: sqlite3.Connection) -> None:
+    migrate(connection)
+
+    assert schema_version(connection) == SCHEMA_VERSION
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "SELECT name, price, id FROM products WHERE id = ?",
+        "SELECT name, price, id FROM products WHERE name = ?",
+        "SELECT * FROM receipts WHERE shift_id = ?",
+        "SELECT * FROM shifts WHERE state = ?",
+        "SELECT * FROM receipt_items WHERE receipt_id = ?",
+        "SELECT name, price, id FROM products WHERE id > ? ORDER BY id LIMIT 100",
+        "SELECT * FROM receipts WHERE id > ? ORDER BY id LIMIT 100",
+        "SELECT campaign_id FROM campaign_relations WHERE product_id = ?",
+        "SELECT product_id, quantity FROM shift_items_sold WHERE shift_id = ?",
+        "SELECT currency, amount FROM shift_revenue WHERE shift_id = ?",
+    ],
+)
+def test_should_use_index_for_lookup(
+    connection: sqlite3.Connection, query: str
+) -> None:
+    plan = query_plan(connection, query)
+
+    assert "USING" in plan and "INDEX" in plan
+    assert not plan.startswith("SCAN")
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        ReceiptQuery(),
+        ReceiptQuery(start=datetime(2025, 1, 1), end=datetime(2025, 2, 1)),
+        ReceiptQuery(state=ReceiptState.CLOSED),
+        ReceiptQuery(state=ReceiptState.CLOSED, start=datetime(2025, 1, 1)),
+        ReceiptQuery(currency=Currency.USD, min_amount=10, max_amount=20),
+        ReceiptQuery(min_amount=10),
+    ],
+)
+@pytest.mark.parametrize("after", [None, f"{datetime(2025, 1, 1)}|{uuid4()}"])
+def test_should_search_receipts_in_index_order(
+    tmp_path: Path, query: ReceiptQuery, after: str | None
+) -> None:
+    connections = ConnectionManager(str(tmp_path / "store.db"))
+    migrate(connections.connection())
+    sql, params = ReceiptDb(connections=connections).search_query(query, after, 100)
+
+    rows = connections.connection().execute(f"EXPLAIN QUERY PLAN {sql}", params)
+    plan = " ".join(row["detail"] for row in rows)
+
+    assert "USING INDEX idx_receipts_" in plan
+    assert "TEMP B-TREE" not in plan
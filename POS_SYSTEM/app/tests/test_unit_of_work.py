@@ -0,0 +1,92 @@
+from uuid import UUID, uuid4
+
+from app.core.currency import CurrencyService
+from app.core.Models.product import Product
+from app.core.Models.receipt import AddItemRequest, Receipt, ReceiptItem
+from app.core.receipt import ReceiptService
+from app.core.shift import ShiftService
+from app.core.unit_of_work import ReceiptUnitOfWork
+from app.infrastructure.sqlite.inmemory.receipt_in_memory_db import InMemoryReceiptDb
+from app.infrastructure.sqlite.inmemory.receipt_item_in_memory_db import (
+    InMemoryReceiptItemDb,
+)
+from app.infrastructure.sqlite.inmemory.shift_in_memory_db import InMemoryShiftDb
+
+
+class CountingReceiptDb(InMemoryReceiptDb):
+    def __init__(self) -> None:
+        super().__init__()
+        self.reads = 0
+        self.updates = 0
+
+    def read(self, receipt_id: UUID) -> Receipt | None:
+        self.reads += 1
+        return super().read(receipt_id)
+
+    def update(self, receipt: Receipt) -> None:
+        self.updates += 1
+        super().update(receipt)
+
+
+def test_should_cache_receipt_within_unit_of_work() -> None:
+    receipts = CountingReceiptDb()
+    receipt = receipts.create(Receipt(shift_id=uuid4()))
+    uow = ReceiptUnitOfWork(receipts, InMemoryReceiptItemDb())
+
+    assert uow.read_receipt(receipt.id) is uow.read_receipt(receipt.id)
+    assert receipts.reads == 1
+
+
+def test_should_track_changed_fields() -> None:
+    receipts = InMemoryReceiptDb()
+    receipt = Receipt(shift_id=uuid4())
+    receipts.receipts[str(receipt.id)] = Receipt(
+        shift_id=receipt.shift_id, id=receipt.id, created_at=receipt.created_at
+    )
+    uow = ReceiptUnitOfWork(receipts, InMemoryReceiptItemDb())
+
+    loaded = uow.read_receipt(receipt.id)
+    assert loaded is not None
+    loaded.subtotal = 1000
+
+    assert uow.changes(loaded) == {"subtotal"}
+
+
+def test_should_skip_flush_for_unchanged_entities() -> None:
+    receipts = CountingReceiptDb()
+    receipt = receipts.create(Receipt(shift_id=uuid4()))
+
+    with ReceiptUnitOfWork(receipts, InMemoryReceiptItemDb()) as uow:
+        uow.read_receipt(receipt.id)
+
+    assert receipts.updates == 0
+
+
+def test_should_write_receipt_once_per_add_item() -> None:
+    receipts = CountingReceiptDb()
+    receipt_items = InMemoryReceiptItemDb()
+    shift_service = ShiftService(InMemoryShiftDb())
+    shift_service.create()
+    service = ReceiptService(receipts, receipt_items, shift_service, CurrencyService())
+    receipt_id = service.create()
+    product = Product(name="bread", price=200)
+
+    service.add_item(
+        receipt_id, AddItemRequest(product_id=product.id, quantity=2), product
+    )
+    service.add_item(
+        receipt_id, AddItemRequest(product_id=product.id, quantity=1), product
+    )
+    service.calculate_total(receipt_id)
+
+    assert receipts.updates == 2
+    assert receipt_items.read_by_receipt(receipt_id) == [
+        ReceiptItem(
+            receipt_id=receipt_id,
+            product_id=product.id,
+            quantity=3,
+            unit_price=200,
+            product_name="bread",
+        )
+    ]
+    assert service.calculate_total(receipt_id) == 600
@@ -0,0 +1,110 @@
+import asyncio
+import threading
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from app.core.Models.product import Product
+from app.core.product_cache import ProductCache
+from app.infrastructure.db_executor import DbExecutor
+from app.infrastructure.sqlite.connection import ConnectionManager
+from app.infrastructure.sqlite.product_db import ProductDb
+from app.infrastructure.write_scheduler import WriteScheduler
+
+
+@pytest.fixture
+def connections(tmp_path: Path) -> Iterator[ConnectionManager]:
+    connections = ConnectionManager(str(tmp_path / "store.db"))
+    yield connections
+    connections.close()
+
+
+@pytest.fixture
+def writer(connections: ConnectionManager) -> Iterator[WriteScheduler]:
+    writer = WriteScheduler(connections, window=0.05)
+    writer.start()
+    yield writer
+    writer.shutdown()
+
+
+def test_should_commit_concurrent_writes_together(
+    connections: ConnectionManager, writer: WriteScheduler
+) -> None:
+    products = ProductDb(connections=connections)
+    db = DbExecutor(workers=2, writer=writer)
+    db.start()
+    batch = [Product(name=f"item-{i}", price=100 + i) for i in range(20)]
+
+    async def checkout() -> None:
+        await asyncio.gather(*(db.write(products.add, product) for product in batch))
+
+    asyncio.run(checkout())
+
+    assert writer.writes == 20
+    assert writer.batches < 20
+    assert all(products.read(product.id) is not None for product in batch)
+
+
+def test_should_fail_only_the_write_that_raised(
+    connections: ConnectionManager, writer: WriteScheduler
+) -> None:
+    products = ProductDb(connections=connections)
+    kept, dropped = Product(name="milk", price=300), Product(name="eggs", price=400)
+
+    def add_then_fail() -> None:
+        products.add(dropped)
+        raise ValueError("boom")
+
+    first = writer.submit(lambda: products.add(kept))
+    failed = writer.submit(add_then_fail)
+
+    assert first.result(timeout=5) == kept
+    with pytest.raises(ValueError, match="boom"):
+        failed.result(timeout=5)
+    assert products.read(kept.id) is not None
+    assert products.read(dropped.id) is None
+
+
+def test_should_keep_writing_after_a_job_raises_base_exception(
+    connections: ConnectionManager, writer: WriteScheduler
+) -> None:
+    products = ProductDb(connections=connections)
+    milk = Product(name="milk", price=300)
+
+    def abort() -> None:
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        writer.submit(abort).result(timeout=5)
+
+    assert writer.submit(lambda: products.add(milk)).result(timeout=5) == milk
+
+
+def test_should_reject_writes_until_started(connections: ConnectionManager) -> None:
+    writer = WriteScheduler(connections)
+
+    with pytest.raises(RuntimeError, match="not running"):
+        writer.submit(lambda: None)
+
+    writer.start()
+    assert writer.submit(lambda: "done").result(timeout=5) == "done"
+    writer.shutdown()
+
+
+def test_should_not_cache_row_read_before_batch_committed(
+    connections: ConnectionManager, writer: WriteScheduler
+) -> None:
+    cache = ProductCache(ProductDb(connections=connections), transactions=connections)
+    product = cache.add(Product(name="milk", price=300))
+
+    def update_while_reader_misses() -> None:
+        cache.update(Product(id=product.id, name="milk", price=500))
+        reader = threading.Thread(target=cache.read, args=(product.id,))
+        reader.start()
+        reader.join()
+
+    writer.submit(update_while_reader_misses).result(timeout=5)
+
+    cached = cache.read(product.id)
+    assert cached is not None and cached.price == 500
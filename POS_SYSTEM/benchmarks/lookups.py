@@ -0,0 +1,75 @@
+import random
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List
+from uuid import UUID, uuid4
+
+from app.core.shift import ShiftState
+from app.infrastructure.sqlite.connection import ConnectionManager
+from app.infrastructure.sqlite.product_db import ProductDb
+from app.infrastructure.sqlite.receipt_db import ReceiptDb
+from app.infrastructure.sqlite.shift_db import ShiftDb
+
+SIZES = [1_000, 10_000, 50_000]
+RECEIPTS_PER_SHIFT = 20
+LOOKUPS = 2_000
+
+
+def seed(connections: ConnectionManager, size: int) -> List[UUID]:
+    product_ids = [uuid4() for _ in range(size)]
+    shift_ids = [uuid4() for _ in range(size // RECEIPTS_PER_SHIFT)]
+    with connections.transaction() as connection:
+        connection.executemany(
+            "INSERT INTO products (id, name, price) VALUES (?, ?, ?)",
+            [(str(pid), f"product-{i}", 100) for i, pid in enumerate(product_ids)],
+        )
+        connection.executemany(
+            "INSERT INTO shifts (shift_id, state) VALUES (?, ?)",
+            [(str(sid), ShiftState.CLOSED.value) for sid in shift_ids],
+        )
+        connection.executemany(
+            "INSERT INTO receipts (id, shift_id, state, created_at, subtotal, "
+            "total_discount, payment_amount, payment_currency) "
+            "VALUES (?, ?, 'CLOSED', ?, 0, 0, 0, 'GEL')",
+            [
+                (str(uuid4()), str(shift_ids[i % len(shift_ids)]), datetime.now())
+                for i in range(size)
+            ],
+        )
+    return product_ids
+
+
+def per_lookup_us(lookup: Callable[[int], object]) -> float:
+    start = time.perf_counter()
+    for i in range(LOOKUPS):
+        lookup(i)
+    return (time.perf_counter() - start) / LOOKUPS * 1_000_000
+
+
+def main() -> None:
+    print(f"{'rows':>8} {'read':>10} {'by name':>10} {'by shift':>10} {'by state':>10}")
+    for size in SIZES:
+        with tempfile.TemporaryDirectory() as directory:
+            connections = ConnectionManager(str(Path(directory) / "bench.db"))
+            products = ProductDb(connections=connections)
+            receipts = ReceiptDb(connections=connections)
+            shifts = ShiftDb(connections=connections)
+            product_ids = seed(connections, size)
+            sample = [random.randrange(size) for _ in range(LOOKUPS)]
+            shift_id = shifts.read_by_state(ShiftState.CLOSED)[0].shift_id
+
+            timings = [
+                per_lookup_us(lambda i: products.read(product_ids[sample[i]])),
+                per_lookup_us(lambda i: products.find_by_name(f"product-{sample[i]}")),
+                per_lookup_us(lambda i: receipts.read_by_shift(shift_id)),
+                per_lookup_us(lambda i: shifts.read_by_state(ShiftState.OPEN)),
+            ]
+            connections.close()
+
+        print(f"{size:>8}" + "".join(f"{t:>9.1f}u" for t in timings))
+
+
+if __name__ == "__main__":
+    main()